@@ -3,3 +3,17 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        import os
+
+        from api.core.utils import checks, permissions, rich_text
+        from api.views.inbox import signals as inbox_signals
+        from api.views.messages import signals as message_signals
+
+        if os.getenv('SERVER_MODE') in ('wsgi', 'asgi'):  # a gunicorn worker, manage.py runs the checks itself
+            checks.raise_on_errors()
+        permissions.connect()
+        rich_text.connect()
+        inbox_signals.connect()
+        message_signals.connect()
@@ -0,0 +1,65 @@
+import asyncio
+import functools
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def db_sync_to_async(func, thread_sensitive: bool = True):
+    """
+    Run blocking ORM / auth code from a coroutine, with stale connections closed around the call as the
+    request cycle would do. Thread sensitive by default: all such calls of the process share one thread;
+    plain queries may pass thread_sensitive=False to run in parallel on the executor threads (each keeps
+    its connection for CONN_MAX_AGE).
+    """
+
+    def _inner(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(_inner, thread_sensitive=thread_sensitive)
+
+
+class AsyncDispatchMixin:
+    """
+    Makes a DRF view async: handlers may be coroutines, while authentication, permissions,
+    throttling and exception handling (all sync, may hit the DB) run through db_sync_to_async
+    """
+
+    @classmethod
+    def as_view(cls, *args, **initkwargs):
+        view = super().as_view(*args, **initkwargs)
+
+        @functools.wraps(view)  # keeps cls / initkwargs / actions / csrf_exempt for routers and drf_yasg
+        async def async_view(*view_args, **view_kwargs):
+            return await view(*view_args, **view_kwargs)
+
+        return async_view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await db_sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await db_sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = await db_sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
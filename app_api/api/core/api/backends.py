@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Permission
+from django.db.models import Exists, OuterRef, Q
+
+from api.core.utils import permissions
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend with permission sets from api.core.utils.permissions: has_perm / has_perms cost no
+    query on the hot path, with_perm resolves the permission id without joining content types
+    """
+
+    def _get_permissions(self, user_obj, obj, from_name):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        perm_cache_name = '_%s_perm_cache' % from_name
+        if not hasattr(user_obj, perm_cache_name):
+            if user_obj.is_superuser:
+                perms = set(permissions.permission_ids())
+            else:
+                own, groups = permissions.user_permissions(user_obj)
+                perms = set(own if from_name == 'user' else groups)
+            setattr(user_obj, perm_cache_name, perms)
+        return getattr(user_obj, perm_cache_name)
+
+    def with_perm(self, perm, is_active=True, include_superusers=True, obj=None):
+        if not isinstance(perm, str):
+            return super().with_perm(perm, is_active=is_active, include_superusers=include_superusers, obj=obj)
+        if '.' not in perm:
+            raise ValueError('Permission name should be in the form app_label.permission_codename.')
+        UserModel = get_user_model()
+        if obj is not None:
+            return UserModel._default_manager.none()
+
+        permission_id = permissions.permission_ids().get(perm)
+        if permission_id is None:  # nobody has an unknown permission, except superusers
+            user_q = Q(pk__in=[])
+        else:
+            user_q = Exists(Permission.objects.filter(
+                Q(group__user=OuterRef('pk')) | Q(user=OuterRef('pk')), pk=permission_id,
+            ))
+        if include_superusers:
+            user_q |= Q(is_superuser=True)
+        if is_active is not None:
+            user_q &= Q(is_active=is_active)
+        return UserModel._default_manager.filter(user_q)
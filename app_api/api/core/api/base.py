@@ -1,12 +1,15 @@
 from rest_framework import viewsets, permissions
 from rest_framework.authentication import SessionAuthentication, BasicAuthentication, TokenAuthentication
-from rest_framework.generics import CreateAPIView, UpdateAPIView
+from rest_framework.generics import CreateAPIView, ListAPIView, UpdateAPIView
 from rest_framework.parsers import MultiPartParser, JSONParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.renderers import TemplateHTMLRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from api.core.api.asynchronous import AsyncDispatchMixin
+from api.core.api.bulk import BulkCreateMixin, BulkUpdateMixin, NDJSONParser, is_bulk
+from api.core.api.prefetch import PrefetchQuerysetMixin
 from api.core.api.responses import Responses
 
 
@@ -32,22 +35,56 @@ class BaseAPIView(APIView):
     ]
 
 
-class CustomUpdateAPIView(UpdateAPIView):
+class AsyncBaseView(AsyncDispatchMixin, BaseView):
     """
-    Custom update view
+    Async base view, actions may be coroutines
     """
 
+
+class AsyncBaseAPIView(AsyncDispatchMixin, BaseAPIView):
+    """
+    Async base API view, handlers may be coroutines
+    """
+
+
+class CustomListAPIView(PrefetchQuerysetMixin, ListAPIView):
+    """
+    Custom list view, related objects of the serializer are loaded in a constant number of queries
+    """
+
+    permission_classes = [IsAuthenticated]
     authentication_classes = [
         SessionAuthentication,
         BasicAuthentication,
         TokenAuthentication
     ]
-    parser_classes = (MultiPartParser, JSONParser)
+
+    def list(self, request, *args, **kwargs) -> Response:
+        response = super().list(request, *args, **kwargs)
+        return Responses.make_response(data=response.data)
+
+
+class CustomUpdateAPIView(BulkUpdateMixin, PrefetchQuerysetMixin, UpdateAPIView):
+    """
+    Custom update view, a list (or ndjson stream) of objects with ids updates them in bulk
+    """
+
+    authentication_classes = [
+        SessionAuthentication,
+        BasicAuthentication,
+        TokenAuthentication
+    ]
+    parser_classes = (MultiPartParser, JSONParser, NDJSONParser)
+
+    def update(self, request, *args, **kwargs) -> Response:
+        if is_bulk(request.data):
+            return self.bulk_update(request.data, partial=kwargs.get('partial', False))
+        return super().update(request, *args, **kwargs)
 
 
-class CustomCreateAPIView(CreateAPIView):
+class CustomCreateAPIView(BulkCreateMixin, CreateAPIView):
     """
-    Custom create APIView
+    Custom create APIView, a list (or ndjson stream) of objects is created in bulk
     """
 
     permission_classes = [IsAuthenticated]
@@ -61,6 +98,8 @@ class CustomCreateAPIView(CreateAPIView):
         serializer.save()
 
     def create(self, request, *args, **kwargs) -> Response:
+        if is_bulk(request.data):
+            return self.bulk_create(request.data)
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
@@ -0,0 +1,406 @@
+import json
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DatabaseError, router, transaction
+from django.db.models.signals import m2m_changed, post_save, pre_save
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import ParseError, PermissionDenied, ValidationError
+from rest_framework.parsers import BaseParser
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from api.core.api.responses import Responses
+
+RESULT_CREATED = 'created'
+RESULT_UPDATED = 'updated'
+RESULT_INVALID = 'invalid'  # did not pass validation, nothing written
+RESULT_NOT_FOUND = 'not_found'
+RESULT_FORBIDDEN = 'forbidden'
+RESULT_FAILED = 'failed'  # valid, but refused by the database (e.g. a duplicate inside the batch)
+
+
+class NDJSONParser(BaseParser):
+    """
+    Newline delimited JSON: one object per line, parsed lazily while the view writes batches, so a large
+    upload is never held in memory as a whole. A broken line becomes an invalid item, not a failed request.
+    """
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None) -> Iterator:
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        for number, line in enumerate(stream or (), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line.decode(encoding))
+            except ValueError as e:
+                yield ParseError(f'line {number}: {e}')
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    many=True serializer validating item by item: invalid items are reported with their own errors
+    instead of failing the whole list, valid ones are written with bulk_create / bulk_update and
+    post_save / m2m_changed are sent for them afterwards, so receivers (inbox delivery, rendered rich
+    text, permission versions) see bulk writes as well
+    """
+
+    pending: List[Tuple[int, dict, object]] = []  # the validated batch save() writes
+    written: Optional[List[dict]] = None  # results of the last save()
+
+    def save(self, **kwargs) -> List:
+        """
+        Write the pending batch: called by the view's perform_create / perform_update as for one object,
+        their keyword arguments (owner=request.user) are set on every item, as ListSerializer.save does
+        """
+        valid = [(position, {**data, **kwargs}, instance) for position, data, instance in self.pending]
+        if any(instance is not None for _, _, instance in valid):
+            self.written = self.bulk_update(valid)
+        else:
+            self.written = self.bulk_create(valid)
+        return self.instance
+
+    def validate_items(self, items: Iterable, instances: Optional[List] = None
+                       ) -> Tuple[List[Tuple[int, dict, object]], List[dict]]:
+        """ ([(position, validated data, instance)], [invalid results]) """
+        valid, invalid = [], []
+        for position, item in enumerate(items):
+            instance = instances[position] if instances is not None else None
+            if isinstance(item, Exception):
+                invalid.append(_result(position, RESULT_INVALID, errors=str(item)))
+                continue
+            self.child.instance = instance  # unique validators exclude the updated row
+            try:
+                valid.append((position, self.child.run_validation(item), instance))
+            except ValidationError as e:
+                invalid.append(_result(position, RESULT_INVALID, errors=e.detail))
+        self.child.instance = None
+        return valid, invalid
+
+    def resolve_relations(self, items: List):
+        """
+        Primary key relations of the whole batch with one query per field, instead of one per value
+        (the lookups are cached on this serializer's own field instances)
+        """
+        for field in self.child.fields.values():
+            if field.read_only:
+                continue
+            related, many = field, False
+            if isinstance(field, ManyRelatedField):
+                related, many = field.child_relation, True
+            if type(related) is not PrimaryKeyRelatedField or related.pk_field is not None:
+                continue
+            values = set()
+            for item in items:
+                value = item.get(field.field_name) if isinstance(item, dict) else None
+                for key in (value if many and isinstance(value, list) else [value]):
+                    if isinstance(key, (str, int)) and not isinstance(key, bool):
+                        values.add(key)
+            try:
+                found = related.get_queryset().in_bulk(list(values)) if values else {}
+            except (ValueError, TypeError, DjangoValidationError):  # malformed keys, validated one by one
+                continue
+            _cache_lookups(related, {str(pk): obj for pk, obj in found.items()})
+
+    def _overrides(self, method: str) -> bool:
+        # nested / custom writes of the child can not be expressed as bulk statements, nor can pre_save
+        # receivers (they change the object before it is written): saved one by one
+        if pre_save.has_listeners(self.child.Meta.model):
+            return True
+        return getattr(type(self.child), method) is not getattr(serializers.ModelSerializer, method)
+
+    def _split_many_to_many(self, data: dict) -> Tuple[dict, dict]:
+        names = _many_to_many_names(self.child.Meta.model)
+        data = dict(data)
+        return data, {name: data.pop(name) for name in names if name in data}
+
+    def bulk_create(self, valid: List[Tuple[int, dict, object]]) -> List[dict]:
+        model = self.child.Meta.model
+        try:
+            with transaction.atomic():
+                if self._overrides('create'):
+                    objects = [self.child.create(data) for _, data, _ in valid]
+                else:
+                    objects, relations = [], []
+                    for _, data, _ in valid:
+                        data, related = self._split_many_to_many(data)
+                        objects.append(model(**data))
+                        relations.append(related)
+                    model._default_manager.bulk_create(objects)
+                    _send_post_save(model, objects, created=True)
+                    _set_many_to_many(model, objects, relations, clear=False)
+        except DatabaseError:  # e.g. duplicates inside the batch: find the offending items one by one
+            return self._one_by_one(valid, RESULT_CREATED)
+        self.instance = objects
+        return [_result(position, RESULT_CREATED, id=obj.pk) for (position, _, _), obj in zip(valid, objects)]
+
+    def bulk_update(self, valid: List[Tuple[int, dict, object]]) -> List[dict]:
+        model = self.child.Meta.model
+        try:
+            with transaction.atomic():
+                if self._overrides('update'):
+                    for _, data, instance in valid:
+                        self.child.update(instance, data)
+                    objects = [instance for _, _, instance in valid]
+                else:
+                    objects, relations, fields = [], [], set()
+                    for _, data, instance in valid:
+                        data, related = self._split_many_to_many(data)
+                        for name, value in data.items():
+                            setattr(instance, name, value)
+                        fields.update(data)
+                        objects.append(instance)
+                        relations.append(related)
+                    now = timezone.now()
+                    for field in model._meta.concrete_fields:  # bulk_update skips pre_save
+                        if getattr(field, 'auto_now', False):
+                            for instance in objects:
+                                setattr(instance, field.attname, now)
+                            fields.add(field.name)
+                    if fields:
+                        model._default_manager.bulk_update(objects, sorted(fields))
+                        _send_post_save(model, objects, created=False, update_fields=frozenset(fields))
+                    _set_many_to_many(model, objects, relations, clear=True)
+        except DatabaseError:
+            return self._one_by_one(valid, RESULT_UPDATED)
+        self.instance = objects
+        return [_result(position, RESULT_UPDATED, id=instance.pk) for position, _, instance in valid]
+
+    def _one_by_one(self, valid: List[Tuple[int, dict, object]], result: str) -> List[dict]:
+        results, self.instance = [], []
+        for position, data, instance in valid:
+            try:
+                with transaction.atomic():  # a savepoint per item
+                    if instance is None:
+                        instance = self.child.create(data)
+                    else:
+                        self.child.update(instance, data)
+            except DatabaseError as e:
+                results.append(_result(position, RESULT_FAILED, errors=str(e)))
+            else:
+                results.append(_result(position, result, id=instance.pk))
+                self.instance.append(instance)
+        return results
+
+
+def _save_batch(serializer: BulkListSerializer, valid: List[Tuple[int, dict, object]], perform) -> List[dict]:
+    """ Results of `perform` (the view's perform_create / perform_update) saving the batch """
+    serializer.pending, serializer.written = valid, None
+    perform(serializer)
+    if serializer.written is None:  # the hook decided not to save
+        return [_result(position, RESULT_FAILED, errors='not saved') for position, _, _ in valid]
+    return serializer.written
+
+
+def _send_post_save(model, objects: List, created: bool, update_fields=None):
+    """ post_save of every object of a bulk statement, as save() would have sent it """
+    if not objects or not post_save.has_listeners(model):
+        return
+    using = router.db_for_write(model)
+    for obj in objects:
+        post_save.send(sender=model, instance=obj, created=created, update_fields=update_fields, raw=False,
+                       using=using)
+
+
+def _cache_lookups(field: PrimaryKeyRelatedField, objects: Dict[str, object]):
+    to_internal_value = type(field).to_internal_value
+
+    def cached(data):
+        obj = objects.get(str(data)) if isinstance(data, (str, int)) and not isinstance(data, bool) else None
+        return obj if obj is not None else to_internal_value(field, data)  # misses keep the usual errors
+
+    field.to_internal_value = cached
+
+
+def _result(position: int, result: str, **extra) -> dict:
+    return {'index': position, 'result': result, **extra}
+
+
+def _many_to_many_names(model) -> List[str]:
+    return [field.name for field in model._meta.many_to_many]
+
+
+def _set_many_to_many(model, objects: List, relations: List[Dict[str, list]], clear: bool):
+    """
+    Through rows of all objects with one delete (update) and one insert per relation; m2m_changed is sent
+    per object when something listens (clear, then add, as a clear() and add() would)
+    """
+    for name in _many_to_many_names(model):
+        owners = [(obj, related[name]) for obj, related in zip(objects, relations) if name in related]
+        if not owners:
+            continue
+        field = model._meta.get_field(name)
+        through = field.remote_field.through
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        signals = m2m_changed.has_listeners(through)
+        pk_sets = [(obj, {getattr(value, 'pk', value) for value in values}) for obj, values in owners]
+        if clear:
+            _send_m2m_changed(signals, field, [(obj, None) for obj, _ in owners], 'pre_clear')
+            through._default_manager.filter(**{f'{source}__in': [obj.pk for obj, _ in owners]}).delete()
+            _send_m2m_changed(signals, field, [(obj, None) for obj, _ in owners], 'post_clear')
+        _send_m2m_changed(signals, field, pk_sets, 'pre_add')
+        through._default_manager.bulk_create([
+            through(**{f'{source}_id': obj.pk, f'{target}_id': pk})
+            for obj, pks in pk_sets for pk in pks
+        ], ignore_conflicts=True)
+        _send_m2m_changed(signals, field, pk_sets, 'post_add')
+
+
+def _send_m2m_changed(signals: bool, field, pk_sets: List[Tuple[object, Optional[set]]], action: str):
+    if not signals:
+        return
+    through, related = field.remote_field.through, field.remote_field.model
+    using = router.db_for_write(through)
+    for obj, pks in pk_sets:
+        if pks is not None and not pks and action.endswith('_add'):  # add() of nothing sends nothing
+            continue
+        m2m_changed.send(sender=through, instance=obj, action=action, reverse=False, model=related, pk_set=pks,
+                         using=using)
+
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def is_bulk(data) -> bool:
+    """ a json list or a (lazy) ndjson stream """
+    return isinstance(data, list) or isinstance(data, Iterator)
+
+
+def bulk_response(results: List[dict]) -> Response:
+    """
+    Per-item results in the usual envelope: 200 when all were written, 207 in the envelope when some
+    were not, 400 when none was
+    """
+    counts = {}
+    for item in results:
+        counts[item['result']] = counts.get(item['result'], 0) + 1
+    written = counts.get(RESULT_CREATED, 0) + counts.get(RESULT_UPDATED, 0)
+    failed = len(results) - written
+    status_code = status.HTTP_200_OK if not failed else (
+        status.HTTP_207_MULTI_STATUS if written else status.HTTP_400_BAD_REQUEST)
+    response = Responses.make_response(data={'counts': counts, 'results': results}, status_code=status_code,
+                                       error=bool(failed))
+    if status_code == status.HTTP_400_BAD_REQUEST:
+        response.status_code = status_code
+    return response
+
+
+class BulkCreateMixin:
+    """
+    create() accepting a list (application/json) or a stream (application/x-ndjson) of objects:
+    validated with the view serializer, written with bulk_create in BULK_BATCH_SIZE transactions, each
+    batch saved through perform_create
+    """
+
+    bulk_batch_size: Optional[int] = None
+    parser_classes = list(api_settings.DEFAULT_PARSER_CLASSES) + [NDJSONParser]
+
+    def get_bulk_serializer(self) -> BulkListSerializer:
+        return BulkListSerializer(child=self.get_serializer_class()(context=self.get_serializer_context()))
+
+    def bulk_create(self, items: Iterable) -> Response:
+        serializer = self.get_bulk_serializer()
+        results, offset = [], 0
+        for batch in _batches(_limited(items), self.bulk_batch_size or settings.BULK_BATCH_SIZE):
+            serializer.resolve_relations(batch)
+            valid, invalid = serializer.validate_items(batch)
+            written = _save_batch(serializer, valid, self.perform_create) if valid else []
+            results.extend(_shift(invalid + written, offset))
+            offset += len(batch)
+        return bulk_response(sorted(results, key=lambda item: item['index']))
+
+
+class BulkUpdateMixin:
+    """
+    update() accepting a list or an ndjson stream of objects with their `bulk_lookup_field` (a unique
+    field, the pk by default): rows are loaded from the view queryset per batch and written with
+    bulk_update through perform_update
+    """
+
+    bulk_batch_size: Optional[int] = None
+    bulk_lookup_field = 'id'
+
+    def get_bulk_serializer(self, partial: bool = False) -> BulkListSerializer:
+        child = self.get_serializer_class()(context=self.get_serializer_context(), partial=partial)
+        return BulkListSerializer(child=child, partial=partial)
+
+    def bulk_update(self, items: Iterable, partial: bool = False) -> Response:
+        serializer = self.get_bulk_serializer(partial=partial)
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup = self.bulk_lookup_field
+        results, offset = [], 0
+        for batch in _batches(_limited(items), self.bulk_batch_size or settings.BULK_BATCH_SIZE):
+            keys = [item.get(lookup) if isinstance(item, dict) else None for item in batch]
+            try:
+                found = {str(getattr(obj, lookup)): obj
+                         for obj in queryset.filter(**{f'{lookup}__in': [key for key in keys if _is_key(key)]})}
+            except (ValueError, TypeError, DjangoValidationError):  # malformed keys, look them up one by one
+                found = _lookup_each(queryset, lookup, keys)
+            present, instances, missing = [], [], []
+            for position, (item, key) in enumerate(zip(batch, keys)):
+                instance = found.get(str(key)) if _is_key(key) else None
+                if instance is None:
+                    missing.append(_result(position, RESULT_NOT_FOUND, **{lookup: key}))
+                    continue
+                try:
+                    self.check_object_permissions(self.request, instance)
+                except PermissionDenied:
+                    missing.append(_result(position, RESULT_FORBIDDEN, **{lookup: key}))
+                    continue
+                present.append((position, item))
+                instances.append(instance)
+            serializer.resolve_relations([item for _, item in present])
+            valid, invalid = serializer.validate_items([item for _, item in present], instances)
+            positions = [position for position, _ in present]  # back to positions in the batch
+            invalid = [dict(item, index=positions[item['index']]) for item in invalid]
+            valid = [(positions[i], data, instance) for i, data, instance in valid]
+            written = _save_batch(serializer, valid, self.perform_update) if valid else []
+            results.extend(_shift(missing + invalid + written, offset))
+            offset += len(batch)
+        return bulk_response(sorted(results, key=lambda item: item['index']))
+
+
+def _is_key(key) -> bool:
+    # 0 is a valid value of a non-pk lookup field, lists / objects are not lookups
+    return isinstance(key, (str, int)) and not isinstance(key, bool) and key != ''
+
+
+def _lookup_each(queryset, lookup: str, keys: List) -> dict:
+    found = {}
+    for key in keys:
+        try:
+            instance = queryset.filter(**{lookup: key}).first() if _is_key(key) else None
+        except (ValueError, TypeError, DjangoValidationError):
+            instance = None
+        if instance is not None:
+            found[str(key)] = instance
+    return found
+
+
+def _limited(items: Iterable) -> Iterator:
+    # earlier batches may be committed already: the overflow is reported as one invalid item, not raised
+    limit = settings.BULK_MAX_ITEMS
+    for count, item in enumerate(items, start=1):
+        if count > limit:
+            yield ParseError(f'at most {limit} items per request, the rest was not read')
+            return
+        yield item
+
+
+def _shift(results: List[dict], offset: int) -> List[dict]:
+    for item in results:
+        item['index'] += offset
+    return results
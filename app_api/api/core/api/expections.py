@@ -1,28 +1,81 @@
-from rest_framework.views import exception_handler
+import json
+import threading
+from collections import Counter
+from typing import Callable, Dict
+
+from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+from rest_framework.views import exception_handler, set_rollback
+
+from api.core.utils.constants import CONSTANTS
 
 
 def custom_exception_handler(exc, context):  # custom exception handler
-    handlers = {
-        'ValidationError': _handle_validation_error,
-        'Http404': _handle_404_error,
-        'PermissionDenied': _handle_generic_error,
-        'NotAuthenticated': _handle_authentication_error
-    }  # dict handlers
-    response = exception_handler(exc, context)
-    if response is not None:
-        response['status_code'] = response.status_code
-    # if 'UsersTools' in str(context['view']):
-    #     print(context)
-    exception_class = exc.__class__.__name__  # class name exception
-    # print(exception_class, response, response.data, response.context_data)
+    count_error(exc, context)
+    return _resolve_handler(exc.__class__)(exc, context)
+
+
+# # errors counter, by exception class and view class (for metrics)
+
+_error_counts = Counter()
+_error_counts_lock = threading.Lock()
+
+
+def count_error(exc, context):
+    view = context.get('view')
+    key = (exc.__class__.__name__, view.__class__.__name__ if view is not None else '')
+    with _error_counts_lock:
+        _error_counts[key] += 1
+
+
+def get_error_counts(reset: bool = False) -> Dict[tuple, int]:
+    with _error_counts_lock:
+        counts = dict(_error_counts)
+        if reset:
+            _error_counts.clear()
+    return counts
+
+
+# # pre-serialized envelopes of constant error bodies
+
+def _envelope_bytes(message: str, status_code: int) -> bytes:  # same bytes JSONRenderer would produce
+    return json.dumps(
+        {'message': message, 'status_code': status_code}, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+PREBUILT_BODIES = {
+    (key, status_code): _envelope_bytes(CONSTANTS[key], status_code)
+    for key, status_code in [
+        ('error_not_found', status.HTTP_404_NOT_FOUND),
+        ('error_not_authenticated', status.HTTP_401_UNAUTHORIZED),
+        ('error_not_authenticated', status.HTTP_403_FORBIDDEN),  # no WWW-Authenticate -> coerced to 403
+        ('error_unauthorized', status.HTTP_403_FORBIDDEN),
+        ('error_throttled', status.HTTP_429_TOO_MANY_REQUESTS),
+    ]
+}
 
-    if exception_class in handlers:  # if exception class in handlers, call the function
 
-        return handlers[exception_class](exc, context, response)
+def _prebuilt_response(key: str, status_code: int, exception) -> HttpResponse:  # skips negotiation and rendering
+    body = PREBUILT_BODIES.get((key, status_code)) or _envelope_bytes(CONSTANTS[key], status_code)
+    set_rollback()
+    response = HttpResponse(body, content_type='application/json', status=status_code)
+    response['status_code'] = status_code
+    auth_header = getattr(exception, 'auth_header', None)
+    if auth_header:
+        response['WWW-Authenticate'] = auth_header
+    wait = getattr(exception, 'wait', None)
+    if wait:
+        response['Retry-After'] = '%d' % wait
     return response
 
 
-def _handle_validation_error(exception, context, response):  # custom validation error handle
+# # handlers
+
+def _handle_validation_error(exception, context):  # custom validation error handle
+    response = _handle_generic_error(exception, context)
     response.data = {
         'message': response.data,
         'status_code': response.status_code,
@@ -31,22 +84,53 @@ def _handle_validation_error(exception, context, response):  # custom validation
     return response
 
 
-def _handle_generic_error(exception, context, response):
+def _handle_generic_error(exception, context):
+    response = exception_handler(exception, context)
+    if response is not None:
+        response['status_code'] = response.status_code
     return response
 
 
-def _handle_404_error(exception, context, response):  # custom 404 error handle
-    response.data = {
-        'status_code': response.status_code,
-        'message': 'this page is not found'
-    }
+def _handle_404_error(exception, context):  # custom 404 error handle
+    return _prebuilt_response('error_not_found', status.HTTP_404_NOT_FOUND, exception)
+
+
+def _handle_permission_error(exception, context):  # django and drf PermissionDenied
+    detail = getattr(exception, 'detail', None)
+    if detail is None or str(detail) == str(exceptions.PermissionDenied.default_detail):
+        return _prebuilt_response('error_unauthorized', status.HTTP_403_FORBIDDEN, exception)
+    set_rollback()
+    response = Response({'message': detail, 'status_code': status.HTTP_403_FORBIDDEN}, status=status.HTTP_403_FORBIDDEN)
+    response['status_code'] = status.HTTP_403_FORBIDDEN
     return response
 
 
-def _handle_authentication_error(exception, context, response):  # custom authentication error handle
-    response.data = {
-        'message': 'Please login to proceed',
-        'status_code': response.status_code
-    }
+def _handle_authentication_error(exception, context):  # custom authentication error handle
+    return _prebuilt_response('error_not_authenticated', exception.status_code, exception)
 
-    return response
+
+def _handle_throttled(exception, context):  # same body as the 429 of RateLimitMiddleware
+    return _prebuilt_response('error_throttled', status.HTTP_429_TOO_MANY_REQUESTS, exception)
+
+
+# exception class -> handler, looked up along the mro so subclasses are handled too
+HANDLERS: Dict[type, Callable] = {
+    exceptions.ValidationError: _handle_validation_error,
+    Http404: _handle_404_error,
+    exceptions.NotFound: _handle_404_error,
+    DjangoPermissionDenied: _handle_permission_error,
+    exceptions.PermissionDenied: _handle_permission_error,
+    exceptions.NotAuthenticated: _handle_authentication_error,
+    exceptions.Throttled: _handle_throttled,
+}
+_resolved_handlers: Dict[type, Callable] = {}
+
+
+def _resolve_handler(exception_class: type) -> Callable:
+    handler = _resolved_handlers.get(exception_class)
+    if handler is None:
+        handler = next(
+            (HANDLERS[cls] for cls in exception_class.__mro__ if cls in HANDLERS), _handle_generic_error
+        )
+        _resolved_handlers[exception_class] = handler
+    return handler
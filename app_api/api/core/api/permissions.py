@@ -8,3 +8,37 @@ class IsNotAuthenticated(permissions.BasePermission):
 
     def has_permission(self, request, view) -> bool:
         return not request.user.is_authenticated
+
+
+class HasPermissions(permissions.BasePermission):
+    """
+    Requires all of `view.required_permissions` ('app_label.codename'); the sets come from the
+    permission cache, no query per request
+    """
+
+    def has_permission(self, request, view) -> bool:
+        required = getattr(view, 'required_permissions', ())
+        return bool(request.user and request.user.is_authenticated and request.user.has_perms(required))
+
+
+class ModelPermissions(permissions.DjangoModelPermissions):
+    """
+    DjangoModelPermissions without building the view queryset (get_queryset may be costly, e.g. with eager
+    loading); the permission sets come from the permission cache
+    """
+
+    def _model(self, view):
+        queryset = getattr(view, 'queryset', None)
+        if queryset is not None:
+            return queryset.model
+        serializer_class = getattr(view, 'serializer_class', None)
+        model = getattr(getattr(serializer_class, 'Meta', None), 'model', None)
+        return model or self._queryset(view).model
+
+    def has_permission(self, request, view) -> bool:
+        if getattr(view, '_ignore_model_permissions', False):
+            return True
+        user = request.user
+        if not user or (not user.is_authenticated and self.authenticated_users_only):
+            return False
+        return user.has_perms(self.get_required_permissions(request.method, self._model(view)))
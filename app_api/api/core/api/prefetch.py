@@ -0,0 +1,184 @@
+from typing import Dict, List, Optional, Set, Tuple, Type
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, Prefetch, QuerySet
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
+
+
+class EagerLoading:
+    """
+    select_related paths, prefetched relations and the concrete columns a serializer reads from its model
+    (`columns` is None when some field may read anything, e.g. a method field or a property)
+    """
+
+    def __init__(self, model: Type[Model]):
+        self.model = model
+        self.select: Set[str] = set()
+        self.prefetch: Dict[str, 'EagerLoading'] = {}  # path -> loading of the related queryset
+        self.columns: Optional[Set[str]] = set()
+        self.keep: Set[str] = set()  # columns the prefetch join needs on top of `columns`
+
+    def add_column(self, name: str):
+        if self.columns is not None:
+            self.columns.add(name)
+
+    def add_prefetch(self, path: str, loading: 'EagerLoading'):
+        # the same relation may be read by several fields (e.g. ids and names), one lookup serves all
+        if path in self.prefetch:
+            self.prefetch[path].merge(loading)
+        else:
+            self.prefetch[path] = loading
+
+    def merge(self, other: 'EagerLoading'):
+        self.select |= other.select
+        for path, loading in other.prefetch.items():
+            self.add_prefetch(path, loading)
+        if self.columns is None or other.columns is None:
+            self.columns = None
+        else:
+            self.columns |= other.columns
+
+    def queryset(self) -> QuerySet:
+        queryset = self.model._default_manager.all()
+        if self.columns is not None:
+            queryset = queryset.only(*(self.columns | self.keep | {self.model._meta.pk.name}))
+        return self.apply(queryset)
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        if self.select:
+            queryset = queryset.select_related(*sorted(self.select))
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*(
+                Prefetch(path, queryset=loading.queryset()) for path, loading in self.prefetch.items()
+            ))
+        return queryset
+
+
+def _serializer_fields(serializer_class) -> dict:
+    serializer = serializer_class() if isinstance(serializer_class, type) else serializer_class
+    return serializer.fields
+
+
+def _model_field(model: Type[Model], name: str):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _unwrap(field) -> Tuple[object, bool]:
+    """ (serializer or related field, many) """
+    if isinstance(field, serializers.ListSerializer):
+        return field.child, True
+    if isinstance(field, ManyRelatedField):
+        return field.child_relation, True
+    return field, False
+
+
+def _related_columns(field, related_model: Type[Model]) -> Optional[Set[str]]:
+    """ columns read from a related object by a RelatedField, None for unknown (__str__, hyperlinks) """
+    pk = related_model._meta.pk.name
+    if isinstance(field, PrimaryKeyRelatedField):
+        return {pk}
+    slug_field = getattr(field, 'slug_field', None)
+    if slug_field is not None and _model_field(related_model, slug_field) is not None:
+        return {pk, slug_field}
+    return None
+
+
+def _reverse_join_column(model_field) -> Set[str]:
+    # a prefetched reverse fk needs its own fk column to be matched with the parents
+    remote = getattr(model_field, 'remote_field', None)
+    if model_field.one_to_many and remote is not None:
+        return {remote.name}
+    return set()
+
+
+def collect(serializer_class, model: Type[Model], prefix: str = '') -> EagerLoading:
+    """
+    Walk the serializer field tree: forward single relations become select_related paths (nested
+    serializers continue the walk with the same prefix), many relations become Prefetch objects
+    with their own optimized, column-narrowed querysets.
+    """
+    loading = EagerLoading(model)
+    for field in _serializer_fields(serializer_class).values():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+            loading.columns = None
+            continue
+        bits = field.source.split('.')
+        model_field = _model_field(model, bits[0])
+        if model_field is None:  # property / method on the model
+            loading.columns = None
+            continue
+
+        inner, many = _unwrap(field)
+        if not model_field.is_relation:
+            loading.add_column(model_field.name)
+            continue
+
+        related_model = model_field.related_model
+        path = f'{prefix}{bits[0]}'
+        if model_field.many_to_one or model_field.one_to_one:  # forward fk, one to one in both directions
+            if model_field.concrete:
+                loading.add_column(model_field.name)
+                if len(bits) == 1 and isinstance(inner, PrimaryKeyRelatedField):
+                    continue  # the fk column is enough
+            loading.select.add(path)
+            if len(bits) > 1:  # dotted source, e.g. 'category.name'
+                _select_dotted(loading, related_model, bits[1:], path)
+            elif isinstance(inner, serializers.BaseSerializer):
+                nested = collect(inner, related_model, prefix=f'{path}__')
+                loading.select |= nested.select
+                for nested_path, nested_loading in nested.prefetch.items():
+                    loading.add_prefetch(nested_path, nested_loading)
+            continue
+
+        # many to many, reverse fk: one query per relation, not per row
+        if isinstance(inner, serializers.BaseSerializer):
+            related = collect(inner, related_model)
+        else:
+            related = EagerLoading(related_model)
+            related.columns = _related_columns(inner, related_model) if isinstance(inner, RelatedField) else None
+        related.keep |= _reverse_join_column(model_field)
+        loading.add_prefetch(path, related)
+    return loading
+
+
+def _select_dotted(loading: EagerLoading, model: Type[Model], bits: List[str], path: str):
+    for bit in bits[:-1]:
+        model_field = _model_field(model, bit)
+        if model_field is None or not (model_field.many_to_one or model_field.one_to_one):
+            return
+        path = f'{path}__{bit}'
+        loading.select.add(path)
+        model = model_field.related_model
+
+
+def optimize_queryset(queryset: QuerySet, serializer_class) -> QuerySet:
+    """
+    Queryset with the select_related / prefetch_related the serializer needs: the number of
+    queries of a list stays constant, whatever the page size.
+    """
+    return collect(serializer_class, queryset.model).apply(queryset)
+
+
+class PrefetchSerializerMixin:
+    """
+    Serializer mixin: `SomeSerializer.setup_eager_loading(queryset)` in views without get_queryset
+    """
+
+    @classmethod
+    def setup_eager_loading(cls, queryset: QuerySet) -> QuerySet:
+        return optimize_queryset(queryset, cls)
+
+
+class PrefetchQuerysetMixin:
+    """
+    Generic view mixin: get_queryset() is optimized for get_serializer_class()
+    """
+
+    def get_queryset(self) -> QuerySet:
+        return optimize_queryset(super().get_queryset(), self.get_serializer_class())
@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import os
+import threading
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import etag
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_FORMATS = ('openapi', 'json')
+# field attributes that end up in the schema
+SCHEMA_FIELD_ATTRS = ('required', 'read_only', 'write_only', 'allow_null', 'allow_blank', 'allow_empty', 'many',
+                      'max_length', 'min_length', 'max_value', 'min_value', 'max_digits', 'decimal_places',
+                      'format', 'source', 'label', 'help_text')
+
+
+class CachedSchema(NamedTuple):
+    urlconf_hash: str
+    content: bytes
+    etag: str
+    path: str
+
+
+def _describe_fields(serializer) -> str:
+    """
+    Field definitions of a serializer instance, nested serializers included; read from the field objects
+    only (choices of related fields would query the database)
+    """
+    from rest_framework import serializers
+
+    parts = []
+    for name, field in serializer.fields.items():
+        attrs = [(attr, str(getattr(field, attr))) for attr in SCHEMA_FIELD_ATTRS
+                 if getattr(field, attr, None) is not None]
+        if isinstance(field, serializers.ChoiceField):
+            attrs.append(('choices', str(list(field.choices.items()))))
+        line = f'{name}={type(field).__name__}{attrs}'
+        child = getattr(field, 'child', None) or getattr(field, 'child_relation', None)
+        if isinstance(field, serializers.BaseSerializer) and hasattr(field, 'fields'):
+            line += '{' + _describe_fields(field) + '}'
+        elif isinstance(child, serializers.BaseSerializer):
+            line += '[{' + _describe_fields(child) + '}]'
+        elif child is not None:
+            line += f'[{type(child).__name__}]'
+        parts.append(line)
+    return ','.join(parts)
+
+
+def _describe_serializer(serializer_class, described: Dict[type, str]) -> str:
+    if serializer_class not in described:
+        try:
+            fields = _describe_fields(serializer_class())
+        except Exception:  # needs arguments / context: its name only, as before
+            logger.debug('schema hash: fields of %s not described', serializer_class, exc_info=True)
+            fields = ''
+        described[serializer_class] = f'{serializer_class.__module__}.{serializer_class.__qualname__}({fields})'
+    return described[serializer_class]
+
+
+def _describe_patterns(patterns: Iterable, prefix: str = '', described: Dict[type, str] = None) -> Iterable[str]:
+    described = {} if described is None else described
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if hasattr(pattern, 'url_patterns'):
+            yield from _describe_patterns(pattern.url_patterns, route, described)
+            continue
+        callback = pattern.callback
+        view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None) or callback
+        serializer_class = getattr(view_class, 'serializer_class', None)
+        yield '|'.join([
+            route,
+            str(pattern.name),
+            f'{view_class.__module__}.{view_class.__qualname__}',
+            _describe_serializer(serializer_class, described) if serializer_class else '',
+        ])
+
+
+def urlconf_hash() -> str:  # changes when routes, views, their serializers or serializer fields change
+    from django.urls import get_resolver
+    from mainapp.yasg import API_VERSION
+
+    digest = hashlib.sha256(API_VERSION.encode())
+    for line in sorted(_describe_patterns(get_resolver().url_patterns)):
+        digest.update(line.encode())
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def schema_path(hash_: str) -> str:
+    from mainapp.yasg import API_VERSION
+
+    return os.path.join(settings.OPENAPI_SCHEMA_DIR, f'openapi-{API_VERSION}-{hash_[:16]}.json')
+
+
+def generate_schema() -> bytes:  # full introspection of views and serializers, slow
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+    from mainapp.yasg import get_api_info
+
+    generator = OpenAPISchemaGenerator(info=get_api_info())
+    schema = generator.get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def _write_atomic(path: str, content: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def build_schema(force: bool = False) -> CachedSchema:
+    """
+    Load the schema file for the current urlconf hash, generating it only if it is missing.
+    """
+    hash_ = urlconf_hash()
+    path = schema_path(hash_)
+    content = None
+    if not force and os.path.exists(path):
+        with open(path, 'rb') as f:
+            content = f.read()
+    if content is None:
+        logger.info('generating openapi schema %s', path)
+        content = generate_schema()
+        _write_atomic(path, content)
+    return CachedSchema(
+        urlconf_hash=hash_,
+        content=content,
+        etag=hashlib.sha256(content).hexdigest()[:32],
+        path=path,
+    )
+
+
+_lock = threading.Lock()
+_cached: Optional[CachedSchema] = None
+
+
+def get_schema() -> CachedSchema:  # process-wide, the urlconf does not change while running
+    global _cached
+    if _cached is None:
+        with _lock:
+            if _cached is None:
+                _cached = build_schema()
+    return _cached
+
+
+def reset_schema_cache():
+    global _cached
+    _cached = None
+
+
+def is_schema_request(request) -> bool:
+    return request.GET.get('format') in SCHEMA_FORMATS
+
+
+@etag(lambda request, *args, **kwargs: get_schema().etag)
+def schema_json_view(request, *args, **kwargs) -> HttpResponse:
+    response = HttpResponse(get_schema().content, content_type='application/json')
+    response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    return response
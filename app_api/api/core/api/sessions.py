@@ -0,0 +1,124 @@
+"""
+Session engine and middleware: sessions stored by SESSION_STORE_BACKEND (db, or cached_db in
+SESSION_CACHE_ALIAS when that cache is shared between the workers), written back only when their content changed, never touched at all for
+requests authenticated by an Authorization header (token, JWT, basic).
+
+    SESSION_ENGINE = 'api.core.api.sessions'
+    MIDDLEWARE = [..., 'api.core.api.sessions.SessionMiddleware', ...]  # instead of django's
+"""
+import time
+from importlib import import_module
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.contrib.sessions.backends.base import SessionBase
+from django.contrib.sessions.middleware import SessionMiddleware as DjangoSessionMiddleware
+from django.utils import timezone
+
+
+class ChangeTrackingMixin:
+    """
+    Remembers the key and the serialized data as loaded: `modified` is set by any assignment, even of the
+    same value (login of the same user, views writing a flag on every request), `has_changed` compares
+    """
+
+    _loaded: Optional[bytes] = None
+    _loaded_key: Optional[str] = None
+
+    def _snapshot(self, data: dict) -> bytes:
+        return self.serializer().dumps(data)
+
+    def load(self) -> dict:
+        data = super().load()
+        self._loaded, self._loaded_key = self._snapshot(data), self.session_key
+        return data
+
+    def has_changed(self) -> bool:
+        if self.session_key != self._loaded_key:  # created, cycled on login or flushed: the cookie changes
+            return True
+        if self._loaded is None:  # new session, never loaded
+            return bool(self._session)
+        return self._snapshot(self._session) != self._loaded
+
+    @classmethod
+    def clear_expired(cls, batch: int = None, pause: float = None, progress: Callable[[int], None] = None) -> int:
+        """
+        Expired rows deleted in primary key batches with a pause in between (`clearsessions` deletes them
+        in one statement); the cache only store has nothing to clear, entries expire by themselves
+        """
+        if not hasattr(cls, 'get_model_class'):
+            super().clear_expired()
+            return 0
+        batch = batch or settings.SESSION_CLEANUP_BATCH
+        pause = settings.SESSION_CLEANUP_PAUSE if pause is None else pause
+        model = cls.get_model_class()
+        deleted = 0
+        while True:
+            expired = model.objects.filter(expire_date__lt=timezone.now())
+            keys = list(expired.values_list('session_key', flat=True)[:batch])
+            if not keys:
+                return deleted
+            deleted += model.objects.filter(session_key__in=keys).delete()[0]
+            if progress is not None:
+                progress(deleted)
+            if len(keys) < batch:
+                return deleted
+            time.sleep(pause)
+
+
+def _store_class():
+    base = import_module(settings.SESSION_STORE_BACKEND).SessionStore
+    return type('SessionStore', (ChangeTrackingMixin, base), {'__module__': __name__})
+
+
+SessionStore = _store_class()
+
+
+class StatelessSession(SessionBase):
+    """
+    Session of a header-authenticated request: always empty, never read or written, sets no cookie
+    """
+
+    def load(self) -> dict:
+        return {}
+
+    def exists(self, session_key) -> bool:
+        return False
+
+    def create(self):
+        self.modified = True
+
+    def save(self, must_create=False):
+        pass
+
+    def delete(self, session_key=None):
+        pass
+
+    @classmethod
+    def clear_expired(cls):
+        pass
+
+
+def is_stateless(request) -> bool:
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    return authorization.split(' ', 1)[0] in settings.SESSIONLESS_AUTH_SCHEMES
+
+
+class SessionMiddleware(DjangoSessionMiddleware):
+    """
+    Django's session middleware, without the session of API clients and without no-op writes
+    """
+
+    def process_request(self, request):
+        if is_stateless(request):
+            request.session = StatelessSession()
+            return
+        super().process_request(request)
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if session is None or isinstance(session, StatelessSession):
+            return response
+        if session.modified and not settings.SESSION_SAVE_EVERY_REQUEST and hasattr(session, 'has_changed'):
+            session.modified = session.has_changed()
+        return super().process_response(request, response)
@@ -0,0 +1,287 @@
+"""
+Token bucket rate limiting shared by all workers.
+
+RateLimitMiddleware rejects before any authentication runs: a per-IP bucket for every request, stricter
+buckets for login / signup paths (THROTTLE_PATH_RULES) and for failed password attempts (charged on
+401/403, and on 400 of those paths: djoser answers a wrong password with it), so a credential stuffing flood
+is answered without hashing a password. The DRF throttle classes add per-user and per-view-scope
+buckets after authentication. Buckets live in THROTTLE_STORE_URL: memory:// (one process, tests) or
+redis://... (atomic Lua script, clock of the redis server).
+"""
+import logging
+import re
+import threading
+import time
+from math import ceil
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.throttling import BaseThrottle
+
+from api.core.api.expections import PREBUILT_BODIES
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'sec': 1, 'second': 1, 'm': 60, 'min': 60, 'minute': 60, 'h': 3600, 'hour': 3600,
+           'd': 86400, 'day': 86400}
+THROTTLED_STATUS = 429
+
+
+class Rate(NamedTuple):
+    capacity: int  # burst
+    per_second: float  # refill
+
+    @classmethod
+    def parse(cls, rate: str) -> 'Rate':
+        """ '10/min', '5/s', '1000/hour' """
+        count, _, period = rate.partition('/')
+        if period not in PERIODS:
+            raise ValueError(f'invalid rate {rate!r}, expected N/s|min|hour|day')
+        return cls(int(count), int(count) / PERIODS[period])
+
+
+class Bucket(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until a token is available, 0 when allowed
+    reset: float  # seconds until the bucket is full again
+
+
+def _bucket(rate: Rate, tokens: float, allowed: bool, need: float) -> Bucket:
+    return Bucket(allowed, rate.capacity, int(tokens), 0.0 if allowed else (need - tokens) / rate.per_second,
+                  (rate.capacity - tokens) / rate.per_second)
+
+
+class MemoryStore:
+    """ Buckets of this process only (tests, single worker) """
+
+    MAX_KEYS = 100000
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # key -> (tokens, updated)
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: Rate, cost: int = 1) -> Bucket:
+        """ Take `cost` tokens if there are, cost 0 only checks that one is left """
+        now = time.monotonic()
+        need = max(cost, 1)
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (rate.capacity, now))
+            tokens = min(rate.capacity, tokens + (now - updated) * rate.per_second)
+            allowed = tokens >= need
+            if allowed:
+                tokens -= cost
+            if len(self._buckets) >= self.MAX_KEYS:
+                self._buckets.clear()  # an evicted bucket is a full one, the client only gains its burst back
+            self._buckets[key] = (tokens, now)
+        return _bucket(rate, tokens, allowed, need)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+TAKE_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local capacity, per_second, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * per_second)
+local allowed = 0
+if tokens >= math.max(cost, 1) then
+    allowed = 1
+    tokens = tokens - cost
+end
+redis.call('HMSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / per_second * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisStore:
+    """ Buckets shared by all workers: one round trip, refill and take in one atomic script """
+
+    def __init__(self, url: str, prefix: str = 'ratelimit:'):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.1)
+        self.prefix = prefix
+        self.script = self.client.register_script(TAKE_SCRIPT)
+
+    def take(self, key: str, rate: Rate, cost: int = 1) -> Bucket:
+        allowed, tokens = self.script(keys=[self.prefix + key], args=[rate.capacity, rate.per_second, cost])
+        return _bucket(rate, float(tokens), bool(allowed), max(cost, 1))
+
+    def clear(self):
+        for key in self.client.scan_iter(f'{self.prefix}*'):
+            self.client.delete(key)
+
+
+_stores: Dict[str, object] = {}
+_rates: Dict[str, Rate] = {}
+
+
+def get_store():
+    url = settings.THROTTLE_STORE_URL
+    store = _stores.get(url)
+    if store is None:
+        store = _stores[url] = MemoryStore() if url.startswith('memory://') else RedisStore(url)
+    return store
+
+
+def get_rate(scope: str) -> Optional[Rate]:
+    rate = settings.THROTTLE_RATES.get(scope)
+    if rate is None:
+        return None
+    if rate not in _rates:
+        _rates[rate] = Rate.parse(rate)
+    return _rates[rate]
+
+
+def take(scope: str, ident: str, cost: int = 1) -> Optional[Bucket]:
+    """ None when the scope has no rate or the store is unreachable (fail open, logged) """
+    rate = get_rate(scope)
+    if rate is None:
+        return None
+    try:
+        return get_store().take(f'{scope}:{ident}', rate, cost)
+    except Exception:
+        logger.warning('throttling: store unavailable, %s not limited', scope, exc_info=True)
+        return None
+
+
+def client_ip(request) -> str:
+    return BaseThrottle().get_ident(request)  # REMOTE_ADDR or X-Forwarded-For per NUM_PROXIES
+
+
+def _record(request, bucket: Bucket):
+    """ The most restrictive bucket of the request ends up in the RateLimit-* headers """
+    current = getattr(request, '_rate_limit', None)
+    if current is None or bucket.remaining < current.remaining:
+        request._rate_limit = bucket
+
+
+def _set_headers(response, bucket: Bucket):
+    response['RateLimit-Limit'] = str(bucket.limit)
+    response['RateLimit-Remaining'] = str(max(bucket.remaining, 0))
+    response['RateLimit-Reset'] = str(ceil(bucket.reset))
+    if not bucket.allowed:
+        response['Retry-After'] = str(max(ceil(bucket.retry_after), 1))
+
+
+_THROTTLED_BODY = PREBUILT_BODIES[('error_throttled', THROTTLED_STATUS)]
+
+
+def throttled_response(bucket: Bucket) -> HttpResponse:
+    response = HttpResponse(_THROTTLED_BODY, content_type='application/json', status=THROTTLED_STATUS)
+    response['status_code'] = THROTTLED_STATUS
+    _set_headers(response, bucket)
+    return response
+
+
+class RateLimitMiddleware:
+    """
+    Runs before sessions, authentication and the view: a rejected request costs one store round trip
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.exempt = re.compile(settings.THROTTLE_EXEMPT_PATHS) if settings.THROTTLE_EXEMPT_PATHS else None
+        self.rules: List[Tuple[re.Pattern, Tuple[str, ...], str]] = [
+            (re.compile(pattern), tuple(methods), scope) for pattern, methods, scope in settings.THROTTLE_PATH_RULES
+        ]
+
+    def _check(self, request, scope: str, ident: str, cost: int = 1) -> Optional[HttpResponse]:
+        bucket = take(scope, ident, cost)
+        if bucket is None:
+            return None
+        if not bucket.allowed:
+            return throttled_response(bucket)
+        _record(request, bucket)
+        return None
+
+    def __call__(self, request):
+        path = request.path_info.lstrip('/')
+        if self.exempt is not None and self.exempt.match(path):
+            return self.get_response(request)
+        ip = client_ip(request)
+        rejected = self._check(request, 'ip', ip)
+        matched = False
+        for pattern, methods, scope in self.rules:
+            if rejected is None and request.method in methods and pattern.match(path):
+                matched = True
+                rejected = self._check(request, scope, ip)
+        # failed credentials are charged after the response, here only the remaining budget is checked
+        credentials = matched or request.META.get('HTTP_AUTHORIZATION', '').startswith('Basic ')
+        if rejected is None and credentials:
+            rejected = self._check(request, 'credentials', ip, cost=0)
+        if rejected is not None:
+            return rejected
+
+        response = self.get_response(request)
+        if credentials and _authentication_failed(request, response, matched):
+            take('credentials', ip)
+        bucket = getattr(request, '_rate_limit', None)
+        if bucket is not None and 'RateLimit-Limit' not in response:
+            _set_headers(response, bucket)
+        return response
+
+
+def _authentication_failed(request, response, login_path: bool) -> bool:
+    if response.status_code == 400:  # djoser token/login: "Unable to log in with provided credentials."
+        return login_path
+    if response.status_code not in (401, 403):
+        return False
+    # a 403 of an authenticated user is a permission denial, not a wrong password
+    user = getattr(request, 'user', None)
+    return response.status_code == 401 or not (user is not None and user.is_authenticated)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle over the shared store, `scope` picks the rate in THROTTLE_RATES
+    """
+
+    scope: Optional[str] = None
+
+    def get_scope(self, request, view) -> Optional[str]:
+        return self.scope
+
+    def get_ident(self, request) -> str:
+        return client_ip(request)
+
+    def allow_request(self, request, view) -> bool:
+        scope = self.get_scope(request, view)
+        self.bucket = take(scope, self.get_ident(request)) if scope else None
+        if self.bucket is None:
+            return True
+        if self.bucket.allowed:
+            _record(request._request, self.bucket)
+        return self.bucket.allowed
+
+    def wait(self) -> Optional[float]:
+        return max(ceil(self.bucket.retry_after), 1) if self.bucket is not None else None
+
+
+class UserRateThrottle(TokenBucketThrottle):
+    """ Per authenticated user ('user' rate), anonymous requests per IP ('anon' rate) """
+
+    def get_scope(self, request, view) -> str:
+        return 'user' if request.user and request.user.is_authenticated else 'anon'
+
+    def get_ident(self, request) -> str:
+        if request.user and request.user.is_authenticated:
+            return str(request.user.pk)
+        return client_ip(request)
+
+
+class ScopedRateThrottle(UserRateThrottle):
+    """ Per user (or IP) and `view.throttle_scope`, views without a scope are not limited by it """
+
+    def get_scope(self, request, view) -> Optional[str]:
+        return getattr(view, 'throttle_scope', None)
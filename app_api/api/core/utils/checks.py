@@ -0,0 +1,83 @@
+"""
+System checks of settings that only hold with one worker process: caches and stores that must be shared
+between the gunicorn workers (permissions, sessions, throttling buckets). Run by manage.py commands, and when a wsgi / asgi worker starts
+(see ApiConfig.ready).
+"""
+import os
+from typing import List
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from django.core.exceptions import ImproperlyConfigured
+
+# backends whose entries live in one process only
+PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+# session stores that keep sessions in SESSION_CACHE_ALIAS
+CACHED_SESSION_BACKENDS = ('django.contrib.sessions.backends.cache', 'django.contrib.sessions.backends.cached_db')
+
+
+def configured_workers() -> int:
+    """ Worker processes of the server mode, the same defaults as gunicorn.conf.py """
+    mode = os.getenv('SERVER_MODE', 'dev')
+    if mode not in ('wsgi', 'asgi'):
+        return 1
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    if mode == 'asgi':
+        return int(os.getenv('ASGI_WORKERS', cpus))
+    return int(os.getenv('WEB_WORKERS', cpus * 2 + 1))
+
+
+def is_process_local(alias: str) -> bool:
+    return settings.CACHES.get(alias, {}).get('BACKEND') in PROCESS_LOCAL_CACHES
+
+
+@register(Tags.caches)
+def check_permission_cache(app_configs=None, **kwargs) -> List[Error]:
+    workers = configured_workers()
+    if workers > 1 and is_process_local(settings.PERMISSION_CACHE_ALIAS):
+        return [Error(
+            f'PERMISSION_CACHE_ALIAS {settings.PERMISSION_CACHE_ALIAS!r} is a process local cache with {workers} '
+            f'workers: a revoked permission stays granted in the workers that did not handle the change',
+            hint='point CACHE_BACKEND / CACHE_LOCATION (or PERMISSION_CACHE_ALIAS) at a shared cache, the default '
+                 'django.core.cache.backends.db.DatabaseCache or memcached, or run one worker (WEB_WORKERS=1)',
+            id='api.E001',
+        )]
+    return []
+
+
+@register(Tags.caches)
+def check_session_cache(app_configs=None, **kwargs) -> List[Error]:
+    workers = configured_workers()
+    backend = getattr(settings, 'SESSION_STORE_BACKEND', settings.SESSION_ENGINE)
+    if workers > 1 and backend in CACHED_SESSION_BACKENDS and is_process_local(settings.SESSION_CACHE_ALIAS):
+        return [Error(
+            f'{backend} sessions over the process local cache {settings.SESSION_CACHE_ALIAS!r} with {workers} '
+            f'workers: a session logged out, flushed or cycled in one worker stays valid in the others',
+            hint='set SESSION_CACHE_BACKEND / SESSION_CACHE_LOCATION to a shared cache, '
+                 'or SESSION_STORE_BACKEND=django.contrib.sessions.backends.db',
+            id='api.E002',
+        )]
+    return []
+
+
+@register(Tags.caches)
+def check_throttle_store(app_configs=None, **kwargs) -> List[Error]:
+    workers = configured_workers()
+    if workers > 1 and settings.THROTTLE_STORE_URL.startswith('memory://'):
+        return [Error(
+            f'THROTTLE_STORE_URL {settings.THROTTLE_STORE_URL!r} keeps the rate limit buckets per process with '
+            f'{workers} workers: every limit is {workers} times the configured rate',
+            hint='set THROTTLE_STORE_URL=redis://host:6379/1, or run one worker (WEB_WORKERS=1)',
+            id='api.E003',
+        )]
+    return []
+
+
+def raise_on_errors():
+    """ Refuse to start a server worker with a setting the checks reject """
+    errors = check_permission_cache() + check_session_cache() + check_throttle_store()
+    if errors:
+        raise ImproperlyConfigured('; '.join(f'{error.id}: {error.msg}' for error in errors))
@@ -3,5 +3,8 @@ CONSTANTS = {
     "error_server": "Server error",
     "error_login": "Is not possible login whith these credentials",
     "error_unauthorized": "You do not have permission to perform this action.",
-    "error_auth_token": "Invalid token."
+    "error_auth_token": "Invalid token.",
+    "error_not_found": "this page is not found",
+    "error_not_authenticated": "Please login to proceed",
+    "error_throttled": "Too many requests, try again later",
 }
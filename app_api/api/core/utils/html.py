@@ -0,0 +1,239 @@
+"""
+Allowlist HTML sanitizer for CKEditor content, plain text excerpts, width variants of uploaded images.
+Standard library parser: output is rebuilt from allowed tags and attributes only, so it is well formed
+whatever the input was.
+"""
+import os
+import re
+from html import escape
+from html.parser import HTMLParser
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+ALLOWED_TAGS = {
+    'p', 'br', 'hr', 'b', 'strong', 'i', 'em', 'u', 's', 'strike', 'sub', 'sup', 'span', 'div', 'blockquote',
+    'pre', 'code', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'a', 'img', 'table', 'thead', 'tbody',
+    'tfoot', 'tr', 'th', 'td', 'caption', 'colgroup', 'col', 'figure', 'figcaption', 'iframe',
+}
+VOID_TAGS = {'br', 'hr', 'img', 'col'}
+DROP_CONTENT_TAGS = {'script', 'style', 'template', 'noscript', 'object', 'embed', 'textarea', 'select'}
+BLOCK_TAGS = {
+    'p', 'br', 'hr', 'div', 'blockquote', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'table',
+    'tr', 'th', 'td', 'caption', 'figure', 'figcaption',
+}
+GLOBAL_ATTRIBUTES = {'style', 'title', 'dir', 'lang'}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'target', 'name'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+    'col': {'span'},
+    'table': {'border', 'cellpadding', 'cellspacing'},
+    'ol': {'start', 'type'},
+    'iframe': {'src', 'width', 'height', 'allowfullscreen', 'frameborder'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+URL_SCHEMES = {'': ('', 'http', 'https', 'mailto', 'tel'), 'img': ('', 'http', 'https')}
+# every kept iframe gets it: the players run, but can not navigate the page or open dialogs in its name
+IFRAME_SANDBOX = 'allow-scripts allow-same-origin allow-presentation allow-popups'
+STYLE_PROPERTIES = {
+    'text-align', 'color', 'background-color', 'font-size', 'font-family', 'font-weight', 'font-style',
+    'text-decoration', 'width', 'height', 'margin', 'margin-left', 'margin-right', 'padding', 'float',
+    'border', 'border-collapse', 'vertical-align', 'list-style-type', 'line-height',
+}
+_STYLE_VALUE = re.compile(r"^[#\w\s.,%()'\"+-]*$")
+_UNSAFE_STYLE = re.compile(r'url|expression|javascript|@import|/\*|\\', re.I)
+_CONTROL = re.compile(r'[\x00-\x20\x7f]+')
+_SPACES = re.compile(r'\s+')
+
+
+def clean_style(value: str) -> str:
+    declarations = []
+    for declaration in value.split(';'):
+        name, _, css = declaration.partition(':')
+        name, css = name.strip().lower(), css.strip()
+        if name in STYLE_PROPERTIES and css and _STYLE_VALUE.match(css) and not _UNSAFE_STYLE.search(css):
+            declarations.append(f'{name}: {css}')
+    return '; '.join(declarations)
+
+
+def clean_url(value: str, tag: str) -> Optional[str]:
+    url = _CONTROL.sub('', value)  # "java\tscript:" tricks
+    try:
+        scheme = urlsplit(url).scheme.lower()
+    except ValueError:
+        return None
+    return value.strip() if scheme in URL_SCHEMES.get(tag, URL_SCHEMES['']) else None
+
+
+def clean_iframe_src(value: str, hosts: Tuple[str, ...]) -> Optional[str]:
+    """
+    https urls of `hosts` (and their subdomains) only; no userinfo, port, backslash or '@' anywhere, browsers
+    and urlsplit disagree on where the host of "https://evil.example\\@www.youtube.com" is
+    """
+    url = value.strip()
+    if _CONTROL.search(url) or '\\' in url or '@' in url:
+        return None
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname or ''
+    except ValueError:
+        return None
+    if parts.scheme.lower() != 'https' or parts.netloc.lower() != host:
+        return None
+    return url if any(host == allowed or host.endswith('.' + allowed) for allowed in hosts) else None
+
+
+class Sanitizer(HTMLParser):
+    """
+    `rewrite_image(src) -> (src, srcset)` may replace image urls (e.g. with resized variants),
+    iframes are kept only from `iframe_hosts`
+    """
+
+    def __init__(self, rewrite_image: Optional[Callable[[str], Tuple[str, str]]] = None,
+                 iframe_hosts: Tuple[str, ...] = ()):
+        super().__init__(convert_charrefs=True)
+        self.rewrite_image = rewrite_image
+        self.iframe_hosts = iframe_hosts
+        self.out: List[str] = []
+        self.text: List[str] = []
+        self.open: List[str] = []
+        self.dropping: Optional[str] = None  # tag whose content is skipped: script, style, iframe from elsewhere
+        self.drop_depth = 0  # nesting of that same tag, other tags can not end the skipping early or late
+
+    def _attributes(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> Optional[Dict[str, str]]:
+        allowed = GLOBAL_ATTRIBUTES | ALLOWED_ATTRIBUTES.get(tag, set())
+        result = {}
+        for name, value in attrs:
+            name, value = name.lower(), value or ''
+            if name not in allowed:
+                continue
+            if name == 'style':
+                value = clean_style(value)
+            elif name in URL_ATTRIBUTES:
+                value = clean_url(value, tag)
+                if value is None:
+                    continue
+            if value or name == 'allowfullscreen':
+                result[name] = value
+        if tag == 'iframe':
+            src = clean_iframe_src(result.get('src', ''), self.iframe_hosts)
+            if src is None:
+                return None
+            result['src'], result['sandbox'] = src, IFRAME_SANDBOX
+        if tag == 'img':
+            if 'src' not in result:
+                return None
+            if self.rewrite_image is not None:
+                result['src'], srcset = self.rewrite_image(result['src'])
+                if srcset:
+                    result['srcset'] = srcset
+        if tag == 'a' and result.get('target'):
+            result['target'] = '_blank'
+            result['rel'] = 'noopener noreferrer nofollow'
+        return result
+
+    def _drop(self, tag: str):
+        self.dropping, self.drop_depth = tag, 1
+
+    def handle_starttag(self, tag, attrs):
+        if self.dropping:
+            if tag == self.dropping:
+                self.drop_depth += 1
+            return
+        if tag in DROP_CONTENT_TAGS:
+            self._drop(tag)
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+        attributes = self._attributes(tag, attrs)
+        if attributes is None:  # iframe from an unknown host, image without a source
+            if tag not in VOID_TAGS:
+                self._drop(tag)
+            return
+        rendered = ''.join(f' {name}="{escape(value)}"' if value else f' {name}' for name, value in attributes.items())
+        self.out.append(f'<{tag}{rendered}>')
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in VOID_TAGS:
+            self.open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open and self.open[-1] == tag and not self.dropping:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.dropping:
+            if tag == self.dropping:
+                self.drop_depth -= 1
+                if not self.drop_depth:
+                    self.dropping = None
+            return
+        if tag not in self.open:  # stray end tag
+            return
+        while self.open:  # close whatever was left open inside
+            current = self.open.pop()
+            self.out.append(f'</{current}>')
+            if current == tag:
+                break
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.out.append(escape(data, quote=False))
+            self.text.append(data)
+
+    def result(self) -> Tuple[str, str]:
+        self.close()
+        self.out.extend(f'</{tag}>' for tag in reversed(self.open))
+        self.open = []
+        return ''.join(self.out), _SPACES.sub(' ', ''.join(self.text)).strip()
+
+
+def sanitize(html: str, **options) -> Tuple[str, str]:
+    """ (safe html, plain text) """
+    sanitizer = Sanitizer(**options)
+    sanitizer.feed(html or '')
+    return sanitizer.result()
+
+
+def excerpt(text: str, length: int) -> str:
+    if len(text) <= length:
+        return text
+    cut = text[:length + 1].rsplit(' ', 1)[0] if ' ' in text[:length + 1] else text[:length]
+    return cut.rstrip(' ,.;:-') + '…'
+
+
+def variant_name(name: str, width: int) -> str:
+    root, ext = os.path.splitext(name)
+    return f'{root}__w{width}{ext}'
+
+
+def make_variants(storage, name: str, widths: Tuple[int, ...]) -> Dict[int, str]:
+    """
+    Width -> name of downscaled copies of an uploaded image next to it (written once, reused after),
+    only widths smaller than the original
+    """
+    from django.core.files.base import ContentFile
+    from PIL import Image
+
+    missing = [width for width in widths if not storage.exists(variant_name(name, width))]
+    variants = {width: variant_name(name, width) for width in widths if width not in missing}
+    if not missing:
+        return variants
+    with storage.open(name) as source, Image.open(source) as image:
+        if getattr(image, 'is_animated', False):
+            return variants
+        image_format = image.format
+        for width in missing:
+            if width >= image.width:
+                continue
+            copy = image.copy()
+            copy.thumbnail((width, width * image.height // image.width + 1))
+            buffer = BytesIO()
+            copy.save(buffer, format=image_format, optimize=True)
+            variants[width] = storage.save(variant_name(name, width), ContentFile(buffer.getvalue()))
+    return variants
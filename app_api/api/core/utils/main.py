@@ -1,26 +1,23 @@
 import random
-from typing import Optional, Union, Any, List, Callable, Type, Iterable
+from typing import Optional, Union, Any, List, Callable, Type, Iterable, TYPE_CHECKING
 import os
 import re
-import _io
-from django.core.files import File
-from django.http import QueryDict
-from django.utils.crypto import get_random_string
 import string
-from django.utils import timezone
 from datetime import datetime
 
-from pytz import UTC
 from itertools import groupby
 import itertools
 from collections import OrderedDict
 import collections.abc
-import difflib
 from uuid import UUID
-from copy import deepcopy
 import json
 import logging
 
+if TYPE_CHECKING:  # heavy modules only needed for annotations
+    import _io
+    from django.core.files import File
+    from django.http import QueryDict
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,10 +32,41 @@ SpecNone = _SpecNone()
 # # datetimes
 
 EPOCH_DATETIME = datetime(1970, 1, 1)
-EPOCH_DATETIME_AWARE = datetime(1970, 1, 1, tzinfo=UTC)
-
 NULL_DATETIME = datetime.min  # datetime(1, 1, 1)
-NULL_DATETIME_AWARE = timezone.make_aware(NULL_DATETIME, UTC)
+
+
+def _epoch_datetime_aware() -> datetime:
+    from pytz import UTC
+    return datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _null_datetime_aware() -> datetime:
+    from django.utils import timezone
+    from pytz import UTC
+    return timezone.make_aware(NULL_DATETIME, UTC)
+
+
+# module attributes computed on first access (pep 562), see __getattr__ below
+_LAZY_ATTRS = {
+    'EPOCH_DATETIME_AWARE': _epoch_datetime_aware,
+    'NULL_DATETIME_AWARE': _null_datetime_aware,
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = globals()[name] = _LAZY_ATTRS[name]()  # cache, next access skips __getattr__
+    return value
+
+
+def preload_lazy():  # resolve lazy attributes and imports ahead of traffic (used by warmup)
+    import difflib  # noqa: F401
+    import copy  # noqa: F401
+    for name in _LAZY_ATTRS:
+        if name not in globals():
+            __getattr__(name)
+
 
 # # uuid
 NULL_UUID = UUID('0' * 32)
@@ -50,6 +78,7 @@ def id_generator(size=20, chars=string.ascii_uppercase + string.digits):
 
 # # str similarity
 def str_similarity(seq1: str, seq2: str) -> float:  # case insensetive
+    import difflib
     return difflib.SequenceMatcher(a=seq1.lower(), b=seq2.lower()).ratio()
 
 
@@ -227,6 +256,7 @@ def conditional_decorator(dec, condition, *args, **kwargs):  # apply decorator o
 
 
 def make_random_string(len: int = 8, charset: str = string.ascii_letters + string.digits):
+    from django.utils.crypto import get_random_string
     return get_random_string(len, charset)
 
 
@@ -247,11 +277,11 @@ def fullgroupby(i: Iterable, key: Callable):  # the values from key func should
 
 # misc 4 django
 
-def querydict_to_full_dict(qd: QueryDict) -> dict:
+def querydict_to_full_dict(qd: 'QueryDict') -> dict:
     return dict([(k, vl if len(vl) > 1 else vl[0]) for k, vl in qd.lists()])
 
 
-def file_bool(file: Union[File, _io.BufferedReader]):
+def file_bool(file: Union['File', '_io.BufferedReader']):
     return bool(not_none(file) and getattr(file, 'size', 0) > 0)
 
 
@@ -306,6 +336,7 @@ def deepupdate(d, u):  # updates d, future both mutual danger
 
 def deepupdater(d, u, _copyd=True):
     # not mutates the data
+    from copy import deepcopy
     d = deepcopy(d) if _copyd else d
 
     def _is_mapping(e):
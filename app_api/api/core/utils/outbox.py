@@ -0,0 +1,186 @@
+"""
+Outbound email queue: QueuedEmailBackend stores messages in OutboxEmail and returns right away,
+OutboxWorker (`manage.py send_outbox`) delivers them in batches over one long-lived SMTP connection,
+with exponential backoff and a dead-letter state.
+"""
+import logging
+import random
+import smtplib
+import time
+from datetime import timedelta
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.smtp import EmailBackend as SMTPBackend
+from django.core.mail.message import sanitize_address
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    EMAIL_BACKEND: messages are rendered and inserted in one query, inside the request transaction
+    (a rolled back request sends nothing)
+    """
+
+    def send_messages(self, email_messages) -> int:
+        rows = []
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            encoding = message.encoding or settings.DEFAULT_CHARSET
+            rows.append(OutboxEmail(
+                from_email=sanitize_address(message.from_email, encoding),
+                recipients=[sanitize_address(address, encoding) for address in message.recipients()],
+                subject=str(message.subject)[:255],
+                message=message.message().as_bytes(linesep='\r\n'),
+            ))
+        try:
+            OutboxEmail.objects.bulk_create(rows)
+        except Exception:
+            if not self.fail_silently:
+                raise
+            return 0
+        return len(rows)
+
+
+def backoff(attempts: int) -> timedelta:
+    """ Delay before the next attempt: doubling from OUTBOX_BACKOFF_BASE, capped, with jitter """
+    delay = min(settings.OUTBOX_BACKOFF_BASE * 2 ** max(attempts - 1, 0), settings.OUTBOX_BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def is_permanent(error: Exception) -> bool:
+    """ 5xx replies will not succeed on retry (unknown mailbox, rejected content) """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+def claim(batch: int) -> List[OutboxEmail]:
+    """
+    Lock due rows (other workers skip them) and lease them for OUTBOX_LEASE seconds: a worker killed
+    mid-batch leaves rows that become due again when the lease runs out
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects
+            .filter(status__in=[OutboxEmail.STATUS_PENDING, OutboxEmail.STATUS_SENDING], next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:batch]
+        )
+        if not ids:
+            return []
+        OutboxEmail.objects.filter(id__in=ids).update(
+            status=OutboxEmail.STATUS_SENDING, attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=settings.OUTBOX_LEASE),
+        )
+    return list(OutboxEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def purge(days: int) -> int:
+    """ Delete sent messages older than `days` """
+    before = timezone.now() - timedelta(days=days)
+    deleted, _ = OutboxEmail.objects.filter(status=OutboxEmail.STATUS_SENT, sent_at__lt=before).delete()
+    return deleted
+
+
+class OutboxWorker:
+    """
+    Drains the outbox over one SMTP connection: opened on the first message, reused across batches,
+    reopened once when the server dropped it, closed after OUTBOX_IDLE_CLOSE seconds without mail
+    """
+
+    def __init__(self, batch: int = None, **smtp_options):
+        self.batch = batch or settings.OUTBOX_BATCH
+        self.smtp = SMTPBackend(**smtp_options)
+        self.last_used = 0.0
+
+    def _sendmail(self, email: OutboxEmail):
+        for retry in (True, False):
+            self.smtp.open()
+            try:
+                refused = self.smtp.connection.sendmail(email.from_email, email.recipients, bytes(email.message))
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                self.smtp.connection = None  # dead socket, quit() would fail too
+                if not retry:
+                    raise
+                continue
+            if refused:  # accepted for some recipients only, nothing to retry for the others
+                logger.warning('outbox %s: refused recipients %s', email.pk, refused)
+            return
+
+    def send_batch(self) -> dict:
+        emails = claim(self.batch)
+        result = {'sent': 0, 'retry': 0, 'dead': 0}
+        sent = []
+        for i, email in enumerate(emails):
+            try:
+                self._sendmail(email)
+            except Exception as e:
+                permanent = is_permanent(e)
+                self._failed(email, e, permanent)
+                result['dead' if permanent or email.attempts >= settings.OUTBOX_MAX_ATTEMPTS else 'retry'] += 1
+                if isinstance(e, OSError) and self.smtp.connection is None:  # server unreachable, stop the batch
+                    for rest in emails[i + 1:]:
+                        self._failed(rest, e, False)
+                        result['retry'] += 1
+                    break
+            else:
+                sent.append(email.pk)
+        if sent:
+            OutboxEmail.objects.filter(id__in=sent).update(
+                status=OutboxEmail.STATUS_SENT, sent_at=timezone.now(), last_error='',
+            )
+            result['sent'] = len(sent)
+        if emails:
+            self.last_used = time.monotonic()
+        return result
+
+    def _failed(self, email: OutboxEmail, error: Exception, permanent: bool):
+        dead = permanent or email.attempts >= settings.OUTBOX_MAX_ATTEMPTS
+        logger.log(logging.ERROR if dead else logging.WARNING, 'outbox %s attempt %s: %r',
+                   email.pk, email.attempts, error)
+        OutboxEmail.objects.filter(pk=email.pk).update(
+            status=OutboxEmail.STATUS_DEAD if dead else OutboxEmail.STATUS_PENDING,
+            next_attempt_at=timezone.now() + backoff(email.attempts),
+            last_error=repr(error)[:2000],
+        )
+
+    def close_idle(self):
+        if self.smtp.connection is not None and time.monotonic() - self.last_used > settings.OUTBOX_IDLE_CLOSE:
+            self.close()
+
+    def close(self):
+        try:
+            self.smtp.close()
+        except smtplib.SMTPException:
+            self.smtp.connection = None
+
+    def run(self, once: bool = False, poll: Optional[float] = None, stop=lambda: False) -> dict:
+        """ Send until the outbox is empty (`once`) or `stop()` is true, sleeping `poll` seconds when idle """
+        poll = settings.OUTBOX_POLL_INTERVAL if poll is None else poll
+        total = {'sent': 0, 'retry': 0, 'dead': 0}
+        try:
+            while not stop():
+                result = self.send_batch()
+                for key, value in result.items():
+                    total[key] += value
+                if not any(result.values()):
+                    if once:
+                        break
+                    self.close_idle()
+                    time.sleep(poll)
+        finally:
+            self.close()
+        return total
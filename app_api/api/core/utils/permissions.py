@@ -0,0 +1,156 @@
+"""
+Process-wide cache of content types and permission codenames, per-user permission sets.
+
+Everything is keyed by a version stamp kept in the PERMISSION_CACHE_ALIAS cache: any change of
+permissions, groups or their memberships bumps it (see connect()), every worker notices within
+PERMISSION_VERSION_CHECK_INTERVAL and drops its local copies. That needs a cache shared by the workers
+(checked by api.core.utils.checks); in any case a permission set is not used longer than
+PERMISSION_CACHE_TIMEOUT after it was read from the database.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+VERSION_KEY = 'permissions:version'
+
+_lock = threading.Lock()
+_version: Optional[int] = None
+_version_checked = 0.0
+_codenames: Dict[str, int] = {}  # 'app_label.codename' -> permission id, for the current version
+_codenames_version: Optional[int] = None
+# LRU (version, user pk) -> ((own, from groups), time.time() of the database read)
+_users: 'OrderedDict[Tuple[int, object], Tuple[Tuple[FrozenSet[str], FrozenSet[str]], float]]' = OrderedDict()
+_backends: Dict[tuple, list] = {}
+
+
+def _cache():
+    return caches[settings.PERMISSION_CACHE_ALIAS]
+
+
+def current_version() -> int:
+    global _version, _version_checked
+    now = time.monotonic()
+    if _version is not None and now - _version_checked < settings.PERMISSION_VERSION_CHECK_INTERVAL:
+        return _version
+    cache = _cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    with _lock:
+        if version != _version:
+            _users.clear()
+        _version, _version_checked = version, now
+    return version
+
+
+def bump_version(**kwargs):
+    """ Signal receiver: invalidates permission caches of all workers """
+    global _version_checked
+    cache = _cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:  # not set yet (or evicted)
+        cache.set(VERSION_KEY, int(time.time()), timeout=None)
+    _version_checked = 0.0  # this worker sees the change right away
+
+
+def permission_ids() -> Dict[str, int]:
+    """ 'app_label.codename' -> id of all permissions, one query per version """
+    global _codenames, _codenames_version
+    version = current_version()
+    if _codenames_version != version:
+        from django.contrib.auth.models import Permission
+
+        rows = Permission.objects.values_list('id', 'content_type__app_label', 'codename').order_by()
+        codenames = {f'{app_label}.{codename}': pk for pk, app_label, codename in rows}
+        with _lock:
+            _codenames, _codenames_version = codenames, version
+    return _codenames
+
+
+def user_permissions(user) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    (own, from groups) permission names of an active, non superuser user: from the process, then the
+    shared cache, then two queries
+    """
+    version = current_version()
+    key = (version, user.pk)
+    now = time.time()
+    with _lock:
+        entry = _users.get(key)
+        if entry is not None:
+            if now - entry[1] < settings.PERMISSION_CACHE_TIMEOUT:
+                _users.move_to_end(key)
+                return entry[0]
+            del _users[key]
+    cache = _cache()
+    cache_key = f'user-permissions:{version}:{user.pk}'
+    entry = cache.get(cache_key)
+    if entry is None or now - entry[1] >= settings.PERMISSION_CACHE_TIMEOUT:
+        entry = (_load_user_permissions(user), now)
+        cache.set(cache_key, entry, settings.PERMISSION_CACHE_TIMEOUT)
+    with _lock:
+        _users[key] = entry  # keeps the time of the database read, the local copy expires with the shared one
+        while len(_users) > settings.PERMISSION_LOCAL_USERS:
+            _users.popitem(last=False)
+    return entry[0]
+
+
+def _load_user_permissions(user) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Permission
+
+    groups_query = 'group__%s' % get_user_model()._meta.get_field('groups').related_query_name()
+    names = []
+    for perms in (user.user_permissions.all(), Permission.objects.filter(**{groups_query: user})):
+        rows = perms.values_list('content_type__app_label', 'codename').order_by()
+        names.append(frozenset(f'{app_label}.{codename}' for app_label, codename in rows))
+    return names[0], names[1]
+
+
+def warm_content_types() -> int:
+    """ Fill ContentTypeManager's process cache for every installed model with one query """
+    from django.apps import apps
+    from django.contrib.contenttypes.models import ContentType
+
+    models = apps.get_models()
+    ContentType.objects.get_for_models(*models, for_concrete_models=False)
+    return len(models)
+
+
+def get_backends() -> list:
+    """ [(backend, path)] of AUTHENTICATION_BACKENDS, imported and instantiated once per setting value """
+    from django.contrib import auth
+
+    paths = tuple(settings.AUTHENTICATION_BACKENDS)
+    backends = _backends.get(paths)
+    if backends is None:
+        backends = _backends[paths] = auth._get_backends(return_tuples=True)
+    return backends
+
+
+def clear():
+    global _version, _codenames_version
+    with _lock:
+        _users.clear()
+        _version = _codenames_version = None
+
+
+def connect():
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group, Permission
+    from django.contrib.contenttypes.models import ContentType
+    from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+
+    User = get_user_model()
+    for through in (User.groups.through, User.user_permissions.through, Group.permissions.through):
+        m2m_changed.connect(bump_version, sender=through, dispatch_uid=f'permissions_{through._meta.label}')
+    for model in (Permission, Group, ContentType):
+        post_save.connect(bump_version, sender=model, dispatch_uid=f'permissions_save_{model._meta.label}')
+        post_delete.connect(bump_version, sender=model, dispatch_uid=f'permissions_delete_{model._meta.label}')
+    post_migrate.connect(bump_version, dispatch_uid='permissions_migrate')
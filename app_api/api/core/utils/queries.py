@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Sequence
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+def _format(context: CaptureQueriesContext) -> str:
+    return '\n'.join(f'{i}. {query["sql"]}' for i, query in enumerate(context.captured_queries, start=1))
+
+
+@contextmanager
+def query_budget(max_queries: int, using: str = DEFAULT_DB_ALIAS):
+    """
+    with query_budget(3): ...  -- AssertionError listing the sql when the block runs more queries
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    if len(context) > max_queries:
+        raise AssertionError(f'{len(context)} queries, budget {max_queries}:\n{_format(context)}')
+
+
+def count_queries(func: Callable, *args, using: str = DEFAULT_DB_ALIAS, **kwargs) -> int:
+    with CaptureQueriesContext(connections[using]) as context:
+        func(*args, **kwargs)
+    return len(context)
+
+
+def assert_constant_queries(call: Callable[[int], Any], sizes: Sequence[int] = (1, 10, 50),
+                            using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    N+1 check: call(size) (e.g. a list request with page_size=size) must run the same number of
+    queries for every size, returns that number
+    """
+    counts: Dict[int, int] = {size: count_queries(call, size, using=using) for size in sizes}
+    if len(set(counts.values())) != 1:
+        raise AssertionError(f'query count depends on size (size: queries): {counts}')
+    return counts[sizes[0]]
+
+
+def assert_endpoint_queries(client, path: str, max_queries: int, sizes: Sequence[int] = (1, 10, 50),
+                            size_param: str = 'page_size', using: str = DEFAULT_DB_ALIAS, **params) -> int:
+    """
+    Query budget of a list endpoint: constant across page sizes and within max_queries
+    (client is a django / drf test client, authenticated as needed)
+    """
+    def request(size: int):
+        response = client.get(path, {size_param: size, **params})
+        assert response.status_code == 200, f'{path}: {response.status_code}'
+
+    queries = assert_constant_queries(request, sizes, using=using)
+    if queries > max_queries:
+        raise AssertionError(f'{path}: {queries} queries, budget {max_queries}')
+    return queries
@@ -0,0 +1,163 @@
+"""
+Write-time rendering of CKEditor fields (settings.RICH_TEXT_FIELDS): sanitized html with uploaded images
+pointing at width variants, plain text excerpt, stored in RenderedText by content hash. Lists annotate
+the excerpt and defer the raw field, so the (up to DESCRIPTIONS_SIZE) body is not read.
+"""
+import hashlib
+import logging
+import re
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import OuterRef, QuerySet, Subquery
+from django.utils import timezone
+
+from api.core.utils.html import excerpt, make_variants, sanitize
+from api.models import RenderedText
+
+logger = logging.getLogger(__name__)
+
+_VARIANT_SUFFIX = re.compile(r'__w\d+(\.\w+)$')
+
+
+def content_hash(raw: Optional[str]) -> str:
+    return hashlib.sha1(f'{settings.RICH_TEXT_RENDER_VERSION}:{raw or ""}'.encode()).hexdigest()
+
+
+def rewrite_upload(src: str) -> Tuple[str, str]:
+    """ (src, srcset) of an image uploaded through ckeditor: the largest variant and all of them """
+    url = urlsplit(src)
+    prefix = settings.MEDIA_URL + settings.CKEDITOR_UPLOAD_PATH
+    if url.netloc or not url.path.startswith(prefix):
+        return src, ''
+    name = _VARIANT_SUFFIX.sub(r'\1', unquote(url.path[len(settings.MEDIA_URL):]))
+    try:
+        variants = make_variants(default_storage, name, settings.RICH_TEXT_IMAGE_WIDTHS)
+    except Exception:  # missing file, not an image: keep the link as written
+        logger.warning('rich text: no variants for %s', name, exc_info=True)
+        return src, ''
+    if not variants:
+        return src, ''
+    srcset = ', '.join(f'{default_storage.url(variant)} {width}w' for width, variant in sorted(variants.items()))
+    return default_storage.url(variants[max(variants)]), srcset
+
+
+def render(raw: Optional[str]) -> Tuple[str, str]:
+    """ (html, excerpt) """
+    html, text = sanitize(raw or '', rewrite_image=rewrite_upload, iframe_hosts=settings.RICH_TEXT_IFRAME_HOSTS)
+    return html, excerpt(text, settings.RICH_TEXT_EXCERPT_CHARS)
+
+
+def store(instance, fields: Optional[Iterable[str]] = None) -> int:
+    """ Render the fields of one object whose content changed, returns how many were rendered """
+    label = instance._meta.label
+    fields = list(fields or settings.RICH_TEXT_FIELDS.get(label, ()))
+    stored = dict(RenderedText.objects.filter(model=label, object_id=instance.pk, field__in=fields)
+                  .values_list('field', 'content_hash'))
+    rendered = 0
+    for field in fields:
+        raw = getattr(instance, field)
+        digest = content_hash(raw)
+        if stored.get(field) == digest:
+            continue
+        html, text = render(raw)
+        RenderedText.objects.update_or_create(
+            model=label, object_id=instance.pk, field=field,
+            defaults={'content_hash': digest, 'html': html, 'excerpt': text},
+        )
+        rendered += 1
+    return rendered
+
+
+def get_rendered(instance, field: str) -> RenderedText:
+    """
+    Rendered field of one object (detail views), rendered now if it never was or if the stored hash is not
+    the hash of the current content (written by QuerySet.update() or raw sql, which send no signals)
+    """
+    row = RenderedText.objects.filter(model=instance._meta.label, object_id=instance.pk, field=field).first()
+    if row is None or row.content_hash != content_hash(getattr(instance, field)):
+        store(instance, [field])
+        row = RenderedText.objects.get(model=instance._meta.label, object_id=instance.pk, field=field)
+    return row
+
+
+def annotate_rendered(queryset: QuerySet, field: str = 'description', html: bool = False) -> QuerySet:
+    """
+    `<field>_excerpt` (and `<field>_html`) annotated from RenderedText, the raw field deferred
+    """
+    rendered = RenderedText.objects.filter(model=queryset.model._meta.label, object_id=OuterRef('pk'), field=field)
+    annotations = {f'{field}_excerpt': Subquery(rendered.values('excerpt')[:1])}
+    if html:
+        annotations[f'{field}_html'] = Subquery(rendered.values('html')[:1])
+    return queryset.defer(field).annotate(**annotations)
+
+
+def backfill(label: str, batch: int = None, rebuild: bool = False,
+             progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+    """
+    Render existing rows of a model in primary key batches: one read of the batch, one read of its stored
+    hashes, one bulk insert and one bulk update per batch; unchanged content is skipped unless `rebuild`
+    """
+    batch = batch or settings.RICH_TEXT_BACKFILL_BATCH
+    model = apps.get_model(label)
+    fields = settings.RICH_TEXT_FIELDS[label]
+    counts = {'objects': 0, 'rendered': 0}
+    last_pk = None
+    while True:
+        queryset = model._default_manager.order_by('pk')
+        if last_pk is not None:
+            queryset = queryset.filter(pk__gt=last_pk)
+        rows = list(queryset.values_list('pk', *fields)[:batch])
+        if not rows:
+            return counts
+        stored = {
+            (object_id, field): (pk, digest)
+            for pk, object_id, field, digest in RenderedText.objects
+            .filter(model=label, object_id__in=[row[0] for row in rows], field__in=fields)
+            .values_list('id', 'object_id', 'field', 'content_hash')
+        }
+        created, updated, now = [], [], timezone.now()
+        for object_id, *values in rows:
+            for field, raw in zip(fields, values):
+                digest = content_hash(raw)
+                pk, stored_digest = stored.get((object_id, field), (None, None))
+                if stored_digest == digest and not rebuild:
+                    continue
+                html, text = render(raw)
+                row = RenderedText(id=pk, model=label, object_id=object_id, field=field, content_hash=digest,
+                                   html=html, excerpt=text, updated_at=now)
+                (updated if pk else created).append(row)
+        with transaction.atomic():
+            RenderedText.objects.bulk_create(created)
+            RenderedText.objects.bulk_update(updated, ['content_hash', 'html', 'excerpt', 'updated_at'])
+        counts['objects'] += len(rows)
+        counts['rendered'] += len(created) + len(updated)
+        last_pk = rows[-1][0]
+        if progress is not None:
+            progress(counts['objects'], counts['rendered'])
+
+
+def object_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:  # loaddata
+        return
+    fields = settings.RICH_TEXT_FIELDS.get(sender._meta.label, ())
+    if update_fields is not None:
+        fields = [field for field in fields if field in update_fields]
+    if fields:
+        store(instance, fields)
+
+
+def object_deleted(sender, instance, **kwargs):
+    RenderedText.objects.filter(model=sender._meta.label, object_id=instance.pk).delete()
+
+
+def connect():
+    from django.db.models.signals import post_delete, post_save
+
+    for label in settings.RICH_TEXT_FIELDS:
+        post_save.connect(object_saved, sender=label, dispatch_uid=f'rich_text_saved_{label}')
+        post_delete.connect(object_deleted, sender=label, dispatch_uid=f'rich_text_deleted_{label}')
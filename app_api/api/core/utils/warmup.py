@@ -0,0 +1,88 @@
+import logging
+import time
+from typing import Iterable, List
+
+logger = logging.getLogger(__name__)
+
+
+def _iter_patterns(patterns: Iterable) -> Iterable:  # flatten nested includes
+    for pattern in patterns:
+        if hasattr(pattern, 'url_patterns'):
+            pattern.pattern.regex  # compile include prefix
+            yield from _iter_patterns(pattern.url_patterns)
+        else:
+            yield pattern
+
+
+def warm_url_resolvers() -> List:
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    resolver.reverse_dict  # populates reverse/namespace dicts for the current language
+    patterns = list(_iter_patterns(resolver.url_patterns))
+    for pattern in patterns:
+        pattern.pattern.regex  # compile and cache regex
+    return patterns
+
+
+def warm_serializers(patterns: Iterable) -> int:
+    count = 0
+    for pattern in patterns:
+        callback = pattern.callback
+        view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+        serializer_class = getattr(view_class, 'serializer_class', None)
+        if serializer_class is None:
+            continue
+        try:
+            serializer_class().fields  # imports and builds the field tree once
+        except Exception:
+            logger.exception('warmup: failed to build %s', serializer_class.__name__)
+            continue
+        count += 1
+    return count
+
+
+def warmup(include_docs: bool = True) -> dict:
+    """
+    Pre-import and pre-build everything the first request would otherwise pay for.
+    Returns timings in seconds per stage.
+    """
+    from django.db import DatabaseError
+
+    from api.core.utils import main, permissions
+
+    timings = {}
+
+    start = time.perf_counter()
+    patterns = warm_url_resolvers()
+    timings['url_resolvers'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    timings['serializers_count'] = warm_serializers(patterns)
+    timings['serializers'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    main.preload_lazy()
+    timings['utils'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        timings['content_types_count'] = permissions.warm_content_types()
+        permissions.permission_ids()
+        permissions.get_backends()
+    except DatabaseError:  # no database yet (first deploy, collectstatic), filled on first use
+        logger.warning('warmup: permissions not loaded', exc_info=True)
+    timings['permissions'] = time.perf_counter() - start
+
+    if include_docs:
+        from api.core.api.schema import get_schema
+        from mainapp.yasg import get_cached_schema_view
+
+        start = time.perf_counter()
+        get_cached_schema_view()
+        get_schema()  # loads (or generates once) the schema file for this urlconf
+        timings['docs'] = time.perf_counter() - start
+
+    timings['url_patterns_count'] = len(patterns)
+    logger.info('warmup done: %s', timings)
+    return timings
@@ -0,0 +1,31 @@
+import signal
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Delete expired sessions in small batches (once, or periodically with --every)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=None)
+        parser.add_argument('--pause', type=float, default=None, help='seconds between batches')
+        parser.add_argument('--every', type=float, nargs='?', const=settings.SESSION_CLEANUP_EVERY, default=None,
+                            help='keep running, a cleanup every this many seconds')
+
+    def handle(self, *args, **options):
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        stopping = []
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stopping.append(True))
+        while not stopping:
+            deleted = store.clear_expired(batch=options['batch'], pause=options['pause'],
+                                          progress=lambda done: self.stderr.write(f'\rdeleted {done}', ending=''))
+            self.stderr.write(f'\ndeleted {deleted or 0} expired sessions')
+            if options['every'] is None:
+                return
+            next_run = time.monotonic() + options['every']
+            while not stopping and time.monotonic() < next_run:
+                time.sleep(1)
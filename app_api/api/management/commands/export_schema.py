@@ -0,0 +1,24 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from api.core.api.schema import build_schema
+
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema into its versioned file (for deploy time and client codegen)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='regenerate even if the file for this urlconf exists')
+        parser.add_argument('--output', default='', help='also copy the schema to this path, "-" for stdout')
+
+    def handle(self, *args, **options):
+        schema = build_schema(force=options['force'])
+        output = options['output']
+        if output == '-':
+            sys.stdout.buffer.write(schema.content)
+            return
+        if output:
+            with open(output, 'wb') as f:
+                f.write(schema.content)
+        self.stderr.write(f'schema {schema.path} (urlconf {schema.urlconf_hash[:16]}, etag {schema.etag})')
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.views.inbox import partitions
+from api.views.inbox.service import recount_unread
+
+
+class Command(BaseCommand):
+    help = 'Move old read inbox entries into the monthly partitioned history table, drop expired months'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.INBOX_ARCHIVE_AFTER_DAYS,
+                            help='archive read entries older than this')
+        parser.add_argument('--batch', type=int, default=None)
+        parser.add_argument('--drop-months', type=int, default=0,
+                            help='drop history partitions older than this many months (0 keeps all)')
+        parser.add_argument('--recount', action='store_true', help='also recompute unread counters from entries')
+
+    def handle(self, *args, **options):
+        partitions.install()
+        now = timezone.now()
+        moved = partitions.archive(now - timedelta(days=options['days']), options['batch'],
+                                   progress=lambda done: self.stderr.write(f'\rarchived {done}', ending=''))
+        self.stderr.write(f'\narchived {moved} entries')
+        if options['drop_months']:
+            months = options['drop_months']
+            before = partitions.month_start(now.date())
+            for _ in range(months):
+                before = partitions.month_start(before - timedelta(days=1))
+            dropped = partitions.drop_partitions(before)
+            self.stderr.write(f'dropped partitions: {", ".join(dropped) or "none"}')
+        if options['recount']:
+            self.stderr.write(f'recounted {recount_unread()} counters')
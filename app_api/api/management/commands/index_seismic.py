@@ -0,0 +1,47 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.models import SeismicFile, SeismicSNRJob
+from api.views.seismic.service import index_seismic_file, run_snr_job
+
+
+class Command(BaseCommand):
+    help = ('Build header indexes and gather caches of uploaded SEG-Y files, run queued survey SNR jobs '
+            '(once, or as a worker with --every)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--failed', action='store_true', help='also retry files that failed')
+        parser.add_argument('--all', action='store_true', help='also reindex files that are already ready')
+        parser.add_argument('--every', type=float, nargs='?', const=settings.SEISMIC_INDEX_EVERY, default=None,
+                            help='keep running, look for new uploads every this many seconds')
+
+    def handle(self, *args, **options):
+        queryset = SeismicFile.objects.order_by('created_at')
+        if not options['all']:
+            statuses = [SeismicFile.STATUS_PENDING] + ([SeismicFile.STATUS_FAILED] if options['failed'] else [])
+            queryset = queryset.filter(status__in=statuses)
+        stopping = []
+        # finish the current file on SIGTERM / SIGINT (docker stop, ctrl-c)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stopping.append(True))
+        while not stopping:
+            for seismic_file in queryset.iterator():
+                if stopping:
+                    return
+                index_seismic_file(seismic_file)
+                self.stderr.write(f'{seismic_file.file.name}: {seismic_file.status} {seismic_file.error}'.rstrip())
+            jobs = SeismicSNRJob.objects.filter(status=SeismicFile.STATUS_PENDING).select_related('seismic_file')
+            for job in jobs.order_by('created_at').iterator():
+                if stopping:
+                    return
+                run_snr_job(job)
+                self.stderr.write(f'snr job {job.pk}: {job.status} {job.error}'.rstrip())
+            if options['every'] is None:
+                return
+            queryset = queryset.filter(status=SeismicFile.STATUS_PENDING)  # ready / failed ones only once
+            next_run = time.monotonic() + options['every']
+            while not stopping and time.monotonic() < next_run:
+                time.sleep(1)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.views.search.indexes import backfill, install
+
+
+class Command(BaseCommand):
+    help = 'Install the company search column, trigger, GIN / trigram indexes and backfill search vectors'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-concurrently', action='store_true',
+                            help='plain CREATE INDEX (faster on an empty or offline database, locks writes)')
+        parser.add_argument('--rebuild', action='store_true', help='recompute all vectors, e.g. after SEARCH_CONFIG change')
+        parser.add_argument('--skip-backfill', action='store_true')
+        parser.add_argument('--batch', type=int, default=None)
+
+    def handle(self, *args, **options):
+        install(concurrently=not options['no_concurrently'])
+        if options['skip_backfill']:
+            return
+        updated = backfill(options['batch'], rebuild=options['rebuild'],
+                           progress=lambda done: self.stderr.write(f'\rbackfilled {done}', ending=''))
+        self.stderr.write(f'\nsearch vectors updated: {updated}')
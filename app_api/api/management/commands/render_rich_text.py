@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.core.utils.rich_text import backfill
+
+
+class Command(BaseCommand):
+    help = 'Render sanitized html and excerpts of CKEditor fields for existing rows, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', dest='models', metavar='LABEL',
+                            help='e.g. api.CompanyInfo, repeatable, default all of RICH_TEXT_FIELDS')
+        parser.add_argument('--batch', type=int, default=None)
+        parser.add_argument('--rebuild', action='store_true', help='also re-render rows whose content did not change')
+
+    def handle(self, *args, **options):
+        labels = options['models'] or list(settings.RICH_TEXT_FIELDS)
+        unknown = set(labels) - set(settings.RICH_TEXT_FIELDS)
+        if unknown:
+            raise CommandError(f'not in RICH_TEXT_FIELDS: {", ".join(sorted(unknown))}')
+        for label in labels:
+            counts = backfill(label, options['batch'], options['rebuild'], progress=lambda objects, rendered: (
+                self.stderr.write(f'\r{label}: {objects} objects, {rendered} rendered', ending='')))
+            self.stderr.write(f'\r{label}: {counts["objects"]} objects, {counts["rendered"]} rendered')
@@ -0,0 +1,26 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from api.core.utils.outbox import OutboxWorker, purge
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails over one pooled SMTP connection (runs until stopped unless --once)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='exit when nothing is due')
+        parser.add_argument('--batch', type=int, default=None)
+        parser.add_argument('--poll', type=float, default=None, help='seconds to sleep when the outbox is empty')
+        parser.add_argument('--purge-days', type=int, default=0, help='first delete sent messages older than this')
+
+    def handle(self, *args, **options):
+        if options['purge_days']:
+            self.stderr.write(f'purged {purge(options["purge_days"])} sent messages')
+        stopping = []
+        # finish the current batch on SIGTERM / SIGINT (docker stop, ctrl-c)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stopping.append(True))
+        total = OutboxWorker(batch=options['batch']).run(once=options['once'], poll=options['poll'],
+                                                         stop=lambda: bool(stopping))
+        self.stderr.write(f'sent {total["sent"]}, to retry {total["retry"]}, dead {total["dead"]}')
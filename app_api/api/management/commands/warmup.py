@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from api.core.utils.warmup import warmup
+
+
+class Command(BaseCommand):
+    help = 'Pre-import modules and pre-compile url resolvers and serializers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-docs', action='store_true', help='do not build the swagger schema view')
+
+    def handle(self, *args, **options):
+        timings = warmup(include_docs=not options['skip_docs'])
+        for stage, value in timings.items():
+            if stage.endswith('_count'):
+                self.stdout.write(f'{stage}: {value}')
+            else:
+                self.stdout.write(f'{stage}: {value * 1000:.1f} ms')
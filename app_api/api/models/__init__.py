@@ -0,0 +1,4 @@
+from api.models.seismic import SeismicFile, SeismicSNRJob  # noqa: F401
+from api.models.inbox import InboxCounter, InboxEntry, InboxHistoryEntry  # noqa: F401
+from api.models.outbox import OutboxEmail  # noqa: F401
+from api.models.rich_text import RenderedText  # noqa: F401
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class InboxEntry(models.Model):
+    """
+    Message as seen by one recipient: the inbox is read from this table alone, by (recipient, created_at),
+    without joining companies and messages or counting them
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='inbox')
+    message = models.ForeignKey('api.Messages', on_delete=models.CASCADE, related_name='inbox_entries')
+    # denormalized from the message / company link, so listing needs no joins
+    sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                               related_name='+', db_index=False)
+    company = models.ForeignKey('api.CompanyInfo', on_delete=models.SET_NULL, null=True, blank=True,
+                                related_name='+', db_index=False)
+    created_at = models.DateTimeField(default=timezone.now)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at'], name='inbox_recipient_created'),
+            models.Index(fields=['recipient'], condition=Q(read_at__isnull=True), name='inbox_recipient_unread'),
+        ]
+        constraints = [
+            # a message reaches a recipient once, by whichever path delivers it first (message, company)
+            models.UniqueConstraint(fields=['recipient', 'message'], name='inbox_recipient_message'),
+        ]
+
+
+class InboxCounter(models.Model):
+    """
+    Unread messages per user, changed with F() expressions together with the entries
+    """
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True,
+                                related_name='inbox_counter')
+    unread = models.PositiveIntegerField(default=0)
+
+
+class InboxHistoryEntry(models.Model):
+    """
+    Archived (read, old) inbox entries: a table partitioned by month of created_at, created and filled
+    by `manage.py inbox_archive`, not by migrations
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, related_name='+',
+                                  db_constraint=False)
+    message = models.ForeignKey('api.Messages', on_delete=models.DO_NOTHING, related_name='+', db_constraint=False)
+    sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, null=True, related_name='+',
+                               db_constraint=False)
+    company = models.ForeignKey('api.CompanyInfo', on_delete=models.DO_NOTHING, null=True, related_name='+',
+                                db_constraint=False)
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'api_inboxentry_history'
+        ordering = ['-created_at', '-id']
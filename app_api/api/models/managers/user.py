@@ -3,6 +3,8 @@ from django.contrib import auth
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.hashers import make_password
 
+from api.core.utils.permissions import get_backends
+
 
 class UserManager(BaseUserManager):
     def _create_user(self, fullname, email, password, **extra_fields):
@@ -34,7 +36,7 @@ class UserManager(BaseUserManager):
 
     def with_perm(self, perm, is_active=True, include_superusers=True, backend=None, obj=None):
         if backend is None:
-            backends = auth._get_backends(return_tuples=True)
+            backends = get_backends()
             if len(backends) == 1:
                 backend, _ = backends[0]
             else:
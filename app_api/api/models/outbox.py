@@ -0,0 +1,41 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class OutboxEmail(models.Model):
+    """
+    Email accepted by QueuedEmailBackend, delivered by `manage.py send_outbox`: the request only inserts
+    the rendered message, the worker sends it over a long-lived SMTP connection
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'  # claimed by a worker until next_attempt_at (lease), then retried
+    STATUS_SENT = 'sent'
+    STATUS_DEAD = 'dead'  # permanent failure or out of attempts, kept for inspection
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'pending'),
+        (STATUS_SENDING, 'sending'),
+        (STATUS_SENT, 'sent'),
+        (STATUS_DEAD, 'dead'),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField()
+    subject = models.CharField(max_length=255, blank=True)  # for the admin and logs only
+    message = models.BinaryField()  # MIME bytes as the SMTP backend would send them
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # the worker only scans deliverable rows, sent / dead ones do not grow the index
+            models.Index(fields=['next_attempt_at'], name='outbox_due',
+                         condition=Q(status__in=['pending', 'sending'])),
+        ]
@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class RenderedText(models.Model):
+    """
+    Sanitized html and plain text excerpt of a CKEditor field (RICH_TEXT_FIELDS), rendered when the
+    object is saved and kept while `content_hash` of the raw field does not change
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=100)  # 'api.CompanyInfo'
+    object_id = models.UUIDField()
+    field = models.CharField(max_length=64)
+    content_hash = models.CharField(max_length=40)
+    html = models.TextField()
+    excerpt = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'object_id', 'field'], name='rendered_text_object'),
+        ]
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.validators import FileExtensionValidator
+from django.db import models
+
+from api.core.model.base import CustomModelBase
+from api.core.model.validators import FileSizeValidator
+
+
+class SeismicFile(CustomModelBase):
+    """
+    Uploaded SEG-Y survey, served gather by gather from its sidecar cache
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'pending'),
+        (STATUS_READY, 'ready'),
+        (STATUS_FAILED, 'failed'),
+    )
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='seismic_files')
+    name = models.CharField(max_length=255, blank=True)
+    file = models.FileField(
+        upload_to=settings.SEISMIC_UPLOAD_PATH,
+        validators=[
+            FileExtensionValidator(settings.SEISMIC_EXTENSIONS),
+            FileSizeValidator(settings.MAX_SEISMIC_SIZE),
+        ],
+    )
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    error = models.TextField(blank=True)
+    # filled from the header index when the cache is built
+    n_gathers = models.PositiveIntegerField(null=True, blank=True)
+    n_traces = models.PositiveIntegerField(null=True, blank=True)
+    n_samples = models.PositiveIntegerField(null=True, blank=True)
+    dt = models.FloatField(null=True, blank=True)
+    source_hash = models.CharField(max_length=40, blank=True)  # changes with the file, base of gather etags
+
+    class Meta(CustomModelBase.Meta):
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.name or self.file.name
+
+
+class SeismicSNRJob(CustomModelBase):
+    """
+    SNR of one window pair over more gathers than a request computes (SEISMIC_SNR_MAX_GATHERS), run by the
+    `seismic` worker
+    """
+
+    seismic_file = models.ForeignKey(SeismicFile, on_delete=models.CASCADE, related_name='snr_jobs')
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='seismic_snr_jobs')
+    signal = models.CharField(max_length=64)  # T0,T1,N0,N1
+    noise = models.CharField(max_length=64)
+    mode = models.CharField(max_length=16)
+    gathers = models.JSONField(null=True, blank=True)  # gather numbers, null for every gather of the survey
+    status = models.CharField(max_length=16, choices=SeismicFile.STATUS_CHOICES, default=SeismicFile.STATUS_PENDING)
+    error = models.TextField(blank=True)
+    snr = models.JSONField(null=True, blank=True)  # one value per gather, null where undefined
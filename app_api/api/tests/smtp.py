@@ -0,0 +1,79 @@
+"""
+Local stand-in SMTP server for the outbox tests and benchmarks: accepts and counts messages, no TLS, no
+delivery. Recipients starting with "reject" get 550 (dead letter), starting with "busy" get 451 (retry);
+`connect_delay` models the TLS handshake + login of a real server (paid once per connection).
+"""
+import socketserver
+import threading
+import time
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        server = self.server
+        time.sleep(server.connect_delay)
+        with server.lock:
+            server.connections += 1
+        self.reply('220 smtp-sink ready')
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command[:4].upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250-smtp-sink')
+                self.reply('250 8BITMIME')
+            elif verb == 'MAIL':
+                recipients = []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                address = command.split(':', 1)[1].strip(' <>')
+                if address.startswith('reject'):
+                    self.reply('550 no such mailbox')
+                elif address.startswith('busy'):
+                    self.reply('451 try again later')
+                else:
+                    recipients.append(address)
+                    self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 end with .')
+                size = 0
+                for data in iter(self.rfile.readline, b''):
+                    if data == b'.\r\n':
+                        break
+                    size += len(data)
+                with server.lock:
+                    server.messages += 1
+                    server.bytes += size
+                self.reply('250 queued')
+            elif verb in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('502 not implemented')
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address=('127.0.0.1', 0), connect_delay: float = 0.0):
+        super().__init__(address, SMTPHandler)
+        self.connect_delay = connect_delay
+        self.lock = threading.Lock()
+        self.connections = self.messages = self.bytes = 0
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> 'SMTPSink':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
@@ -0,0 +1,150 @@
+"""
+Bulk create / update of the custom API views (api/core/api/bulk.py): partial success, duplicates inside
+a batch, perform_create arguments, signals and bulk_lookup_field, on RenderedText rows.
+
+    python manage.py test api.tests.test_bulk
+"""
+import json
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.core.api.base import CustomCreateAPIView, CustomUpdateAPIView
+from api.models import RenderedText
+
+OBJECT_ID = str(uuid.uuid4())
+
+
+class RenderedTextSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RenderedText
+        fields = ('id', 'model', 'object_id', 'field', 'content_hash', 'html', 'excerpt')
+
+
+class RenderedTextCreateView(CustomCreateAPIView):
+    serializer_class = RenderedTextSerializer
+
+
+class OwnFieldCreateView(CustomCreateAPIView):
+    """ perform_create sets read only fields, as views do with owner=request.user """
+
+    class serializer_class(RenderedTextSerializer):
+        class Meta(RenderedTextSerializer.Meta):
+            read_only_fields = ('model', 'field')
+
+    def perform_create(self, serializer):
+        serializer.save(model='api.News', field='body')
+
+
+class RenderedTextUpdateView(CustomUpdateAPIView):
+    serializer_class = RenderedTextSerializer
+    queryset = RenderedText.objects.all()
+
+
+class ByHashUpdateView(RenderedTextUpdateView):
+    bulk_lookup_field = 'content_hash'
+
+
+def _item(field: str = 'description', **values) -> dict:
+    item = {'model': 'api.CompanyInfo', 'object_id': OBJECT_ID, 'field': field, 'content_hash': field,
+            'html': f'<p>{field}</p>', 'excerpt': field}
+    item.update(values)
+    return item
+
+
+class BulkTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('bulk', 'bulk@example.com', 'secret')
+
+    def call(self, view, items: list, method: str = 'post') -> dict:
+        request = getattr(APIRequestFactory(), method)('/', json.dumps(items), content_type='application/json')
+        force_authenticate(request, self.user)
+        response = view.as_view()(request)
+        response.render()
+        return json.loads(response.content)
+
+    def results(self, body: dict) -> list:
+        return [item['result'] for item in body['data']['results']]
+
+    def record_post_save(self) -> list:
+        seen = []
+
+        def receiver(sender, instance, created, update_fields=None, **kwargs):
+            seen.append((instance.field, created, update_fields and sorted(update_fields)))
+
+        post_save.connect(receiver, sender=RenderedText, weak=False, dispatch_uid='test_bulk')
+        self.addCleanup(post_save.disconnect, sender=RenderedText, dispatch_uid='test_bulk')
+        return seen
+
+
+class BulkCreateTest(BulkTestCase):
+    def test_all_created(self):
+        body = self.call(RenderedTextCreateView, [_item('a'), _item('b')])
+        self.assertEqual(body['status_code'], 200)
+        self.assertEqual(body['data']['counts'], {'created': 2})
+        self.assertEqual(RenderedText.objects.count(), 2)
+
+    def test_partial_success_is_207(self):
+        body = self.call(RenderedTextCreateView, [_item('a'), _item('b', object_id='not a uuid'), _item('c')])
+        self.assertEqual(body['status_code'], 207)
+        self.assertEqual(self.results(body), ['created', 'invalid', 'created'])
+        self.assertIn('object_id', body['data']['results'][1]['errors'])
+        self.assertEqual(sorted(RenderedText.objects.values_list('field', flat=True)), ['a', 'c'])
+
+    def test_nothing_written_is_400(self):
+        body = self.call(RenderedTextCreateView, [_item('a', object_id='x')])
+        self.assertEqual(body['status_code'], 400)
+        self.assertFalse(RenderedText.objects.exists())
+
+    def test_duplicate_inside_batch_falls_back_to_savepoints(self):
+        body = self.call(RenderedTextCreateView, [_item('a'), _item('b'), _item('a', html='<p>again</p>')])
+        self.assertEqual(body['status_code'], 207)
+        self.assertEqual(self.results(body), ['created', 'created', 'failed'])
+        self.assertEqual(RenderedText.objects.get(field='a').html, '<p>a</p>')
+        self.assertEqual(RenderedText.objects.count(), 2)
+
+    def test_perform_create_kwargs_apply_to_every_item(self):
+        body = self.call(OwnFieldCreateView, [_item(object_id=str(uuid.uuid4())) for _ in range(2)])
+        self.assertEqual(body['data']['counts'], {'created': 2})
+        self.assertEqual(set(RenderedText.objects.values_list('model', 'field')), {('api.News', 'body')})
+
+    def test_post_save_is_sent_for_every_object(self):
+        seen = self.record_post_save()
+        self.call(RenderedTextCreateView, [_item('a'), _item('b')])
+        self.assertEqual(seen, [('a', True, None), ('b', True, None)])
+
+
+class BulkUpdateTest(BulkTestCase):
+    def setUp(self):
+        self.a, self.b = (RenderedText.objects.create(**_item(field)) for field in 'ab')
+
+    def test_update_by_pk(self):
+        body = self.call(RenderedTextUpdateView, [{'id': self.a.pk, 'html': '<p>new</p>'}], method='patch')
+        self.assertEqual(body['data']['counts'], {'updated': 1})
+        self.a.refresh_from_db()
+        self.assertEqual(self.a.html, '<p>new</p>')
+
+    def test_unknown_and_malformed_keys_are_not_found(self):
+        items = [{'id': self.a.pk, 'html': '<p>new</p>'}, {'id': 0, 'html': 'x'}, {'id': 'abc', 'html': 'x'}, {}]
+        body = self.call(RenderedTextUpdateView, items, method='patch')
+        self.assertEqual(body['status_code'], 207)
+        self.assertEqual(self.results(body), ['updated', 'not_found', 'not_found', 'not_found'])
+
+    def test_bulk_lookup_field(self):
+        items = [{'content_hash': 'b', 'html': '<p>by hash</p>'}, {'content_hash': str(self.a.pk), 'html': 'x'}]
+        body = self.call(ByHashUpdateView, items, method='patch')
+        self.assertEqual(self.results(body), ['updated', 'not_found'])
+        self.assertEqual(body['data']['results'][0]['id'], self.b.pk)
+        self.assertEqual(body['data']['results'][1]['content_hash'], str(self.a.pk))  # not looked up by pk
+        self.b.refresh_from_db()
+        self.assertEqual(self.b.html, '<p>by hash</p>')
+
+    def test_post_save_is_sent_with_update_fields(self):
+        seen = self.record_post_save()
+        self.call(RenderedTextUpdateView, [{'id': self.a.pk, 'excerpt': 'new'}], method='patch')
+        self.assertEqual(seen, [('a', False, ['excerpt', 'updated_at'])])
@@ -0,0 +1,119 @@
+"""
+OutboxWorker.run(once=True) against the local SMTP sink (api/tests/smtp.py): final status, attempts
+and next attempt of a message for each delivery outcome.
+
+    python manage.py test api.tests.test_outbox
+"""
+import socket
+from datetime import timedelta
+
+from django.core.mail import send_mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.core.utils.outbox import OutboxWorker
+from api.models import OutboxEmail
+from api.tests.smtp import SMTPHandler, SMTPSink
+
+
+class DroppingHandler(SMTPHandler):
+    """ Hangs up at MAIL FROM on the first `server.drops` connections, then behaves """
+
+    def handle(self):
+        with self.server.lock:
+            drop = self.server.drops > 0
+            self.server.drops -= 1
+        if not drop:
+            return super().handle()
+        self.reply('220 smtp-sink ready')
+        for line in iter(self.rfile.readline, b''):
+            if line[:4].upper() == b'MAIL':
+                return  # connection closed without a reply
+            self.reply('250 OK')
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@override_settings(EMAIL_BACKEND='api.core.utils.outbox.QueuedEmailBackend', OUTBOX_MAX_ATTEMPTS=8,
+                   OUTBOX_BACKOFF_BASE=30, OUTBOX_BACKOFF_MAX=3600)
+class OutboxWorkerTest(TestCase):
+    def setUp(self):
+        self.sink = SMTPSink().start()
+        self.addCleanup(self.sink.server_close)
+        self.addCleanup(self.sink.shutdown)
+
+    def run_worker(self, port: int = None) -> dict:
+        worker = OutboxWorker(host='127.0.0.1', port=port or self.sink.port, use_tls=False, timeout=5)
+        return worker.run(once=True)
+
+    def assertRetryAt(self, email: OutboxEmail, started, attempts: int = 1):
+        # backoff of the first attempt: OUTBOX_BACKOFF_BASE seconds +-20% jitter
+        self.assertEqual(email.attempts, attempts)
+        self.assertGreaterEqual(email.next_attempt_at, started + timedelta(seconds=24))
+        self.assertLessEqual(email.next_attempt_at, timezone.now() + timedelta(seconds=36))
+
+    def test_sent(self):
+        send_mail('subject', 'body', 'from@example.com', ['to@example.com'])
+        self.assertEqual(self.run_worker(), {'sent': 1, 'retry': 0, 'dead': 0})
+        email = OutboxEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.STATUS_SENT, 1))
+        self.assertIsNotNone(email.sent_at)
+        self.assertEqual(self.sink.messages, 1)
+
+    def test_550_is_dead(self):
+        started = timezone.now()
+        send_mail('subject', 'body', 'from@example.com', ['reject@example.com'])
+        self.assertEqual(self.run_worker(), {'sent': 0, 'retry': 0, 'dead': 1})
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.STATUS_DEAD)
+        self.assertRetryAt(email, started)
+        self.assertIn('550', email.last_error)
+        self.assertEqual(self.sink.messages, 0)
+
+    def test_451_is_retried(self):
+        started = timezone.now()
+        send_mail('subject', 'body', 'from@example.com', ['busy@example.com'])
+        self.assertEqual(self.run_worker(), {'sent': 0, 'retry': 1, 'dead': 0})
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.STATUS_PENDING)
+        self.assertRetryAt(email, started)
+        self.assertIn('451', email.last_error)
+
+    def test_451_out_of_attempts_is_dead(self):
+        send_mail('subject', 'body', 'from@example.com', ['busy@example.com'])
+        OutboxEmail.objects.update(attempts=7)
+        self.assertEqual(self.run_worker(), {'sent': 0, 'retry': 0, 'dead': 1})
+        email = OutboxEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.STATUS_DEAD, 8))
+
+    def test_refused_connection_retries_the_batch(self):
+        started = timezone.now()
+        for i in range(3):
+            send_mail('subject', 'body', 'from@example.com', [f'to{i}@example.com'])
+        self.assertEqual(self.run_worker(port=_closed_port()), {'sent': 0, 'retry': 3, 'dead': 0})
+        for email in OutboxEmail.objects.all():
+            self.assertEqual(email.status, OutboxEmail.STATUS_PENDING)
+            self.assertRetryAt(email, started)
+            self.assertIn('Refused', email.last_error)
+
+    def test_dropped_connection_is_reopened_once(self):
+        self.sink.RequestHandlerClass, self.sink.drops = DroppingHandler, 1
+        send_mail('subject', 'body', 'from@example.com', ['to@example.com'])
+        self.assertEqual(self.run_worker(), {'sent': 1, 'retry': 0, 'dead': 0})
+        email = OutboxEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.STATUS_SENT, 1))
+        self.assertEqual((self.sink.messages, self.sink.connections), (1, 1))  # the dropped one is not counted
+
+    def test_dropped_connection_twice_is_retried(self):
+        started = timezone.now()
+        self.sink.RequestHandlerClass, self.sink.drops = DroppingHandler, 2
+        send_mail('subject', 'body', 'from@example.com', ['to@example.com'])
+        self.assertEqual(self.run_worker(), {'sent': 0, 'retry': 1, 'dead': 0})
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.STATUS_PENDING)
+        self.assertRetryAt(email, started)
+        self.assertIn('Disconnected', email.last_error)
@@ -0,0 +1,102 @@
+"""
+Permission cache shared by the workers: a grant or revoke made in one process is seen by another one that
+already cached the old permission set, through the default database cache.
+
+    python manage.py test api.tests.test_permissions
+"""
+import multiprocessing
+import os
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import close_caches
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from api.core.utils import checks, permissions
+
+DATABASE_CACHE = {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'test_permission_cache'}
+LOCMEM_CACHE = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+PERM = 'auth.add_group'
+
+
+def _worker(pipe, user_pk):
+    """ Another gunicorn worker: answers has_perm(PERM) of the user for every message until None """
+    User = get_user_model()
+    for _ in iter(pipe.recv, None):
+        pipe.send(User.objects.get(pk=user_pk).has_perm(PERM))  # a fresh user, no per-instance cache
+    connections.close_all()
+
+
+@override_settings(CACHES={'default': DATABASE_CACHE}, PERMISSION_CACHE_ALIAS='default',
+                   PERMISSION_VERSION_CHECK_INTERVAL=0,
+                   AUTHENTICATION_BACKENDS=['api.core.api.backends.CachedModelBackend'])
+class CrossProcessPermissionTest(TransactionTestCase):
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('needs a database shared by processes')
+        call_command('createcachetable', verbosity=0)
+        permissions.clear()
+        self.addCleanup(permissions.clear)
+        self.user = get_user_model().objects.create_user('perm', 'perm@example.com', 'secret')
+        self.permission = Permission.objects.get(content_type__app_label='auth', codename='add_group')
+        self.other = self.start_worker()
+
+    def start_worker(self):
+        # children must not share the parent's database / cache sockets: close them before the fork,
+        # both processes reconnect on first use
+        connections.close_all()
+        close_caches()
+        pipe, child = multiprocessing.Pipe()
+        process = multiprocessing.get_context('fork').Process(target=_worker, args=(child, self.user.pk))
+        process.start()
+
+        def stop():
+            pipe.send(None)
+            process.join(10)
+
+        self.addCleanup(stop)
+        return pipe
+
+    def other_has_perm(self) -> bool:
+        self.other.send(True)
+        self.assertTrue(self.other.poll(10), 'worker process did not answer')
+        return self.other.recv()
+
+    def this_has_perm(self) -> bool:
+        return get_user_model().objects.get(pk=self.user.pk).has_perm(PERM)
+
+    def test_grant_is_seen_by_other_process(self):
+        self.assertFalse(self.other_has_perm())  # cached there as not granted
+        self.user.user_permissions.add(self.permission)
+        self.assertTrue(self.this_has_perm())
+        self.assertTrue(self.other_has_perm())
+
+    def test_revoke_is_seen_by_other_process(self):
+        self.user.user_permissions.add(self.permission)
+        self.assertTrue(self.other_has_perm())  # cached there as granted
+        self.user.user_permissions.remove(self.permission)
+        self.assertFalse(self.this_has_perm())
+        self.assertFalse(self.other_has_perm())
+
+    def test_group_membership_is_seen_by_other_process(self):
+        group = Group.objects.create(name='editors')
+        group.permissions.add(self.permission)
+        self.assertFalse(self.other_has_perm())
+        self.user.groups.add(group)
+        self.assertTrue(self.other_has_perm())
+        self.user.groups.remove(group)
+        self.assertFalse(self.other_has_perm())
+
+
+@mock.patch.dict(os.environ, {'SERVER_MODE': 'wsgi', 'WEB_WORKERS': '4'})
+class PermissionCacheCheckTest(SimpleTestCase):
+    def test_process_local_cache_is_refused(self):
+        with override_settings(CACHES={'default': LOCMEM_CACHE}, PERMISSION_CACHE_ALIAS='default'):
+            self.assertEqual([error.id for error in checks.check_permission_cache()], ['api.E001'])
+
+    def test_database_cache_is_accepted(self):
+        with override_settings(CACHES={'default': DATABASE_CACHE}, PERMISSION_CACHE_ALIAS='default'):
+            self.assertEqual(checks.check_permission_cache(), [])
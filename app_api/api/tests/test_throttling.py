@@ -0,0 +1,61 @@
+"""
+Rate limiting (api/core/api/throttling.py): failed credentials charged by RateLimitMiddleware, the store check
+of the server modes.
+
+    python manage.py test api.tests.test_throttling
+"""
+import os
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from api.core.api.throttling import THROTTLED_STATUS, RateLimitMiddleware, get_store
+from api.core.utils import checks
+
+LOGIN_PATH = '/user/token/login/'
+
+
+@override_settings(THROTTLE_STORE_URL='memory://', THROTTLE_EXEMPT_PATHS='',
+                   THROTTLE_RATES={'ip': '1000/min', 'auth': '1000/min', 'credentials': '3/min'},
+                   THROTTLE_PATH_RULES=[(r'^user/.*login', ('POST',), 'auth')])
+class FailedCredentialsTest(SimpleTestCase):
+    def setUp(self):
+        get_store().clear()
+        self.addCleanup(get_store().clear)
+        self.factory = RequestFactory()
+
+    def post(self, status: int, path: str = LOGIN_PATH, **headers) -> int:
+        middleware = RateLimitMiddleware(lambda request: HttpResponse(status=status))
+        return middleware(self.factory.post(path, **headers)).status_code
+
+    def test_bad_request_of_login_path_is_charged(self):
+        self.assertEqual([self.post(400) for _ in range(4)], [400, 400, 400, THROTTLED_STATUS])
+
+    def test_unauthorized_is_charged(self):
+        self.assertEqual([self.post(401) for _ in range(4)], [401, 401, 401, THROTTLED_STATUS])
+
+    def test_successful_login_is_not_charged(self):
+        self.assertEqual({self.post(200) for _ in range(5)}, {200})
+
+    def test_bad_request_elsewhere_is_not_charged(self):
+        basic = {'HTTP_AUTHORIZATION': 'Basic dXNlcjpwYXNz'}
+        self.assertEqual({self.post(400, '/api/news/', **basic) for _ in range(5)}, {400})
+        self.assertEqual(self.post(401, '/api/news/', **basic), 401)  # the 400s left the budget untouched
+
+
+class ThrottleStoreCheckTest(SimpleTestCase):
+    @mock.patch.dict(os.environ, {'SERVER_MODE': 'wsgi', 'WEB_WORKERS': '4'})
+    @override_settings(THROTTLE_STORE_URL='memory://')
+    def test_process_local_store_is_refused(self):
+        self.assertEqual([error.id for error in checks.check_throttle_store()], ['api.E003'])
+
+    @mock.patch.dict(os.environ, {'SERVER_MODE': 'asgi', 'ASGI_WORKERS': '4'})
+    @override_settings(THROTTLE_STORE_URL='redis://redis:6379/1')
+    def test_shared_store_is_accepted(self):
+        self.assertEqual(checks.check_throttle_store(), [])
+
+    @mock.patch.dict(os.environ, {'SERVER_MODE': 'wsgi', 'WEB_WORKERS': '1'})
+    @override_settings(THROTTLE_STORE_URL='memory://')
+    def test_one_worker_may_use_memory(self):
+        self.assertEqual(checks.check_throttle_store(), [])
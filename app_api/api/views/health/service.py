@@ -0,0 +1,28 @@
+from django.db import DatabaseError, connection
+
+_migrations_applied = False  # cached once true, migrations do not roll back under a running worker
+
+
+def database_ready() -> bool:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except DatabaseError:
+        return False
+    return True
+
+
+def migrations_applied() -> bool:
+    global _migrations_applied
+    if not _migrations_applied:
+        from django.db.migrations.executor import MigrationExecutor
+
+        executor = MigrationExecutor(connection)
+        _migrations_applied = not executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return _migrations_applied
+
+
+def readiness() -> dict:
+    checks = {'database': database_ready()}
+    checks['migrations'] = checks['database'] and migrations_applied()
+    return checks
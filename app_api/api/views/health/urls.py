@@ -0,0 +1,8 @@
+from django.urls import re_path
+
+from api.views.health.views import LiveView, ReadyView
+
+urlpatterns = [
+    re_path(r'^live/$', LiveView.as_view(), name='health-live'),
+    re_path(r'^ready/$', ReadyView.as_view(), name='health-ready'),
+]
@@ -0,0 +1,39 @@
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.core.api.responses import Responses
+from api.views.health.service import readiness
+
+
+class LiveView(APIView):
+    """
+    Liveness probe: the worker is up and serving
+    """
+
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request: Request) -> Response:
+        return Responses.make_response(data={'status': 'ok'})
+
+
+class ReadyView(APIView):
+    """
+    Readiness probe: database reachable and all migrations applied
+    """
+
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request: Request) -> Response:
+        checks = readiness()
+        if all(checks.values()):
+            return Responses.make_response(data=checks)
+        response = Responses.make_response(
+            data=checks, status_code=status.HTTP_503_SERVICE_UNAVAILABLE, message='not ready', error=True
+        )
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return response
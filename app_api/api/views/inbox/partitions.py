@@ -0,0 +1,110 @@
+from datetime import date, datetime
+from typing import Callable, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+
+LIVE_TABLE = 'api_inboxentry'
+HISTORY_TABLE = 'api_inboxentry_history'
+COLUMNS = 'id, recipient_id, message_id, sender_id, company_id, created_at, read_at'
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f'{HISTORY_TABLE}_y{month.year}m{month.month:02d}'
+
+
+def install():
+    """
+    History table partitioned by month of created_at (postgres 11+), indexes are created on every partition
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {HISTORY_TABLE} (
+                id bigint NOT NULL,
+                recipient_id uuid NOT NULL,
+                message_id uuid NOT NULL,
+                sender_id uuid NULL,
+                company_id uuid NULL,
+                created_at timestamp with time zone NOT NULL,
+                read_at timestamp with time zone NULL,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """)
+        cursor.execute(f'CREATE INDEX IF NOT EXISTS {HISTORY_TABLE}_recipient_created '
+                       f'ON {HISTORY_TABLE} (recipient_id, created_at DESC)')
+
+
+def ensure_partitions(start: date, end: date) -> List[str]:
+    """ monthly partitions covering [start, end] """
+    created, month = [], month_start(start)
+    with connection.cursor() as cursor:
+        while month <= end:
+            name = partition_name(month)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {name} PARTITION OF {HISTORY_TABLE}
+                FOR VALUES FROM (%s) TO (%s)
+            """, [month, next_month(month)])
+            created.append(name)
+            month = next_month(month)
+    return created
+
+
+def archive(older_than: datetime, batch: int = None, progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Move read entries created before `older_than` into the history, one DELETE ... RETURNING / INSERT
+    statement per batch. Unread entries stay in the inbox, so the counters are untouched.
+    """
+    batch = batch or settings.INBOX_ARCHIVE_BATCH
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT min(created_at) FROM {LIVE_TABLE} WHERE created_at < %s AND read_at IS NOT NULL',
+                       [older_than])
+        oldest = cursor.fetchone()[0]
+    if oldest is None:
+        return 0
+    ensure_partitions(oldest.date(), older_than.date())
+    moved = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"""
+                WITH moved AS (
+                    DELETE FROM {LIVE_TABLE} WHERE id IN (
+                        SELECT id FROM {LIVE_TABLE}
+                        WHERE created_at < %s AND read_at IS NOT NULL
+                        LIMIT %s
+                    )
+                    RETURNING {COLUMNS}
+                )
+                INSERT INTO {HISTORY_TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM moved
+            """, [older_than, batch])
+            count = cursor.rowcount
+        moved += count
+        if progress is not None:
+            progress(moved)
+        if count < batch:
+            return moved
+
+
+def drop_partitions(before: date) -> List[str]:
+    """ drop whole months of history older than `before`: no row by row delete, no vacuum """
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+        """, [HISTORY_TABLE])
+        names = sorted(row[0] for row in cursor.fetchall())
+        limit = partition_name(month_start(before))
+        dropped = [name for name in names if name < limit]  # names sort chronologically
+        for name in dropped:
+            cursor.execute(f'ALTER TABLE {HISTORY_TABLE} DETACH PARTITION {name}')
+            cursor.execute(f'DROP TABLE {name}')
+    return dropped
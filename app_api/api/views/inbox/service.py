@@ -0,0 +1,112 @@
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from api.core.utils.main import unique
+from api.models import InboxCounter, InboxEntry
+
+INBOX_FIELDS = ('id', 'message_id', 'sender_id', 'company_id', 'created_at', 'read_at')
+DELIVERY_FIELDS = ('recipient', 'message', 'sender', 'company', 'created_at')
+DELIVERY_BATCH = 1000
+
+
+def _insert_entries(recipient_ids: List, message_id, sender_id, company_id, created_at: datetime) -> List:
+    """
+    INSERT ... ON CONFLICT DO NOTHING RETURNING: the recipients that did not have the message yet, so a
+    delivery repeated by another path (or racing with it) changes no counter
+    """
+    fields = [InboxEntry._meta.get_field(name) for name in DELIVERY_FIELDS]
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    row = '(' + ', '.join(['%s'] * len(fields)) + ')'
+    inserted = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(recipient_ids), DELIVERY_BATCH):
+            chunk = recipient_ids[start:start + DELIVERY_BATCH]
+            params = [
+                field.get_db_prep_value(value, connection)
+                for recipient_id in chunk
+                for field, value in zip(fields, (recipient_id, message_id, sender_id, company_id, created_at))
+            ]
+            cursor.execute(f"""
+                INSERT INTO {InboxEntry._meta.db_table} ({columns}) VALUES {', '.join([row] * len(chunk))}
+                ON CONFLICT (recipient_id, message_id) DO NOTHING
+                RETURNING recipient_id
+            """, params)
+            inserted.extend(fields[0].to_python(recipient_id) for recipient_id, in cursor.fetchall())
+    return inserted
+
+
+def deliver(message_id, recipient_ids: Iterable, sender_id=None, company_id=None,
+            created_at: Optional[datetime] = None) -> int:
+    """
+    One inbox row per recipient that does not have the message yet and +1 on their unread counters:
+    three statements, whatever the number of recipients. Returns the rows inserted.
+    """
+    recipient_ids = [r for r in unique(recipient_ids) if r is not None and r != sender_id]
+    if not recipient_ids:
+        return 0
+    created_at = created_at or timezone.now()
+    with transaction.atomic():
+        inserted = _insert_entries(recipient_ids, message_id, sender_id, company_id, created_at)
+        if not inserted:
+            return 0
+        InboxCounter.objects.bulk_create(
+            [InboxCounter(user_id=recipient_id) for recipient_id in inserted], ignore_conflicts=True
+        )
+        InboxCounter.objects.filter(user_id__in=inserted).update(unread=F('unread') + 1)
+    return len(inserted)
+
+
+def unread_count(user) -> int:
+    return InboxCounter.objects.filter(user=user).values_list('unread', flat=True).first() or 0
+
+
+def inbox(user, before: Optional[datetime] = None, before_id: Optional[int] = None, limit: int = None,
+          unread_only: bool = False) -> List[dict]:
+    """
+    Newest first, keyset paginated by (created_at, id) of the last row of the previous page
+    """
+    queryset = InboxEntry.objects.filter(recipient=user)
+    if unread_only:
+        queryset = queryset.filter(read_at__isnull=True)
+    if before is not None:
+        older = Q(created_at__lt=before)
+        if before_id is not None:
+            older |= Q(created_at=before, id__lt=before_id)
+        queryset = queryset.filter(older)
+    queryset = queryset.order_by('-created_at', '-id').values(*INBOX_FIELDS, text=F('message__message_text'))
+    return list(queryset[:limit or settings.INBOX_PAGE_LIMIT])
+
+
+def mark_read(user, ids: Optional[Iterable[int]] = None, before: Optional[datetime] = None) -> dict:
+    """
+    Mark the given entries (or all unread up to `before`, or all) as read with one UPDATE; the counter
+    drops by the rows actually changed, so concurrent calls never count an entry twice
+    """
+    queryset = InboxEntry.objects.filter(recipient=user, read_at__isnull=True)
+    if ids is not None:
+        queryset = queryset.filter(id__in=list(ids))
+    if before is not None:
+        queryset = queryset.filter(created_at__lte=before)
+    with transaction.atomic():
+        marked = queryset.update(read_at=timezone.now())
+        if marked:
+            InboxCounter.objects.filter(user=user).update(unread=Greatest(F('unread') - marked, Value(0)))
+    return {'marked': marked, 'unread': unread_count(user)}
+
+
+def recount_unread(user_ids: Optional[Iterable] = None) -> int:
+    """
+    Recompute counters from the entries (repair after manual data changes), one statement
+    """
+    unread = InboxEntry.objects.filter(recipient=OuterRef('user'), read_at__isnull=True) \
+        .order_by().values('recipient').annotate(n=Count('id')).values('n')
+    counters = InboxCounter.objects.all()
+    if user_ids is not None:
+        counters = counters.filter(user_id__in=list(user_ids))
+    return counters.update(unread=Coalesce(Subquery(unread), Value(0)))
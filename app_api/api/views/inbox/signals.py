@@ -0,0 +1,30 @@
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_save
+
+from api.views.inbox.service import deliver
+
+
+def message_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        deliver(instance.pk, [instance.whom_id_id], sender_id=instance.from_id_id, created_at=instance.created_at)
+
+
+def company_messages_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # a message attached to a company goes to the inbox of the company owner
+    if action != 'post_add' or not pk_set:
+        return
+    CompanyInfo = apps.get_model('api', 'CompanyInfo')
+    Messages = apps.get_model('api', 'Messages')
+    if reverse:  # message.companyinfo_set.add(...)
+        companies = CompanyInfo.objects.filter(pk__in=pk_set).values_list('pk', 'owner_id')
+        for company_id, owner_id in companies:
+            deliver(instance.pk, [owner_id], sender_id=instance.from_id_id, company_id=company_id)
+    else:  # company.messages.add(...)
+        for message_id, from_id in Messages.objects.filter(pk__in=pk_set).values_list('pk', 'from_id_id'):
+            deliver(message_id, [instance.owner_id], sender_id=from_id, company_id=instance.pk)
+
+
+def connect():
+    post_save.connect(message_created, sender='api.Messages', dispatch_uid='inbox_message_created')
+    m2m_changed.connect(company_messages_changed, sender='api.CompanyInfo_messages',
+                        dispatch_uid='inbox_company_messages')
@@ -0,0 +1,9 @@
+from django.urls import re_path
+
+from api.views.inbox.views import InboxView, MarkReadView, UnreadView
+
+urlpatterns = [
+    re_path(r'^$', InboxView.as_view(), name='inbox'),
+    re_path(r'^unread/$', UnreadView.as_view(), name='inbox-unread'),
+    re_path(r'^read/$', MarkReadView.as_view(), name='inbox-read'),
+]
@@ -0,0 +1,96 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.core.api.base import BaseAPIView
+from api.core.api.responses import Responses
+from api.core.utils.main import int_in_range, islist
+from api.views.inbox.service import inbox, mark_read, unread_count
+
+
+def _aware(value):
+    if value is not None and timezone.is_naive(value):
+        return timezone.make_aware(value)
+    return value
+
+
+def _datetime(value: str, field: str) -> datetime:
+    """ Iso datetime of a request, `Z` suffix included (fromisoformat rejects it before python 3.11) """
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:  # well formed, out of range
+        parsed = None
+    if parsed is None:
+        raise ValidationError({field: 'expected an iso datetime'})
+    return _aware(parsed)
+
+
+def encode_cursor(created_at: datetime, entry_id: int) -> str:
+    return base64.urlsafe_b64encode(f'{created_at.isoformat()}|{entry_id}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, entry_id = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode().split('|')
+        return _datetime(created_at, 'cursor'), int(entry_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError({'cursor': 'invalid cursor'})
+
+
+class InboxView(BaseAPIView):
+    """
+    Inbox of the current user, newest first: `limit`, `unread` (1 for unread only),
+    next page with the `cursor` of `next` (or `before` / `before_id` from the last row)
+    """
+
+    def get(self, request: Request) -> Response:
+        params = request.query_params
+        try:
+            limit = int_in_range(int(params.get('limit', settings.INBOX_PAGE_LIMIT)), 1, settings.INBOX_PAGE_LIMIT)
+            before_id = int(params['before_id']) if params.get('before_id') else None
+        except ValueError:
+            raise ValidationError('limit and before_id must be integers')
+        before: Optional[datetime] = _datetime(params['before'], 'before') if params.get('before') else None
+        if params.get('cursor'):
+            before, before_id = decode_cursor(params['cursor'])
+        entries = inbox(request.user, before, before_id, limit, unread_only=params.get('unread') == '1')
+        last = entries[-1] if len(entries) == limit else None
+        return Responses.make_response(data={
+            'entries': entries,
+            'unread': unread_count(request.user),
+            'next': {'cursor': encode_cursor(last['created_at'], last['id'])} if last else None,
+        })
+
+
+class UnreadView(BaseAPIView):
+    """
+    Unread counter only, a primary key lookup (for badges / polling)
+    """
+
+    def get(self, request: Request) -> Response:
+        return Responses.make_response(data={'unread': unread_count(request.user)})
+
+
+class MarkReadView(BaseAPIView):
+    """
+    Mark entries as read: {"ids": [...]}, or {"before": iso datetime}, or {} for everything
+    """
+
+    def post(self, request: Request) -> Response:
+        if not isinstance(request.data, dict):  # a json list / scalar body
+            raise ValidationError('expected an object: {"ids": [...]}, {"before": ...} or {}')
+        ids = request.data.get('ids')
+        if ids is not None and not (islist(ids) and all(isinstance(i, int) and not isinstance(i, bool) for i in ids)):
+            raise ValidationError({'ids': 'expected a list of entry ids'})
+        before = request.data.get('before')
+        if before is not None:
+            before = _datetime(str(before), 'before')
+        return Responses.make_response(data=mark_read(request.user, ids, before))
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import os
+import select
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from django.apps import apps
+from django.db import connection, connections
+
+from api.core.api.asynchronous import db_sync_to_async
+
+logger = logging.getLogger(__name__)
+
+FEED_FIELDS = ('id', 'message_text', 'from_id_id', 'created_at')
+FEED_LIMIT = 100
+FEED_DEFAULT_TIMEOUT = 25  # seconds, below usual proxy read timeouts
+FEED_MAX_TIMEOUT = 55
+# waiters are woken by notify_recipient, this only bounds the delay of a lost notification (listener reconnecting,
+# a database without LISTEN / NOTIFY)
+FEED_POLL_INTERVAL = 10.0
+FEED_CHANNEL = 'api_messages'  # postgres NOTIFY channel, payload is the recipient pk
+FEED_LISTEN_RETRY = 5.0  # seconds before the listener reconnects
+
+
+def fetch_new_messages(user, since: datetime, limit: int = FEED_LIMIT) -> List[dict]:
+    Messages = apps.get_model('api', 'Messages')
+    queryset = Messages.objects.filter(whom_id=user, created_at__gt=since).order_by('created_at')
+    return list(queryset.values(*FEED_FIELDS)[:limit])
+
+
+class FeedWaiters:
+    """ Coroutines of this process waiting for messages: recipient pk -> {event: its loop} """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: Dict[int, Dict[asyncio.Event, asyncio.AbstractEventLoop]] = {}
+
+    def add(self, user_pk: int) -> asyncio.Event:
+        event = asyncio.Event()
+        with self._lock:
+            self._events.setdefault(user_pk, {})[event] = asyncio.get_running_loop()
+        return event
+
+    def discard(self, user_pk: int, event: asyncio.Event):
+        with self._lock:
+            events = self._events.get(user_pk, {})
+            events.pop(event, None)
+            if not events:
+                self._events.pop(user_pk, None)
+
+    def notify(self, user_pk: int):
+        """ Thread safe: called by signal receivers and the listener thread """
+        with self._lock:
+            waiting = list(self._events.get(user_pk, {}).items())
+        for event, loop in waiting:
+            loop.call_soon_threadsafe(event.set)
+
+
+waiters = FeedWaiters()
+
+
+class NotificationListener(threading.Thread):
+    """
+    LISTEN on FEED_CHANNEL with a connection of its own, wakes the waiters of this process for messages saved
+    by any process; one per process, started with the first waiter
+    """
+
+    def __init__(self):
+        super().__init__(name='feed-listener', daemon=True)
+        self.pid = os.getpid()
+
+    def run(self):
+        while True:
+            try:
+                self.listen()
+            except Exception:
+                logger.warning('feed listener: connection lost, waiters fall back to polling', exc_info=True)
+            time.sleep(FEED_LISTEN_RETRY)
+
+    def listen(self):
+        wrapper = connections['default']
+        conn = wrapper.get_new_connection(wrapper.get_connection_params())
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN {FEED_CHANNEL}')
+            while True:
+                select.select([conn], [], [], FEED_POLL_INTERVAL)
+                conn.poll()
+                while conn.notifies:
+                    waiters.notify(int(conn.notifies.pop(0).payload))
+        finally:
+            conn.close()
+
+
+_listener: Optional[NotificationListener] = None
+_listener_lock = threading.Lock()
+
+
+def _ensure_listener():
+    global _listener
+    if connection.vendor != 'postgresql':
+        return
+    with _listener_lock:
+        if _listener is None or _listener.pid != os.getpid():  # a forked worker starts its own
+            _listener = NotificationListener()
+            _listener.start()
+
+
+def notify_recipient(user_pk: int):
+    """ Wakes the feed of the recipient in every process; call once the message is committed """
+    waiters.notify(user_pk)
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [FEED_CHANNEL, str(user_pk)])
+
+
+async def wait_for_messages(user, since: datetime, timeout: float = FEED_DEFAULT_TIMEOUT,
+                            poll_interval: float = FEED_POLL_INTERVAL) -> List[dict]:
+    # holds only a coroutine while waiting, queries run when a message for the user is saved
+    deadline = time.monotonic() + timeout
+    _ensure_listener()
+    event = waiters.add(user.pk)  # before the first query: nothing saved in between is missed
+    try:
+        while True:
+            event.clear()
+            # not thread sensitive: the feeds of different users query in parallel
+            messages = await db_sync_to_async(fetch_new_messages, thread_sensitive=False)(user, since)
+            remaining = deadline - time.monotonic()
+            if messages or remaining <= 0:
+                return messages
+            try:
+                await asyncio.wait_for(event.wait(), min(poll_interval, remaining))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        waiters.discard(user.pk, event)
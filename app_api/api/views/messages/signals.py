@@ -0,0 +1,15 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save
+
+from api.views.messages.service import notify_recipient
+
+
+def message_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:  # the feed queries as soon as it wakes: only after the row is visible
+        transaction.on_commit(partial(notify_recipient, instance.whom_id_id))
+
+
+def connect():
+    post_save.connect(message_created, sender='api.Messages', dispatch_uid='messages_feed_notify')
@@ -0,0 +1,7 @@
+from django.urls import re_path
+
+from api.views.messages.views import MessagesFeedView
+
+urlpatterns = [
+    re_path(r'^feed/$', MessagesFeedView.as_view(), name='messages-feed'),
+]
@@ -0,0 +1,39 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.core.api.base import AsyncBaseAPIView
+from api.core.api.responses import Responses
+from api.core.utils.main import int_in_range
+from api.views.messages.service import FEED_DEFAULT_TIMEOUT, FEED_MAX_TIMEOUT, wait_for_messages
+
+
+class MessagesFeedView(AsyncBaseAPIView):
+    """
+    Long-poll feed of incoming messages.
+    Waits up to `timeout` seconds for messages created after `since` (iso datetime, default now, 400 when unparsable).
+    """
+
+    async def get(self, request: Request) -> Response:
+        since = timezone.now()
+        if request.query_params.get('since'):
+            try:  # `Z` suffix included, the `since` of a previous response
+                since = parse_datetime(request.query_params['since'])
+            except ValueError:  # well formed, out of range
+                since = None
+            if since is None:
+                raise ValidationError({'since': 'expected an iso datetime'})
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        try:
+            timeout = int_in_range(int(request.query_params.get('timeout', FEED_DEFAULT_TIMEOUT)), 0, FEED_MAX_TIMEOUT)
+        except ValueError:
+            timeout = FEED_DEFAULT_TIMEOUT
+
+        messages = await wait_for_messages(request.user, since, timeout=timeout)
+        return Responses.make_response(data={
+            'messages': messages,
+            'since': messages[-1]['created_at'] if messages else since,
+        })
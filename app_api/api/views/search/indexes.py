@@ -0,0 +1,105 @@
+import re
+from typing import Callable, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from api.core.utils.main import NULL_UUID
+
+COMPANY_TABLE = 'api_companyinfo'
+VECTOR_COLUMN = 'search_vector'
+TRIGGER_FUNCTION = 'api_companyinfo_search_vector_update'
+TRIGGER = 'api_companyinfo_search_vector_trigger'
+VECTOR_SOURCE_COLUMNS = ('name', 'keys_words', 'city', 'metro', 'place_work', 'description')
+
+# name -> (table, index definition); built with CONCURRENTLY, so outside of a transaction
+INDEXES = {
+    'api_companyinfo_search_vector_gin': (COMPANY_TABLE, f'USING gin ({VECTOR_COLUMN})'),
+    'api_companyinfo_name_trgm': (COMPANY_TABLE, 'USING gin (name gin_trgm_ops)'),
+    'api_category_name_trgm': ('api_category', 'USING gin (name gin_trgm_ops)'),
+    'api_subcategory_name_trgm': ('api_subcategory', 'USING gin (name gin_trgm_ops)'),
+}
+
+
+def search_config() -> str:
+    config = settings.SEARCH_CONFIG
+    if not re.fullmatch(r'[a-z_]+', config):  # formatted into ddl, not a bind parameter
+        raise ValueError(f'invalid text search configuration {config!r}')
+    return config
+
+
+def vector_sql(row: str = '') -> str:
+    """
+    Weighted document of a company: name > key words > location > description (ckeditor html, tags dropped).
+    `row` is the column prefix, "NEW." inside the trigger.
+    """
+    config = search_config()
+    return (
+        f"setweight(to_tsvector('{config}', coalesce({row}name, '')), 'A') || "
+        f"setweight(to_tsvector('{config}', coalesce({row}keys_words, '')), 'B') || "
+        f"setweight(to_tsvector('{config}', concat_ws(' ', {row}city, {row}metro, {row}place_work)), 'C') || "
+        f"setweight(to_tsvector('{config}', "
+        f"regexp_replace(coalesce({row}description, ''), '<[^>]+>', ' ', 'g')), 'D')"
+    )
+
+
+def schema_statements() -> List[str]:
+    return [
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+        f'ALTER TABLE {COMPANY_TABLE} ADD COLUMN IF NOT EXISTS {VECTOR_COLUMN} tsvector',
+        f"""
+        CREATE OR REPLACE FUNCTION {TRIGGER_FUNCTION}() RETURNS trigger AS $$
+        BEGIN
+            NEW.{VECTOR_COLUMN} := {vector_sql('NEW.')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f'DROP TRIGGER IF EXISTS {TRIGGER} ON {COMPANY_TABLE}',
+        f"""
+        CREATE TRIGGER {TRIGGER}
+        BEFORE INSERT OR UPDATE OF {', '.join(VECTOR_SOURCE_COLUMNS)} ON {COMPANY_TABLE}
+        FOR EACH ROW EXECUTE PROCEDURE {TRIGGER_FUNCTION}()
+        """,
+    ]
+
+
+def index_statements(concurrently: bool = True) -> List[str]:
+    mode = 'CONCURRENTLY ' if concurrently else ''
+    return [
+        f'CREATE INDEX {mode}IF NOT EXISTS {name} ON {table} {definition}'
+        for name, (table, definition) in INDEXES.items()
+    ]
+
+
+def backfill(batch: int = None, rebuild: bool = False, progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Fill search vectors of rows written before the trigger existed, in primary key batches
+    (short transactions, no full table lock). `rebuild` recomputes all rows, e.g. after a config change.
+    """
+    batch = batch or settings.SEARCH_BACKFILL_BATCH
+    only_missing = '' if rebuild else f'AND {VECTOR_COLUMN} IS NULL'
+    last_id, updated = NULL_UUID, 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'SELECT id FROM {COMPANY_TABLE} WHERE id > %s ORDER BY id LIMIT %s', [last_id, batch])
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                return updated
+            cursor.execute(
+                f'UPDATE {COMPANY_TABLE} SET {VECTOR_COLUMN} = {vector_sql()} WHERE id = ANY(%s) {only_missing}',
+                [ids],
+            )
+            updated += cursor.rowcount
+        last_id = ids[-1]
+        if progress is not None:
+            progress(updated)
+
+
+def install(concurrently: bool = True):
+    with transaction.atomic(), connection.cursor() as cursor:
+        for statement in schema_statements():
+            cursor.execute(statement)
+    with connection.cursor() as cursor:  # autocommit, CREATE INDEX CONCURRENTLY can not run in a transaction
+        for statement in index_statements(concurrently):
+            cursor.execute(statement)
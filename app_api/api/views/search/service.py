@@ -0,0 +1,70 @@
+from typing import List, Optional
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection
+
+from api.core.utils.main import str_similarity
+from api.views.search.indexes import COMPANY_TABLE, VECTOR_COLUMN, search_config
+
+COMPANY_FIELDS = ('id', 'name', 'city', 'metro', 'keys_words')
+
+# each branch uses the trigram index of its table (`<%` is word similarity: the query may be a part of the name)
+SUGGEST_SQL = """
+    (SELECT 'category' AS kind, id, name, word_similarity(%(q)s, name) AS score
+     FROM api_category WHERE %(q)s <%% name ORDER BY score DESC LIMIT %(candidates)s)
+    UNION ALL
+    (SELECT 'subcategory' AS kind, id, name, word_similarity(%(q)s, name) AS score
+     FROM api_subcategory WHERE %(q)s <%% name ORDER BY score DESC LIMIT %(candidates)s)
+    UNION ALL
+    (SELECT 'company' AS kind, id, name, word_similarity(%(q)s, name) AS score
+     FROM api_companyinfo WHERE %(q)s <%% name ORDER BY score DESC LIMIT %(candidates)s)
+"""
+
+
+def _dictfetchall(cursor) -> List[dict]:
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def search_companies(query: str, category: Optional[UUID] = None, limit: int = None, offset: int = 0) -> List[dict]:
+    """
+    Ranked full-text search over company profiles (web search syntax: "quoted phrases", or, -exclude)
+    """
+    params = {
+        'config': search_config(),
+        'q': query,
+        'category': category,
+        'limit': limit or settings.SEARCH_PAGE_LIMIT,
+        'offset': offset,
+    }
+    category_filter = """
+        AND EXISTS (SELECT 1 FROM api_companyinfo_category cc
+                    WHERE cc.companyinfo_id = c.id AND cc.category_id = %(category)s)
+    """ if category else ''
+    sql = f"""
+        SELECT {', '.join(f'c.{field}' for field in COMPANY_FIELDS)},
+               ts_rank_cd(c.{VECTOR_COLUMN}, q.query, 32) AS rank
+        FROM {COMPANY_TABLE} c, websearch_to_tsquery(%(config)s::regconfig, %(q)s) AS q(query)
+        WHERE c.{VECTOR_COLUMN} @@ q.query {category_filter}
+        ORDER BY rank DESC, c.id
+        LIMIT %(limit)s OFFSET %(offset)s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return _dictfetchall(cursor)
+
+
+def suggest(query: str, limit: int = None) -> List[dict]:
+    """
+    Typo tolerant suggestions over category, subcategory and company names: trigram candidates
+    from the indexes, then reranked by str_similarity (only the small candidate set is scored in python)
+    """
+    limit = limit or settings.SUGGEST_LIMIT
+    with connection.cursor() as cursor:
+        cursor.execute(SUGGEST_SQL, {'q': query, 'candidates': settings.SUGGEST_CANDIDATES})
+        candidates = _dictfetchall(cursor)
+    for candidate in candidates:
+        candidate['similarity'] = str_similarity(query, candidate['name'])
+    candidates.sort(key=lambda c: (c['similarity'], c['score']), reverse=True)
+    return candidates[:limit]
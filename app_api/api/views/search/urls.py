@@ -0,0 +1,8 @@
+from django.urls import re_path
+
+from api.views.search.views import CompanySearchView, SuggestView
+
+urlpatterns = [
+    re_path(r'^companies/$', CompanySearchView.as_view(), name='search-companies'),
+    re_path(r'^suggest/$', SuggestView.as_view(), name='search-suggest'),
+]
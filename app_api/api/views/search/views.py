@@ -0,0 +1,57 @@
+from uuid import UUID
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.core.api.base import BaseAPIView
+from api.core.api.responses import Responses
+from api.core.utils.main import int_in_range
+from api.views.search.service import search_companies, suggest
+
+
+def _query(request: Request) -> str:
+    query = request.query_params.get('q', '').strip()
+    if len(query) < settings.SEARCH_MIN_QUERY:
+        raise ValidationError({'q': f'at least {settings.SEARCH_MIN_QUERY} characters'})
+    return query
+
+
+def _category(request: Request):
+    category = request.query_params.get('category')
+    if not category:
+        return None
+    try:
+        return UUID(category)
+    except ValueError:
+        raise ValidationError({'category': 'expected a category id'})
+
+
+def _int(request: Request, name: str, default: int, maximum: int) -> int:
+    try:
+        return int_in_range(int(request.query_params.get(name, default)), 0, maximum)
+    except ValueError:
+        return default
+
+
+class CompanySearchView(BaseAPIView):
+    """
+    Ranked full-text search over companies: `q`, optional `category` (id), `limit`, `offset`
+    """
+
+    def get(self, request: Request) -> Response:
+        limit = _int(request, 'limit', settings.SEARCH_PAGE_LIMIT, settings.SEARCH_PAGE_LIMIT) or 1
+        offset = _int(request, 'offset', 0, 10000)
+        results = search_companies(_query(request), _category(request), limit, offset)
+        return Responses.make_response(data={'results': results, 'limit': limit, 'offset': offset})
+
+
+class SuggestView(BaseAPIView):
+    """
+    Typo tolerant suggestions over category, subcategory and company names: `q`, `limit`
+    """
+
+    def get(self, request: Request) -> Response:
+        limit = _int(request, 'limit', settings.SUGGEST_LIMIT, settings.SUGGEST_CANDIDATES) or 1
+        return Responses.make_response(data={'results': suggest(_query(request), limit)})
@@ -0,0 +1,27 @@
+from rest_framework import serializers
+
+from api.models import SeismicFile, SeismicSNRJob
+from api.views.seismic import service
+
+
+class SeismicFileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeismicFile
+        fields = ('id', 'name', 'file', 'status', 'error', 'n_gathers', 'n_traces', 'n_samples', 'dt', 'created_at')
+        read_only_fields = ('status', 'error', 'n_gathers', 'n_traces', 'n_samples', 'dt', 'created_at')
+
+
+class SeismicSNRJobSerializer(serializers.ModelSerializer):
+    mode = serializers.ChoiceField(choices=service.SNR_MODES, default='energy')
+    gathers = serializers.ListField(child=serializers.IntegerField(min_value=0), allow_null=True, required=False,
+                                    allow_empty=False)
+
+    class Meta:
+        model = SeismicSNRJob
+        fields = ('id', 'seismic_file', 'signal', 'noise', 'mode', 'gathers', 'status', 'error', 'snr', 'created_at')
+        read_only_fields = ('seismic_file', 'status', 'error', 'snr', 'created_at')
+
+    def validate(self, attrs):
+        service.parse_window(attrs['signal'], 'signal')
+        service.parse_window(attrs['noise'], 'noise')
+        return attrs
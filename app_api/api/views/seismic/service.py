@@ -0,0 +1,241 @@
+import hashlib
+import shutil
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+from rest_framework.exceptions import NotFound, ValidationError
+
+from api.models import SeismicFile, SeismicSNRJob
+
+PAYLOAD_DTYPES = {'float32': '<f4', 'float16': '<f2'}  # little endian on the wire
+GATHERS_PAGE_LIMIT = 1000
+HEADER_FIELDS = ('Trace_number', 'FFID', 'SouX', 'SouY', 'Elev')
+SNR_MODES = ('energy', 'rms')
+
+_volumes: 'OrderedDict[str, object]' = OrderedDict()  # path -> SeismicVolume, LRU, per worker process
+_volumes_lock = threading.Lock()
+
+
+def _open(path: str):
+    from seismic.cache import open_volume
+
+    return open_volume(path, cache=True, cache_bytes=settings.SEISMIC_GATHER_CACHE_BYTES)
+
+
+def visible_files(user):
+    """ Surveys a user may read: their own, every survey for staff """
+    queryset = SeismicFile.objects.all()
+    return queryset if user.is_staff else queryset.filter(owner=user)
+
+
+def get_volume(seismic_file: SeismicFile):
+    """
+    Opened survey of a ready file, shared by all requests of the worker: headers and the gather index
+    are loaded once, samples are read from the memory mapped cache (the OS page cache is shared
+    between workers).
+    """
+    if seismic_file.status != SeismicFile.STATUS_READY:
+        raise NotFound(f'seismic file is {seismic_file.status}')
+    path = seismic_file.file.path
+    with _volumes_lock:
+        volume = _volumes.get(path)
+        if volume is not None:
+            _volumes.move_to_end(path)
+            return volume
+    volume = _open(path)  # outside the lock, a cold open may read the whole header index
+    with _volumes_lock:
+        current = _volumes.setdefault(path, volume)
+        _volumes.move_to_end(path)
+        while len(_volumes) > settings.SEISMIC_OPEN_VOLUMES:
+            _, evicted = _volumes.popitem(last=False)
+            evicted.cache.clear()  # not closed, requests may still read it; unmapped when released
+    if current is not volume:  # opened concurrently by another thread
+        volume.close()
+    return current
+
+
+def release_volume(path: str):
+    with _volumes_lock:
+        volume = _volumes.pop(path, None)
+    if volume is not None:
+        volume.cache.clear()
+
+
+def index_seismic_file(seismic_file: SeismicFile) -> SeismicFile:
+    """
+    Build the sidecar cache (header index + gather-ordered samples) and store the survey geometry
+    """
+    from seismic.cache import source_key
+
+    path = seismic_file.file.path
+    release_volume(path)
+    try:
+        volume = _open(path)
+        key = source_key(path)
+    except Exception as e:  # unreadable / not a SEG-Y file
+        seismic_file.status = SeismicFile.STATUS_FAILED
+        seismic_file.error = str(e)
+    else:
+        seismic_file.status = SeismicFile.STATUS_READY
+        seismic_file.error = ''
+        seismic_file.n_gathers = len(volume)
+        seismic_file.n_traces = volume.n_traces
+        seismic_file.n_samples = volume.n_samples
+        seismic_file.dt = volume.dt
+        seismic_file.source_hash = hashlib.sha1(repr(sorted(key.items())).encode()).hexdigest()
+        volume.close()
+    seismic_file.save()
+    return seismic_file
+
+
+def delete_seismic_file(seismic_file: SeismicFile):
+    from seismic.cache import cache_dir_for
+
+    path = seismic_file.file.path
+    release_volume(path)
+    shutil.rmtree(cache_dir_for(path), ignore_errors=True)
+    seismic_file.delete()  # the upload itself is removed by django_cleanup
+
+
+def gather_list(volume, start: int = 0, limit: int = GATHERS_PAGE_LIMIT) -> List[dict]:
+    index = volume.index
+    stop = min(start + limit, len(index))
+    return [
+        {'index': i, 'ffid': int(ffid), 'traces': int(count)}
+        for i, ffid, count in zip(range(start, stop), index.ffids[start:stop], index.counts[start:stop])
+    ]
+
+
+def _gather_number(volume, i: int) -> int:
+    if not 0 <= i < len(volume):
+        raise NotFound(f'gather {i} out of range, {len(volume)} gathers')
+    return i
+
+
+def gather_headers(volume, i: int) -> dict:
+    i = _gather_number(volume, i)
+    traces = volume.index.trace_indices(i)
+    return {
+        'index': i,
+        'ffid': int(volume.index.ffids[i]),
+        'traces': len(traces),
+        'samples': volume.n_samples,
+        'dt': volume.dt,
+        'headers': {name: volume.headers[name][traces].tolist() for name in HEADER_FIELDS if name in volume.headers},
+    }
+
+
+def parse_range(value: Optional[str], size: int, name: str) -> Tuple[int, int]:
+    """ "a:b" with slicing semantics, empty bounds mean the edges """
+    if not value:
+        return 0, size
+    try:
+        start, stop = (int(v) if v else None for v in value.split(':'))
+    except ValueError:
+        raise ValidationError({name: 'expected start:stop'})
+    start, stop, _ = slice(start, stop).indices(size)
+    if stop <= start:
+        raise ValidationError({name: 'empty range'})
+    return start, stop
+
+
+def parse_window(value: Optional[str], name: str) -> Tuple[int, int, int, int]:
+    try:
+        window = tuple(int(v) for v in (value or '').split(','))
+    except ValueError:
+        window = ()
+    if len(window) != 4:
+        raise ValidationError({name: 'expected T0,T1,N0,N1'})
+    return window
+
+
+def gather_slice(volume, i: int, traces: Optional[str] = None, samples: Optional[str] = None,
+                 max_traces: int = 0, max_samples: int = 0) -> np.ndarray:
+    """
+    Window of a gather, optionally min/max decimated to at most max_traces x max_samples
+    (peaks are kept, as in the desktop viewer)
+    """
+    from seismic.render import decimate_minmax
+
+    data = volume.gather(_gather_number(volume, i))
+    t0, t1 = parse_range(traces, data.shape[0], 'traces')
+    s0, s1 = parse_range(samples, data.shape[1], 'samples')
+    data = data[t0:t1, s0:s1]
+    if max_traces:
+        data = decimate_minmax(data, max_traces, axis=0)
+    if max_samples:
+        data = decimate_minmax(data, max_samples, axis=1)
+    return data
+
+
+def encode_gather(data: np.ndarray, dtype: str = 'float32') -> bytes:
+    if dtype not in PAYLOAD_DTYPES:
+        raise ValidationError({'dtype': f'one of {", ".join(PAYLOAD_DTYPES)}'})
+    itemsize = np.dtype(PAYLOAD_DTYPES[dtype]).itemsize
+    if data.size * itemsize > settings.SEISMIC_MAX_PAYLOAD_BYTES:
+        raise ValidationError('gather slice too large, narrow the window or decimate')
+    return np.ascontiguousarray(data, dtype=PAYLOAD_DTYPES[dtype]).tobytes()
+
+
+def gather_etag(seismic_file: SeismicFile, i: int, params: Sequence) -> str:
+    # a gather only changes with the file, so its cache validator needs no data read
+    raw = repr((seismic_file.source_hash, i, tuple(params)))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def parse_gathers(value: Optional[str]) -> Optional[List[int]]:
+    """ "0,1,2" -> [0, 1, 2], None when not given (every gather) """
+    if not value:
+        return None
+    try:
+        return [int(v) for v in value.split(',')]
+    except ValueError:
+        raise ValidationError({'gathers': 'expected comma separated gather numbers'})
+
+
+def check_snr_job(seismic_file: SeismicFile, gathers: Optional[Sequence[int]]):
+    """ Refuse a job the worker would fail on: survey not indexed, gathers out of range """
+    if seismic_file.status != SeismicFile.STATUS_READY:
+        raise NotFound(f'seismic file is {seismic_file.status}')
+    invalid = [i for i in gathers or () if not 0 <= i < seismic_file.n_gathers]
+    if invalid:
+        raise ValidationError({'gathers': f'out of range, {seismic_file.n_gathers} gathers: {invalid[:10]}'})
+
+
+def file_snr(volume, signal, noise, mode: str, gathers: Optional[Sequence[int]] = None) -> List[Optional[float]]:
+    from seismic.snr import batch_snr
+
+    numbers = range(len(volume)) if gathers is None else [_gather_number(volume, i) for i in gathers]
+    values = batch_snr((volume.gather(i) if i in volume.cache else volume.source.read_gather(volume.index, i)
+                        for i in numbers), signal, noise, mode)
+    return [float(v) if np.isfinite(v) else None for v in values]  # json has no inf / nan
+
+
+def gather_snr(volume, i: int, signals: Sequence[str], noises: Sequence[str], mode: str) -> List[Optional[float]]:
+    """
+    SNR of several window pairs on one gather: one summed-area table, then O(1) per pair
+    """
+    from seismic.snr import EnergyTable
+
+    if not signals or len(signals) != len(noises):
+        raise ValidationError('pass the same number of signal and noise windows')
+    signal = np.array([parse_window(v, 'signal') for v in signals])
+    noise = np.array([parse_window(v, 'noise') for v in noises])
+    values = EnergyTable(volume.gather(_gather_number(volume, i))).snr(signal, noise, mode)
+    return [float(v) if np.isfinite(v) else None for v in values]
+
+
+def run_snr_job(job: SeismicSNRJob) -> SeismicSNRJob:
+    """ Compute a queued survey SNR (the `seismic` worker), the job turns ready with `snr` or failed """
+    try:
+        job.snr = file_snr(get_volume(job.seismic_file), parse_window(job.signal, 'signal'),
+                           parse_window(job.noise, 'noise'), job.mode, job.gathers)
+    except Exception as e:
+        job.status, job.error = SeismicFile.STATUS_FAILED, str(e)
+    else:
+        job.status, job.error = SeismicFile.STATUS_READY, ''
+    job.save()
+    return job
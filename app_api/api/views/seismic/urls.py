@@ -0,0 +1,19 @@
+from django.urls import re_path
+
+from api.views.seismic.views import (
+    GatherDataView, GatherSNRView, GatherView, SeismicFileListView, SeismicFileSNRView, SeismicFileView,
+    SeismicSNRJobView,
+)
+
+urlpatterns = [
+    re_path(r'^$', SeismicFileListView.as_view(), name='seismic-files'),
+    re_path(r'^(?P<pk>[0-9a-f-]+)/$', SeismicFileView.as_view(), name='seismic-file'),
+    re_path(r'^(?P<pk>[0-9a-f-]+)/snr/$', SeismicFileSNRView.as_view(), name='seismic-file-snr'),
+    re_path(r'^(?P<pk>[0-9a-f-]+)/snr/jobs/(?P<job>[0-9a-f-]+)/$', SeismicSNRJobView.as_view(),
+            name='seismic-snr-job'),
+    re_path(r'^(?P<pk>[0-9a-f-]+)/gathers/(?P<gather>[0-9]+)/$', GatherView.as_view(), name='seismic-gather'),
+    re_path(r'^(?P<pk>[0-9a-f-]+)/gathers/(?P<gather>[0-9]+)/data/$', GatherDataView.as_view(),
+            name='seismic-gather-data'),
+    re_path(r'^(?P<pk>[0-9a-f-]+)/gathers/(?P<gather>[0-9]+)/snr/$', GatherSNRView.as_view(),
+            name='seismic-gather-snr'),
+]
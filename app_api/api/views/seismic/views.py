@@ -0,0 +1,174 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from api.core.api.base import BaseAPIView
+from api.core.api.responses import Responses
+from api.models import SeismicFile, SeismicSNRJob
+from api.views.seismic import service
+from api.views.seismic.serializers import SeismicFileSerializer, SeismicSNRJobSerializer
+
+
+def _int_param(request: Request, name: str, default: int = 0, minimum: int = 0) -> int:
+    try:
+        value = int(request.query_params.get(name, default))
+    except ValueError:
+        raise ValidationError({name: 'expected an integer'})
+    if value < minimum:
+        raise ValidationError({name: f'expected >= {minimum}'})
+    return value
+
+
+def _snr_mode(request: Request) -> str:
+    mode = request.query_params.get('mode', 'energy')
+    if mode not in service.SNR_MODES:
+        raise ValidationError({'mode': f'one of {", ".join(service.SNR_MODES)}'})
+    return mode
+
+
+def _seismic_file(request: Request, pk) -> SeismicFile:
+    """ Survey of the user (any for staff), 404 for surveys of others """
+    return get_object_or_404(service.visible_files(request.user), pk=pk)
+
+
+class SeismicFileListView(BaseAPIView):
+    """
+    Surveys of the user (every survey for staff); POST (multipart `file`, optional `name`) registers
+    an upload as pending, its header index and gather cache are built by `manage.py index_seismic --every`
+    (the `seismic` worker), the upload turns ready or failed (with the error) when it is done.
+    """
+
+    parser_classes = (MultiPartParser,)
+
+    def get(self, request: Request) -> Response:
+        serializer = SeismicFileSerializer(service.visible_files(request.user), many=True)
+        return Responses.make_response(data=serializer.data)
+
+    def post(self, request: Request) -> Response:
+        serializer = SeismicFileSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data['file']
+        seismic_file = serializer.save(owner=request.user, name=serializer.validated_data.get('name') or upload.name,
+                                       status=SeismicFile.STATUS_PENDING)
+        return Responses.make_response(data=SeismicFileSerializer(seismic_file).data,
+                                       status_code=status.HTTP_202_ACCEPTED)
+
+
+class SeismicFileView(BaseAPIView):
+    """
+    Survey geometry and a page of its gathers (`start`, `limit`) from the header index
+    """
+
+    def get(self, request: Request, pk) -> Response:
+        seismic_file = _seismic_file(request, pk)
+        data = SeismicFileSerializer(seismic_file).data
+        if seismic_file.status == SeismicFile.STATUS_READY:
+            start = _int_param(request, 'start')
+            limit = min(_int_param(request, 'limit', service.GATHERS_PAGE_LIMIT, 1), service.GATHERS_PAGE_LIMIT)
+            data['gathers'] = service.gather_list(service.get_volume(seismic_file), start, limit)
+        return Responses.make_response(data=data)
+
+    def delete(self, request: Request, pk) -> Response:
+        seismic_file = _seismic_file(request, pk)
+        service.delete_seismic_file(seismic_file)
+        return Responses.make_response(data={'id': pk})
+
+
+class GatherView(BaseAPIView):
+    """
+    Trace headers of one gather
+    """
+
+    def get(self, request: Request, pk, gather: int) -> Response:
+        seismic_file = _seismic_file(request, pk)
+        return Responses.make_response(data=service.gather_headers(service.get_volume(seismic_file), int(gather)))
+
+
+class GatherDataView(BaseAPIView):
+    """
+    Gather samples as a raw little-endian array (`dtype` float32 | float16), row per trace.
+    Optional `traces` / `samples` windows (start:stop) and `max_traces` / `max_samples` min/max
+    decimation; the array shape is in the X-Seismic-Shape header. Responses carry an ETag, repeated
+    requests with If-None-Match are answered with 304 without reading samples.
+    """
+
+    def get(self, request: Request, pk, gather: int) -> HttpResponse:
+        seismic_file = _seismic_file(request, pk)
+        gather = int(gather)
+        params = request.query_params
+        dtype = params.get('dtype', 'float32')
+        max_traces = _int_param(request, 'max_traces')
+        max_samples = _int_param(request, 'max_samples')
+        etag = quote_etag(service.gather_etag(
+            seismic_file, gather, (dtype, params.get('traces'), params.get('samples'), max_traces, max_samples)
+        ))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is None:
+            data = service.gather_slice(service.get_volume(seismic_file), gather, params.get('traces'),
+                                        params.get('samples'), max_traces, max_samples)
+            response = HttpResponse(service.encode_gather(data, dtype), content_type='application/octet-stream')
+            response['X-Seismic-Shape'] = ','.join(str(v) for v in data.shape)
+            response['X-Seismic-Dtype'] = dtype
+        else:
+            response = not_modified
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=settings.SEISMIC_CACHE_MAX_AGE)
+        return response
+
+
+class GatherSNRView(BaseAPIView):
+    """
+    SNR of window pairs on one gather: repeated `signal` / `noise` params (T0,T1,N0,N1), `mode`
+    """
+
+    def get(self, request: Request, pk, gather: int) -> Response:
+        seismic_file = _seismic_file(request, pk)
+        snr = service.gather_snr(service.get_volume(seismic_file), int(gather), request.query_params.getlist('signal'),
+                                 request.query_params.getlist('noise'), _snr_mode(request))
+        return Responses.make_response(data={'gather': int(gather), 'snr': snr})
+
+
+class SeismicFileSNRView(BaseAPIView):
+    """
+    SNR of one window pair (`signal`, `noise`: T0,T1,N0,N1) on the `gathers` listed (comma separated) or on
+    every gather of the survey, at most SEISMIC_SNR_MAX_GATHERS in the request (400 above). POST (json `signal`,
+    `noise`, `mode`, optional `gathers` list) queues any number for the `seismic` worker: 202 with the job,
+    polled at snr/jobs/<id>/.
+    """
+
+    def get(self, request: Request, pk) -> Response:
+        seismic_file = _seismic_file(request, pk)
+        signal = service.parse_window(request.query_params.get('signal'), 'signal')
+        noise = service.parse_window(request.query_params.get('noise'), 'noise')
+        gathers = service.parse_gathers(request.query_params.get('gathers'))
+        count = len(gathers) if gathers is not None else seismic_file.n_gathers or 0
+        if count > settings.SEISMIC_SNR_MAX_GATHERS:
+            raise ValidationError({'gathers': f'{count} gathers, at most {settings.SEISMIC_SNR_MAX_GATHERS} per '
+                                              f'request: POST to run them as a job'})
+        snr = service.file_snr(service.get_volume(seismic_file), signal, noise, _snr_mode(request), gathers)
+        return Responses.make_response(data={'gathers': gathers, 'snr': snr})
+
+    def post(self, request: Request, pk) -> Response:
+        seismic_file = _seismic_file(request, pk)
+        serializer = SeismicSNRJobSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        service.check_snr_job(seismic_file, serializer.validated_data.get('gathers'))
+        job = serializer.save(seismic_file=seismic_file, owner=request.user)
+        return Responses.make_response(data=SeismicSNRJobSerializer(job).data, status_code=status.HTTP_202_ACCEPTED)
+
+
+class SeismicSNRJobView(BaseAPIView):
+    """
+    State of a survey SNR job, `snr` once it is ready
+    """
+
+    def get(self, request: Request, pk, job) -> Response:
+        job = get_object_or_404(SeismicSNRJob, pk=job, seismic_file=_seismic_file(request, pk))
+        return Responses.make_response(data=SeismicSNRJobSerializer(job).data)
@@ -0,0 +1,129 @@
+"""
+Benchmark results against a stored baseline: results are nested json, every numeric leaf is a metric.
+Its name says which way is worse: *_per_s higher is better; *_ms, *_us, *_kib lower is better, compared with
+the relative threshold; *queries* lower is better and compared exactly (any extra query is a regression).
+Other numbers (counts, sizes of the run) are not compared. `--metrics` limits the comparison to the given
+metric names (the last part of the path, e.g. min_us), the rest is reported but not compared.
+
+    python benchmarks/baseline.py results.json benchmarks/baselines/micro.json [--threshold 0.2] [--metrics min_us]
+    python benchmarks/baseline.py results.json benchmarks/baselines/micro.json --update
+Exit code 1 when something regressed.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_THRESHOLD = float(os.getenv('BENCH_THRESHOLD', '0.2'))
+HIGHER_IS_BETTER = ('_per_s',)
+LOWER_IS_BETTER = ('_ms', '_us', '_kib')
+
+
+def _leaves(data, path: str = '') -> Iterator[Tuple[str, float]]:
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _leaves(value, f'{path}.{key}' if path else key)
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield path, data
+
+
+def _direction(name: str, metrics: Optional[Sequence[str]] = None) -> Optional[Tuple[int, bool]]:
+    """ (1 lower is better | -1 higher is better, exact) or None when the metric is not compared """
+    leaf = name.rsplit('.', 1)[-1]
+    if metrics is not None and leaf not in metrics:
+        return None
+    if 'queries' in leaf:
+        return 1, True
+    if leaf.endswith(HIGHER_IS_BETTER):
+        return -1, False
+    if leaf.endswith(LOWER_IS_BETTER):
+        return 1, False
+    return None
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD,
+            metrics: Optional[Sequence[str]] = None) -> Dict[str, List[dict]]:
+    """
+    {'regressions': [...], 'improvements': [...], 'missing': [...]}, each item a metric with both values;
+    only the metrics named in `metrics` when given
+    """
+    report = {'regressions': [], 'improvements': [], 'missing': []}
+    values = dict(_leaves(current))
+    for name, before in _leaves(baseline):
+        direction = _direction(name, metrics)
+        if direction is None:
+            continue
+        if name not in values:
+            report['missing'].append({'metric': name, 'baseline': before})
+            continue
+        sign, exact = direction
+        after = values[name]
+        change = (after - before) / before if before else (0.0 if after == before else float('inf'))
+        worse = sign * change
+        item = {'metric': name, 'baseline': before, 'current': after, 'change': round(change, 3)}
+        if worse > (0 if exact else threshold):
+            report['regressions'].append(item)
+        elif -worse > (0 if exact else threshold):
+            report['improvements'].append(item)
+    return report
+
+
+def check(results: dict, baseline_path: str, threshold: float = DEFAULT_THRESHOLD, update: bool = False,
+          metrics: Optional[Sequence[str]] = None) -> bool:
+    """
+    Compare with the baseline file and print the report to stderr; a missing baseline (first run) or
+    `update` stores the results as the baseline. False when something regressed.
+    """
+    if update or not os.path.exists(baseline_path):
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        with open(baseline_path, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        sys.stderr.write(f'baseline saved to {baseline_path}\n')
+        return True
+    with open(baseline_path) as file:
+        report = compare(results, json.load(file), threshold, metrics)
+    sys.stderr.write(json.dumps(report, indent=2) + '\n')
+    return not report['regressions']
+
+
+def add_arguments(parser: argparse.ArgumentParser, metrics: Optional[Sequence[str]] = None):
+    """
+    --output / --baseline / --threshold / --metrics / --update-baseline of the benchmark scripts, `metrics`
+    the names compared by default (all when None)
+    """
+    parser.add_argument('--output', help='write the results json here as well')
+    parser.add_argument('--baseline', help='compare with this baseline json, exit 1 on a regression')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative change counted as a regression (default %(default)s, env BENCH_THRESHOLD)')
+    parser.add_argument('--metrics', nargs='+', default=metrics,
+                        help='compare only these metric names (default %(default)s, all when not set)')
+    parser.add_argument('--update-baseline', action='store_true', help='store the results as the new baseline')
+
+
+def finish(results: dict, args: argparse.Namespace):
+    """ Print the results, save them, compare with the baseline and exit 1 on a regression """
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if args.baseline and not check(results, args.baseline, args.threshold, args.update_baseline, args.metrics):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('results')
+    parser.add_argument('baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--metrics', nargs='+', default=None, help='compare only these metric names')
+    parser.add_argument('--update', action='store_true')
+    args = parser.parse_args()
+
+    with open(args.results) as file:
+        results = json.load(file)
+    sys.exit(0 if check(results, args.baseline, args.threshold, args.update, args.metrics) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Bulk writes: records/sec of the single-object create / update path (one request per record, as partner
+integrations did) against one json list request and one ndjson stream, through CustomCreateAPIView /
+CustomUpdateAPIView with a Category serializer. Requests go through the views in process (no network).
+
+Run against a scratch database (the project settings and .env are used), after migrations:
+    python benchmarks/bulk_write.py --records 5000
+Seeded categories are named bulk-bench-*, deleted at the end.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mainapp.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.apps import apps  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from api.core.api.base import CustomCreateAPIView, CustomUpdateAPIView  # noqa: E402
+from api.core.utils.queries import count_queries  # noqa: E402
+
+PREFIX = 'bulk-bench-'
+Category = apps.get_model('api', 'Category')
+
+
+class CategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ['id', 'name']
+
+
+class CreateView(CustomCreateAPIView):
+    serializer_class = CategorySerializer
+
+
+class UpdateView(CustomUpdateAPIView):
+    serializer_class = CategorySerializer
+    queryset = Category.objects.all()
+
+
+factory = APIRequestFactory()
+USER = None  # set in main()
+
+
+def _call(view, method: str, body, content_type: str = 'application/json', **kwargs):
+    request = getattr(factory, method)('/', body if isinstance(body, str) else json.dumps(body),
+                                       content_type=content_type)
+    force_authenticate(request, USER)
+    response = view.as_view()(request, **kwargs)
+    response.render()
+    return response
+
+
+def _rate(records: int, func) -> dict:
+    started = time.perf_counter()
+    queries = count_queries(func)
+    elapsed = time.perf_counter() - started
+    return {'records_per_s': round(records / elapsed, 1), 'queries': queries}
+
+
+def run(records: int) -> dict:
+    names = [f'{PREFIX}{i}' for i in range(records)]
+    result = {'single_create': _rate(records, lambda: [_call(CreateView, 'post', {'name': f'{n}-s'}) for n in names])}
+    result['bulk_create_json'] = _rate(records, lambda: _call(CreateView, 'post', [{'name': n} for n in names]))
+    ndjson = '\n'.join(json.dumps({'name': f'{n}-nd'}) for n in names)
+    result['bulk_create_ndjson'] = _rate(
+        records, lambda: _call(CreateView, 'post', ndjson, content_type='application/x-ndjson'))
+
+    ids = [str(pk) for pk in Category.objects.filter(name__in=names).values_list('id', flat=True)]
+    result['single_update'] = _rate(len(ids), lambda: [
+        _call(UpdateView, 'patch', {'name': f'{PREFIX}{i}-u'}, pk=pk) for i, pk in enumerate(ids)
+    ])
+    result['bulk_update_json'] = _rate(len(ids), lambda: _call(UpdateView, 'patch', [
+        {'id': pk, 'name': f'{PREFIX}{i}-b'} for i, pk in enumerate(ids)
+    ]))
+    for bulk, single in (('bulk_create_json', 'single_create'), ('bulk_create_ndjson', 'single_create'),
+                         ('bulk_update_json', 'single_update')):
+        result[bulk]['speedup'] = round(result[bulk]['records_per_s'] / result[single]['records_per_s'], 1)
+    return result
+
+
+def main():
+    global USER
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=5000)
+    args = parser.parse_args()
+
+    USER = get_user_model().objects.order_by('pk').first()
+    Category.objects.filter(name__startswith=PREFIX).delete()
+    try:
+        print(json.dumps(run(args.records), indent=2))
+    finally:
+        Category.objects.filter(name__startswith=PREFIX).delete()
+
+
+if __name__ == '__main__':
+    main()
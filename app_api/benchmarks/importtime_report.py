@@ -0,0 +1,53 @@
+"""
+Import time report based on `python -X importtime`.
+
+Usage (from app_api/): python benchmarks/importtime_report.py [--top 30] [--target mainapp.urls]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOT_CODE = (
+    "import os, importlib; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mainapp.settings'); "
+    "import django; django.setup(); "
+    "importlib.import_module({target!r})"
+)
+
+
+def collect(target: str) -> list:
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT_CODE.format(target=target)],
+        cwd=APP_DIR, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--top', type=int, default=30)
+    parser.add_argument('--target', default='mainapp.urls', help='module imported after django.setup()')
+    parser.add_argument('--sort', choices=['self', 'cumulative'], default='cumulative')
+    args = parser.parse_args()
+
+    rows = collect(args.target)
+    key = 0 if args.sort == 'self' else 1
+    total_us = sum(r[0] for r in rows)
+    print(f'{len(rows)} modules, {total_us / 1000:.1f} ms total self time')
+    print(f'{"self ms":>9} {"cumul ms":>9}  module')
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[key], reverse=True)[:args.top]:
+        print(f'{self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}  {name}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+Inbox at scale: seeds bench users and messages (default 10M) with their inbox rows and counters,
+then compares the old per-load join + COUNT(*) over api_messages with the inbox tables
+(unread counter lookup, first page, mark-all-read of one user).
+
+Run against a scratch database (the project settings and .env are used), after migrations:
+    python benchmarks/inbox_10m.py --messages 10000000 --users 10000
+    python benchmarks/inbox_10m.py --skip-seed
+    python benchmarks/inbox_10m.py --cleanup
+Bench users have emails ending with @inbox-bench.invalid.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mainapp.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from api.views.inbox.service import inbox, mark_read, unread_count  # noqa: E402
+
+DOMAIN = '@inbox-bench.invalid'
+SEED_CHUNK = 500000
+
+USERS_SQL = """
+    INSERT INTO api_user (password, last_login, is_superuser, id, email, fullname, telephone, role, is_active,
+                          is_staff, created_at, updated_at, image, balance)
+    SELECT '', NULL, false, md5('inbox-bench' || g::text)::uuid, 'user' || g::text || %(domain)s,
+           'bench ' || g::text, '', 'user', true, false, now(), now(), NULL, 0
+    FROM generate_series(1, %(users)s) g
+    ON CONFLICT DO NOTHING
+"""
+
+# messages spread over the last year, random sender / recipient among bench users
+MESSAGES_SQL = """
+    INSERT INTO api_messages (id, created_at, updated_at, message_text, from_id_id, whom_id_id)
+    SELECT md5('inbox-bench-message' || g::text)::uuid, ts, ts, 'bench message ' || g::text,
+           md5('inbox-bench' || (1 + (random() * (%(users)s - 1))::int)::text)::uuid,
+           md5('inbox-bench' || (1 + (random() * (%(users)s - 1))::int)::text)::uuid
+    FROM generate_series(%(start)s, %(stop)s) g,
+         LATERAL (SELECT now() - random() * interval '365 days' AS ts) t
+"""
+
+INBOX_SQL = """
+    INSERT INTO api_inboxentry (recipient_id, message_id, sender_id, company_id, created_at, read_at)
+    SELECT m.whom_id_id, m.id, m.from_id_id, NULL, m.created_at,
+           CASE WHEN random() < 0.8 THEN m.created_at END
+    FROM api_messages m JOIN api_user u ON u.id = m.whom_id_id
+    WHERE u.email LIKE %(like)s
+"""
+
+COUNTERS_SQL = """
+    INSERT INTO api_inboxcounter (user_id, unread)
+    SELECT recipient_id, count(*) FILTER (WHERE read_at IS NULL) FROM api_inboxentry GROUP BY recipient_id
+    ON CONFLICT (user_id) DO UPDATE SET unread = EXCLUDED.unread
+"""
+
+# what an inbox load did before: count and list through api_messages
+OLD_COUNT_SQL = 'SELECT count(*) FROM api_messages WHERE whom_id_id = %s'
+OLD_PAGE_SQL = """
+    SELECT m.id, m.message_text, m.from_id_id, m.created_at, cm.companyinfo_id
+    FROM api_messages m LEFT JOIN api_companyinfo_messages cm ON cm.messages_id = m.id
+    WHERE m.whom_id_id = %s ORDER BY m.created_at DESC LIMIT 50
+"""
+
+
+def _stats(timings: list) -> dict:
+    ms = sorted(t * 1000 for t in timings)
+    return {'median_ms': round(statistics.median(ms), 2), 'p95_ms': round(ms[max(0, int(len(ms) * 0.95) - 1)], 2)}
+
+
+def _timed(func, users: list) -> list:
+    timings = []
+    for user_id in users:  # the service functions filter by the user, a primary key works as well
+        start = time.perf_counter()
+        func(user_id)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _sql(sql: str):
+    def run(user_id):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [user_id])
+            return cursor.fetchall()
+    return run
+
+
+def seed(messages: int, users: int) -> dict:
+    timings = {}
+    with connection.cursor() as cursor:
+        started = time.perf_counter()
+        cursor.execute(USERS_SQL, {'domain': DOMAIN, 'users': users})
+        for start in range(1, messages + 1, SEED_CHUNK):
+            cursor.execute(MESSAGES_SQL, {'users': users, 'start': start, 'stop': min(start + SEED_CHUNK - 1, messages)})
+            sys.stderr.write(f'\rmessages {min(start + SEED_CHUNK - 1, messages)}')
+        sys.stderr.write('\n')
+        timings['messages_s'] = round(time.perf_counter() - started, 1)
+        started = time.perf_counter()
+        cursor.execute(INBOX_SQL, {'like': f'%{DOMAIN}'})
+        cursor.execute(COUNTERS_SQL)
+        timings['inbox_s'] = round(time.perf_counter() - started, 1)
+        cursor.execute('ANALYZE api_messages')
+        cursor.execute('ANALYZE api_inboxentry')
+    return timings
+
+
+def cleanup() -> dict:
+    like = f'%{DOMAIN}'
+    users = 'SELECT id FROM api_user WHERE email LIKE %s'
+    deleted = {}
+    with connection.cursor() as cursor:
+        for table, column in (('api_inboxentry', 'recipient_id'), ('api_inboxcounter', 'user_id'),
+                              ('api_messages', 'whom_id_id'), ('api_user', 'id')):
+            cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({users})', [like])
+            deleted[table] = cursor.rowcount
+    return deleted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=10000000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--samples', type=int, default=50)
+    parser.add_argument('--skip-seed', action='store_true')
+    parser.add_argument('--cleanup', action='store_true')
+    args = parser.parse_args()
+
+    if args.cleanup:
+        print(json.dumps(cleanup(), indent=2))
+        return
+
+    result = {}
+    if not args.skip_seed:
+        result['seed'] = seed(args.messages, args.users)
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT count(*) FROM api_inboxentry')
+        result['inbox_rows'] = cursor.fetchone()[0]
+        cursor.execute('SELECT id FROM api_user WHERE email LIKE %s', [f'%{DOMAIN}'])
+        user_ids = [row[0] for row in cursor.fetchall()]
+
+    random.seed(0)
+    users = random.sample(user_ids, min(args.samples, len(user_ids)))
+    result.update({
+        'old_unread_count': _stats(_timed(_sql(OLD_COUNT_SQL), users)),
+        'old_first_page': _stats(_timed(_sql(OLD_PAGE_SQL), users)),
+        'counter_lookup': _stats(_timed(unread_count, users)),
+        'inbox_first_page': _stats(_timed(inbox, users)),
+        'mark_all_read': _stats(_timed(mark_read, users)),  # one UPDATE + one counter UPDATE per user
+    })
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
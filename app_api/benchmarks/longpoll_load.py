@@ -0,0 +1,69 @@
+"""
+Concurrent connection load test for the long-poll messages feed.
+
+Opens N simultaneous requests against the feed and reports how many were served and how long
+the slowest took. Run it once against the sync server (runserver / wsgi) and once against
+SERVER_MODE=asgi to compare connection capacity.
+
+Usage: python benchmarks/longpoll_load.py --url http://localhost:8125/messages/feed/ \
+           --token <auth token> --connections 500 --timeout 10
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import aiohttp
+
+
+async def _one(session: aiohttp.ClientSession, url: str, timeout: int) -> tuple:
+    start = time.perf_counter()
+    try:
+        async with session.get(url, params={'timeout': timeout}) as response:
+            await response.read()
+            return response.status, time.perf_counter() - start
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+        return type(exc).__name__, time.perf_counter() - start
+
+
+async def run(url: str, token: str, connections: int, timeout: int) -> dict:
+    headers = {'Authorization': f'Token {token}'} if token else {}
+    connector = aiohttp.TCPConnector(limit=0)
+    client_timeout = aiohttp.ClientTimeout(total=timeout * 3 + 30)
+    async with aiohttp.ClientSession(headers=headers, connector=connector, timeout=client_timeout) as session:
+        start = time.perf_counter()
+        results = await asyncio.gather(*[_one(session, url, timeout) for _ in range(connections)])
+        wall = time.perf_counter() - start
+
+    served = [elapsed for status, elapsed in results if status == 200]
+    errors = {}
+    for status, _ in results:
+        if status != 200:
+            errors[str(status)] = errors.get(str(status), 0) + 1
+    return {
+        'url': url,
+        'connections': connections,
+        'poll_timeout_s': timeout,
+        'served': len(served),
+        'errors': errors,
+        'wall_s': round(wall, 3),
+        'median_s': round(statistics.median(served), 3) if served else None,
+        'max_s': round(max(served), 3) if served else None,
+        # with every request parked for `timeout`, wall / timeout ~ number of sequential "waves"
+        'waves': round(wall / timeout, 2) if timeout else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', required=True)
+    parser.add_argument('--token', default='')
+    parser.add_argument('--connections', type=int, default=200)
+    parser.add_argument('--timeout', type=int, default=10, help='feed long-poll timeout, seconds')
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.url, args.token, args.connections, args.timeout)), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+"""
+Micro-benchmarks of the hot helpers: api.core.utils.main, Responses.make_response (rendered),
+custom_exception_handler and the model validators. Each case is calibrated to run at least --min-time per
+round and timed for --rounds rounds (as pytest-benchmark does); per call: median and min microseconds.
+Only min_us is compared with the baseline by default (--metrics): the fastest round is the least disturbed by
+other processes, the median of back-to-back runs on a busy runner moves by far more than the threshold.
+
+Standalone, does not need a database:
+    python benchmarks/micro.py [--rounds 20] [-k deep]
+    python benchmarks/micro.py --baseline benchmarks/baselines/micro.json [--threshold 0.2]
+    python benchmarks/micro.py --baseline benchmarks/baselines/micro.json --update-baseline
+Baselines depend on the machine: keep one per runner, refresh it after an intended slowdown.
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure(
+    SECRET_KEY='benchmark',
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth', 'rest_framework'],
+    DATABASES={},
+    REST_FRAMEWORK={
+        'EXCEPTION_HANDLER': 'api.core.api.expections.custom_exception_handler',
+        'UNAUTHENTICATED_USER': None,
+    },
+)
+django.setup()
+
+from django.core.exceptions import ValidationError as DjangoValidationError  # noqa: E402
+from django.core.files.base import ContentFile  # noqa: E402
+from django.http import Http404, QueryDict  # noqa: E402
+from rest_framework import exceptions  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework.views import APIView  # noqa: E402
+
+from api.core.api.expections import custom_exception_handler  # noqa: E402
+from api.core.api.responses import Responses  # noqa: E402
+from api.core.model.validators import AccountIdentityPhoneValidator, FileSizeValidator  # noqa: E402
+from api.core.utils import main  # noqa: E402
+from benchmarks.baseline import add_arguments, finish  # noqa: E402
+
+CASES: Dict[str, Callable[[], Callable[[], object]]] = {}  # name -> setup returning the timed call
+
+
+def case(name: str):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+# # api.core.utils.main
+
+NESTED = {'company': {'name': 'Стройсервис', 'contacts': {'phones': ['79991234567'] * 3, 'site': ''},
+                      'requisites': {'inn': '7700000000', 'kpp': '770001001', 'bank': {'bik': '044525225'}}},
+          'tags': [{'id': i, 'name': f'tag {i}'} for i in range(10)]}
+
+
+@case('main.deepupdate')
+def _deepupdate():
+    update = {'company': {'contacts': {'site': 'example.com'}, 'requisites': {'bank': {'bik': '044525226'}}}}
+    return lambda: main.deepupdate({'company': dict(NESTED['company'])}, update)
+
+
+@case('main.deepupdater')
+def _deepupdater():
+    update = {'company': {'contacts': {'site': 'example.com'}}, 'tags': []}
+    return lambda: main.deepupdater(NESTED, update)
+
+
+@case('main.dict_walk')
+def _dict_walk():
+    return lambda: list(main.dict_walk(NESTED))
+
+
+@case('main.flattendeep')
+def _flattendeep():
+    nested = [[i, [i + 1, (i + 2, [i + 3])]] for i in range(0, 40, 4)]
+    return lambda: main.flattendeep(nested)
+
+
+@case('main.unique')
+def _unique():
+    values = [i % 150 for i in range(1000)]
+    return lambda: main.unique(values)
+
+
+@case('main.fullgroupby')
+def _fullgroupby():
+    rows = [{'city': f'city {i % 8}', 'id': i} for i in range(200)]
+    return lambda: [(key, list(group)) for key, group in main.fullgroupby(rows, key=lambda row: row['city'])]
+
+
+@case('main.find_str_similar')
+def _find_str_similar():
+    names = [f'{prefix}{suffix}' for prefix in ('Строй', 'Торг', 'Мед', 'Авто', 'Агро')
+             for suffix in ('сервис', 'маш', 'комплект', 'снаб', 'монтаж', 'проект')]
+    return lambda: main.find_str_similar('стройсервс', names, 0.8)
+
+
+@case('main.try_iso_date_parse')
+def _try_iso_date_parse():
+    return lambda: (main.try_iso_date_parse('2021-06-01T12:30:00+03:00'), main.try_iso_date_parse('not a date'))
+
+
+@case('main.json_try_parse')
+def _json_try_parse():
+    body = '{"name": "Стройсервис", "tags": [1, 2, 3], "active": true}'
+    return lambda: (main.json_try_parse(body), main.json_try_parse('{broken'))
+
+
+@case('main.querydict_to_full_dict')
+def _querydict_to_full_dict():
+    query = QueryDict('q=бетон&category=1&category=2&limit=20&offset=40&city=Казань')
+    return lambda: main.querydict_to_full_dict(query)
+
+
+# # responses and errors
+
+@case('responses.make_response')
+def _make_response():
+    data = {'items': [{'id': i, 'name': f'company {i}', 'city': 'Москва'} for i in range(20)], 'count': 20}
+    renderer = JSONRenderer()
+    return lambda: renderer.render(Responses.make_response(data=data, message='ok').data)
+
+
+def _exception_case(exception: Callable[[], Exception]):
+    context = {'view': APIView(), 'request': APIRequestFactory().get('/')}
+
+    def call():
+        response = custom_exception_handler(exception(), context)
+        if hasattr(response, 'render'):
+            response.accepted_renderer, response.accepted_media_type = JSONRenderer(), 'application/json'
+            response.renderer_context = {}
+            response.render()
+        return response
+
+    return call
+
+
+@case('exceptions.not_authenticated')
+def _not_authenticated():
+    return _exception_case(exceptions.NotAuthenticated)
+
+
+@case('exceptions.not_found')
+def _not_found():
+    return _exception_case(Http404)
+
+
+@case('exceptions.validation')
+def _validation():
+    return _exception_case(lambda: exceptions.ValidationError({'email': ['Enter a valid email address.']}))
+
+
+# # validators
+
+@case('validators.file_size')
+def _file_size():
+    validator, small, large = FileSizeValidator(1024 * 1024), ContentFile(b'x' * 10), ContentFile(b'x' * 2048)
+    strict = FileSizeValidator(1024)
+
+    def call():
+        validator(small)
+        try:
+            strict(large)
+        except DjangoValidationError:
+            pass
+
+    return call
+
+
+@case('validators.phone')
+def _phone():
+    validator = AccountIdentityPhoneValidator()
+
+    def call():
+        validator('79991234567')
+        try:
+            validator('+7 (999) 123')
+        except DjangoValidationError:
+            pass
+
+    return call
+
+
+def _calibrate(func: Callable, min_time: float) -> int:
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - started >= min_time:
+            return loops
+        loops *= 2
+
+
+def run(setup: Callable, rounds: int, min_time: float) -> dict:
+    func = setup()
+    func()  # warm caches, lazy imports
+    loops = _calibrate(func, min_time)
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(loops):
+                func()
+            timings.append((time.perf_counter() - started) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    median = statistics.median(timings)
+    return {
+        'median_us': round(median * 1e6, 3),
+        'min_us': round(min(timings) * 1e6, 3),
+        'stddev_pct': round(statistics.pstdev(timings) / median * 100, 1),
+        'loops': loops,
+    }
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--min-time', type=float, default=0.01, help='seconds per round, at least')
+    parser.add_argument('-k', dest='select', default='', help='only cases whose name contains this')
+    add_arguments(parser, metrics=['min_us'])
+    args = parser.parse_args()
+
+    results = {name: run(setup, args.rounds, args.min_time) for name, setup in CASES.items() if args.select in name}
+    finish({'micro': results}, args)
+
+
+if __name__ == '__main__':
+    main_()
@@ -0,0 +1,96 @@
+"""
+Outbound email: request-side latency and delivery throughput, old synchronous SMTP backend
+(one connection per send, as djoser's emails did) against the queued backend + outbox worker.
+Both talk to the local stand-in server (api/tests/smtp.py) started in process.
+
+Run against a scratch database (the project settings and .env are used), after migrations:
+    python benchmarks/outbox_throughput.py --messages 2000 --connect-delay 0.2
+Also checks the failure paths: 550 -> dead, 451 -> retry.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mainapp.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.mail import EmailMessage, get_connection  # noqa: E402
+
+from api.core.utils.outbox import OutboxWorker  # noqa: E402
+from api.models import OutboxEmail  # noqa: E402
+from api.tests.smtp import SMTPSink  # noqa: E402
+
+SUBJECT = 'outbox-bench'
+
+
+def _message(i: int, to: str = None) -> EmailMessage:
+    return EmailMessage(SUBJECT, f'Password reset link {i}\n' * 20, 'noreply@example.com',
+                        [to or f'user{i}@example.com'])
+
+
+def _smtp(sink: SMTPSink) -> dict:
+    return {'host': '127.0.0.1', 'port': sink.port, 'use_tls': False, 'use_ssl': False,
+            'username': '', 'password': ''}
+
+
+def synchronous(sink: SMTPSink, messages: int) -> dict:
+    connection = get_connection('django.core.mail.backends.smtp.EmailBackend', **_smtp(sink))
+    started = time.perf_counter()
+    for i in range(messages):
+        connection.send_messages([_message(i)])  # opens and closes a connection per call
+    elapsed = time.perf_counter() - started
+    return {'per_request_ms': round(elapsed / messages * 1000, 2), 'messages_per_s': round(messages / elapsed, 1)}
+
+
+def queued(sink: SMTPSink, messages: int, batch: int) -> dict:
+    connection = get_connection('api.core.utils.outbox.QueuedEmailBackend')
+    started = time.perf_counter()
+    for i in range(messages):
+        connection.send_messages([_message(i)])
+    enqueue = time.perf_counter() - started
+    before = sink.connections
+    started = time.perf_counter()
+    total = OutboxWorker(batch=batch, **_smtp(sink)).run(once=True)
+    drain = time.perf_counter() - started
+    return {'per_request_ms': round(enqueue / messages * 1000, 2), 'messages_per_s': round(total['sent'] / drain, 1),
+            'smtp_connections': sink.connections - before, **total}
+
+
+def failures(sink: SMTPSink) -> dict:
+    connection = get_connection('api.core.utils.outbox.QueuedEmailBackend')
+    connection.send_messages([_message(0, 'reject@example.com'), _message(1, 'busy@example.com')])
+    total = OutboxWorker(**_smtp(sink)).run(once=True)
+    rows = OutboxEmail.objects.filter(subject=SUBJECT).order_by('-id')[:2]
+    return {**total, 'states': {row.recipients[0]: row.status for row in rows}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--sync-messages', type=int, default=200, help='the old path is slow, fewer sends')
+    parser.add_argument('--batch', type=int, default=100)
+    parser.add_argument('--connect-delay', type=float, default=0.2, help='seconds, models tls handshake + login')
+    args = parser.parse_args()
+
+    sink = SMTPSink(connect_delay=args.connect_delay).start()
+    OutboxEmail.objects.filter(subject=SUBJECT).delete()
+    try:
+        result = {
+            'synchronous_smtp': synchronous(sink, args.sync_messages),
+            'queued_outbox': queued(sink, args.messages, args.batch),
+            'failures': failures(sink),
+        }
+    finally:
+        OutboxEmail.objects.filter(subject=SUBJECT).delete()
+        sink.shutdown()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Scenario load test: seeds users, categories, companies and messages (with their inbox rows), then drives the
+main endpoints through the whole middleware / DRF stack in process as seeded users and records per endpoint
+p50 / p95 / p99 latency, queries per request and memory allocated per request (tracemalloc peak).
+
+Run against a scratch database (the project settings and .env are used), after migrations and
+`manage.py install_search`:
+    python benchmarks/scenarios.py --requests 200
+    python benchmarks/scenarios.py --skip-seed --baseline benchmarks/baselines/scenarios.json
+    python benchmarks/scenarios.py --cleanup
+Seeded users have emails ending with @load-bench.invalid, companies activity = 'load-bench', categories are
+named load-bench-*. Rate limits are off during the run.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mainapp.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.apps import apps  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext, override_settings  # noqa: E402
+
+from benchmarks.baseline import add_arguments, finish  # noqa: E402
+from benchmarks.inbox_10m import COUNTERS_SQL, INBOX_SQL  # noqa: E402
+from benchmarks.search_1m import CITIES, PREFIXES, SEED_SQL as COMPANIES_SQL, SUFFIXES, WORDS  # noqa: E402
+
+DOMAIN = '@load-bench.invalid'
+MARKER = 'load-bench'
+SEED_CHUNK = 100000
+
+USERS_SQL = """
+    INSERT INTO api_user (password, last_login, is_superuser, id, email, fullname, telephone, role, is_active,
+                          is_staff, created_at, updated_at, image, balance)
+    SELECT '', NULL, false, md5('load-bench' || g::text)::uuid, 'user' || g::text || %(domain)s,
+           'bench ' || g::text, '', 'user', true, false, now(), now(), NULL, 0
+    FROM generate_series(1, %(users)s) g
+    ON CONFLICT DO NOTHING
+"""
+
+COMPANY_CATEGORIES_SQL = """
+    INSERT INTO api_companyinfo_category (companyinfo_id, category_id)
+    SELECT c.id, (%(categories)s::uuid[])[1 + (random() * (array_length(%(categories)s::uuid[], 1) - 1))::int]
+    FROM api_companyinfo c WHERE c.activity = %(marker)s
+    ON CONFLICT DO NOTHING
+"""
+
+# a month of messages between seeded users
+MESSAGES_SQL = """
+    INSERT INTO api_messages (id, created_at, updated_at, message_text, from_id_id, whom_id_id)
+    SELECT md5('load-bench-message' || g::text)::uuid, ts, ts, 'bench message ' || g::text,
+           md5('load-bench' || (1 + (random() * (%(users)s - 1))::int)::text)::uuid,
+           md5('load-bench' || (1 + (random() * (%(users)s - 1))::int)::text)::uuid
+    FROM generate_series(%(start)s, %(stop)s) g,
+         LATERAL (SELECT now() - random() * interval '30 days' AS ts) t
+    ON CONFLICT DO NOTHING
+"""
+
+
+def _percentiles(timings: List[float]) -> dict:
+    ms = sorted(t * 1000 for t in timings)
+    return {f'p{q}_ms': round(ms[min(len(ms) - 1, int(len(ms) * q / 100))], 2) for q in (50, 95, 99)}
+
+
+def seed(users: int, categories: int, companies: int, messages: int) -> dict:
+    Category = apps.get_model('api', 'Category')
+    timings = {}
+    started = time.perf_counter()
+    Category.objects.bulk_create([Category(name=f'{MARKER}-{i}') for i in range(categories)])
+    category_ids = [str(pk) for pk in Category.objects.filter(name__startswith=f'{MARKER}-').values_list('id', flat=True)]
+    with connection.cursor() as cursor:
+        cursor.execute(USERS_SQL, {'domain': DOMAIN, 'users': users})
+        cursor.execute('SELECT id FROM api_user WHERE email LIKE %s ORDER BY id LIMIT 1', [f'%{DOMAIN}'])
+        owner = cursor.fetchone()[0]
+        params = {'marker': MARKER, 'owner': owner, 'prefixes': PREFIXES, 'suffixes': SUFFIXES, 'words': WORDS,
+                  'cities': CITIES}
+        for start in range(1, companies + 1, SEED_CHUNK):
+            cursor.execute(COMPANIES_SQL, dict(params, start=start, stop=min(start + SEED_CHUNK - 1, companies)))
+        cursor.execute(COMPANY_CATEGORIES_SQL, {'categories': category_ids, 'marker': MARKER})
+        for start in range(1, messages + 1, SEED_CHUNK):
+            cursor.execute(MESSAGES_SQL, {'users': users, 'start': start, 'stop': min(start + SEED_CHUNK - 1, messages)})
+        cursor.execute(INBOX_SQL, {'like': f'%{DOMAIN}'})
+        cursor.execute(COUNTERS_SQL)
+        for table in ('api_user', 'api_companyinfo', 'api_messages', 'api_inboxentry'):
+            cursor.execute(f'ANALYZE {table}')
+    timings['seed_s'] = round(time.perf_counter() - started, 1)
+    return timings
+
+
+def cleanup() -> dict:
+    users = 'SELECT id FROM api_user WHERE email LIKE %s'
+    companies = 'SELECT id FROM api_companyinfo WHERE activity = %s'
+    deleted = {}
+    with connection.cursor() as cursor:
+        for table, column, subquery, param in (
+            ('api_companyinfo_category', 'companyinfo_id', companies, MARKER),
+            ('api_companyinfo', 'id', companies, MARKER),
+            ('api_inboxentry', 'recipient_id', users, f'%{DOMAIN}'),
+            ('api_inboxcounter', 'user_id', users, f'%{DOMAIN}'),
+            ('api_messages', 'whom_id_id', users, f'%{DOMAIN}'),
+            ('api_messages', 'from_id_id', users, f'%{DOMAIN}'),
+            ('api_user', 'id', users, f'%{DOMAIN}'),
+        ):
+            cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({subquery})', [param])
+            deleted[table] = deleted.get(table, 0) + cursor.rowcount
+        cursor.execute('DELETE FROM api_category WHERE name LIKE %s', [f'{MARKER}-%'])
+        deleted['api_category'] = cursor.rowcount
+    return deleted
+
+
+def _typo(word: str) -> str:
+    i = random.randrange(1, len(word))
+    return word[:i - 1] + word[i:]
+
+
+# endpoint -> path of the next request (randomized query), requests are sent as a seeded user
+SCENARIOS: Dict[str, Callable[[], str]] = {
+    'health_live': lambda: '/health/live/',
+    'search_companies': lambda: f'/search/companies/?q={random.choice(WORDS)}',
+    'search_suggest': lambda: f'/search/suggest/?q={_typo(random.choice(PREFIXES) + random.choice(SUFFIXES))}',
+    'inbox_page': lambda: '/inbox/',
+    'inbox_unread': lambda: '/inbox/unread/',
+    'messages_feed': lambda: '/messages/feed/?timeout=0',
+}
+
+
+def run(name: str, clients: List[Client], requests: int, memory_samples: int) -> dict:
+    path = SCENARIOS[name]
+    timings, queries, statuses = [], 0, set()
+    for i in range(requests):
+        client = clients[i % len(clients)]
+        url = path()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append(time.perf_counter() - started)
+        queries += len(captured.captured_queries)
+        statuses.add(response.status_code)
+    peaks = []
+    for i in range(memory_samples):  # separate pass, tracing slows the requests down
+        tracemalloc.start()
+        clients[i % len(clients)].get(path())
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    result = _percentiles(timings)
+    result.update({
+        'queries_per_request': round(queries / requests, 2),
+        'alloc_peak_kib': round(max(peaks) / 1024, 1) if peaks else None,
+        'status_codes': sorted(statuses),
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--categories', type=int, default=200)
+    parser.add_argument('--companies', type=int, default=20000)
+    parser.add_argument('--messages', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=200, help='per endpoint')
+    parser.add_argument('--clients', type=int, default=20, help='distinct logged in users')
+    parser.add_argument('--memory-samples', type=int, default=5)
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--skip-seed', action='store_true')
+    parser.add_argument('--cleanup', action='store_true')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.cleanup:
+        print(json.dumps(cleanup(), indent=2))
+        return
+
+    seeded = {} if args.skip_seed else seed(args.users, args.categories, args.companies, args.messages)
+    random.seed(0)
+    users = list(get_user_model().objects.filter(email__endswith=DOMAIN).order_by('pk')[:args.clients])
+    with override_settings(THROTTLE_RATES={}):
+        clients = []
+        for user in users:
+            client = Client()
+            client.force_login(user)
+            clients.append(client)
+        for client in clients:  # first request of a worker: url resolver, lazy imports, connection
+            client.get('/health/live/')
+        results = {name: run(name, clients, args.requests, args.memory_samples) for name in args.scenarios}
+    results['max_rss_kib'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    finish({'scenarios': results, 'seed': seeded}, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Company search at scale: seeds synthetic companies (default 1M) into api_companyinfo and compares
+the old ILIKE scan with the tsvector ranked search and the trigram suggestions.
+
+Run against a scratch database (the project settings and .env are used), after `manage.py install_search`:
+    python benchmarks/search_1m.py --rows 1000000 --queries 50
+    python benchmarks/search_1m.py --skip-seed --queries 50      # reuse seeded rows
+    python benchmarks/search_1m.py --cleanup                     # delete seeded rows
+Seeded rows are marked with activity = 'search-bench'.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mainapp.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from api.views.search.service import search_companies, suggest  # noqa: E402
+
+MARKER = 'search-bench'
+SEED_CHUNK = 100000
+PREFIXES = ['Строй', 'Торг', 'Мед', 'Авто', 'Агро', 'Пром', 'Инвест', 'Тех', 'Энерго', 'Транс',
+            'Газ', 'Нефте', 'Спец', 'Гео', 'Электро', 'Сиб', 'Урал', 'Волга', 'Нева', 'Дон']
+SUFFIXES = ['сервис', 'маш', 'комплект', 'снаб', 'монтаж', 'проект', 'ресурс', 'логистик', 'систем', 'холдинг']
+WORDS = ['поставки', 'оборудования', 'ремонт', 'строительство', 'доставка', 'производство', 'металл',
+         'бетон', 'кабель', 'насосы', 'станки', 'упаковка', 'мебель', 'окна', 'кровля', 'изоляция']
+CITIES = ['Москва', 'Санкт-Петербург', 'Казань', 'Новосибирск', 'Екатеринбург', 'Самара', 'Пермь', 'Омск']
+
+SEED_SQL = """
+    INSERT INTO api_companyinfo (id, created_at, updated_at, name, description, keys_words, video, city, "index",
+                                 metro, place_work, time_work, telephone, site, email, qty, activity, requisites,
+                                 owner_id)
+    SELECT md5(random()::text || g::text)::uuid, now(), now(),
+           p[1 + (random() * (array_length(p, 1) - 1))::int] || s[1 + (random() * (array_length(s, 1) - 1))::int]
+               || ' ' || g::text,
+           '<p>' || w[1 + (random() * (array_length(w, 1) - 1))::int] || ' '
+               || w[1 + (random() * (array_length(w, 1) - 1))::int] || ' и '
+               || w[1 + (random() * (array_length(w, 1) - 1))::int] || '</p>',
+           w[1 + (random() * (array_length(w, 1) - 1))::int] || ', ' || w[1 + (random() * (array_length(w, 1) - 1))::int],
+           NULL, c[1 + (random() * (array_length(c, 1) - 1))::int], '000000', NULL, 'офис', '9-18', '', '', '',
+           0, %(marker)s, '{}'::jsonb, %(owner)s
+    FROM generate_series(%(start)s, %(stop)s) g,
+         (SELECT %(prefixes)s::text[] AS p, %(suffixes)s::text[] AS s, %(words)s::text[] AS w,
+                 %(cities)s::text[] AS c) arrays
+"""
+
+ILIKE_SQL = """
+    SELECT id, name FROM api_companyinfo
+    WHERE name ILIKE %(like)s OR keys_words ILIKE %(like)s OR description ILIKE %(like)s OR city ILIKE %(like)s
+    LIMIT 50
+"""
+
+
+def _stats(timings: list) -> dict:
+    ms = sorted(t * 1000 for t in timings)
+    return {'median_ms': round(statistics.median(ms), 2), 'p95_ms': round(ms[max(0, int(len(ms) * 0.95) - 1)], 2)}
+
+
+def _timed(func, queries: list) -> list:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _typo(word: str) -> str:
+    i = random.randrange(1, len(word))
+    return word[:i - 1] + word[i:]  # one dropped letter
+
+
+def seed(rows: int, owner: str):
+    params = {'marker': MARKER, 'owner': owner, 'prefixes': PREFIXES, 'suffixes': SUFFIXES, 'words': WORDS,
+              'cities': CITIES}
+    started = time.perf_counter()
+    with connection.cursor() as cursor:
+        for start in range(1, rows + 1, SEED_CHUNK):  # the search trigger fills vectors on insert
+            cursor.execute(SEED_SQL, dict(params, start=start, stop=min(start + SEED_CHUNK - 1, rows)))
+            sys.stderr.write(f'\rseeded {min(start + SEED_CHUNK - 1, rows)}')
+        cursor.execute('ANALYZE api_companyinfo')
+    sys.stderr.write('\n')
+    return round(time.perf_counter() - started, 1)
+
+
+def plan(sql: str, params: dict) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN ' + sql, params)
+        return ' / '.join(row[0].strip() for row in cursor.fetchall()[:3])
+
+
+def ilike(word: str):
+    with connection.cursor() as cursor:
+        cursor.execute(ILIKE_SQL, {'like': f'%{word}%'})
+        return cursor.fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--owner', default=None, help='api_user id owning seeded rows, default the first user')
+    parser.add_argument('--skip-seed', action='store_true')
+    parser.add_argument('--cleanup', action='store_true')
+    args = parser.parse_args()
+
+    if args.cleanup:
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM api_companyinfo WHERE activity = %s', [MARKER])
+            print(json.dumps({'deleted': cursor.rowcount}))
+        return
+
+    result = {}
+    if not args.skip_seed:
+        owner = args.owner
+        if owner is None:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT id FROM api_user ORDER BY id LIMIT 1')
+                owner = cursor.fetchone()[0]
+        result['seed_s'] = seed(args.rows, owner)
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT count(*) FROM api_companyinfo')
+        result['companies'] = cursor.fetchone()[0]
+
+    random.seed(0)
+    words = [random.choice(WORDS) for _ in range(args.queries)]
+    typos = [_typo(random.choice(PREFIXES) + random.choice(SUFFIXES)) for _ in range(args.queries)]
+    result.update({
+        'ilike_scan': _stats(_timed(ilike, words)),
+        'ilike_plan': plan(ILIKE_SQL, {'like': f'%{words[0]}%'}),
+        'ranked_search': _stats(_timed(search_companies, words)),
+        'suggest_with_typo': _stats(_timed(suggest, typos)),
+        'suggest_example': {typos[0]: [s['name'] for s in suggest(typos[0], 5)]},
+    })
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
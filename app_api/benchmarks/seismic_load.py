@@ -0,0 +1,89 @@
+"""
+Concurrent analysts browsing one survey through the gather API.
+
+Every client scrubs through random gathers (decimated to a screen sized slice) for `--duration`
+seconds, revisiting some of them with If-None-Match as a browser cache would. Reports throughput,
+latency percentiles, bytes transferred and the share of 304 answers.
+
+Usage: python benchmarks/seismic_load.py --url http://localhost:8125/seismic/<file id>/ \
+           --token <auth token> --clients 50 --duration 30 --dtype float16
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+import aiohttp
+
+
+async def _client(session: aiohttp.ClientSession, url: str, gathers: int, params: dict, deadline: float,
+                  revisit: float, results: list):
+    etags = {}
+    while time.perf_counter() < deadline:
+        if etags and random.random() < revisit:
+            gather = random.choice(list(etags))
+            headers = {'If-None-Match': etags[gather]}
+        else:
+            gather = random.randrange(gathers)
+            headers = {}
+        start = time.perf_counter()
+        try:
+            async with session.get(f'{url}gathers/{gather}/data/', params=params, headers=headers) as response:
+                body = await response.read()
+                if response.status == 200:
+                    etags[gather] = response.headers.get('ETag', '')
+                results.append((response.status, time.perf_counter() - start, len(body)))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            results.append((type(exc).__name__, time.perf_counter() - start, 0))
+
+
+async def run(url: str, token: str, clients: int, duration: float, params: dict, revisit: float) -> dict:
+    headers = {'Authorization': f'Token {token}'} if token else {}
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+        async with session.get(url, params={'limit': 1}) as response:
+            gathers = (await response.json())['data']['n_gathers']
+        results = []
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*[
+            _client(session, url, gathers, params, deadline, revisit, results) for _ in range(clients)
+        ])
+
+    latencies = sorted(elapsed for status, elapsed, _ in results if status in (200, 304))
+    statuses = {}
+    for status, _, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'url': url,
+        'clients': clients,
+        'params': params,
+        'requests': len(results),
+        'rps': round(len(results) / duration, 1),
+        'statuses': statuses,
+        'not_modified_share': round(statuses.get('304', 0) / len(results), 3) if results else None,
+        'median_ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2) if latencies else None,
+        'mb_transferred': round(sum(size for _, _, size in results) / 1024 / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', required=True, help='seismic file url, ending with /')
+    parser.add_argument('--token', default='')
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--dtype', default='float16', choices=['float32', 'float16'])
+    parser.add_argument('--max-traces', type=int, default=1000)
+    parser.add_argument('--max-samples', type=int, default=800)
+    parser.add_argument('--revisit', type=float, default=0.3, help='share of requests for already seen gathers')
+    args = parser.parse_args()
+    params = {'dtype': args.dtype, 'max_traces': args.max_traces, 'max_samples': args.max_samples}
+    result = asyncio.run(run(args.url, args.token, args.clients, args.duration, params, args.revisit))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Cold start and requests/sec of the dev server versus the preforking production modes.
+
+Each mode is started from scratch, the time until /health/ready/ answers 200 is the cold start,
+then `--concurrency` clients hammer `--path` for `--duration` seconds.
+
+Usage (from app_api/, database reachable): python benchmarks/server_compare.py --modes dev wsgi asgi
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import aiohttp
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _command(mode: str, port: int) -> list:
+    if mode == 'dev':  # what entrypoint.sh used to serve with
+        return [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{port}', '--noreload']
+    return [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py',
+            '--bind', f'127.0.0.1:{port}', '--access-logfile', '', f'mainapp.{mode}:application']
+
+
+def _wait_ready(url: str, deadline: float) -> bool:
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    return False
+
+
+async def _throughput(url: str, concurrency: int, duration: float) -> dict:
+    count = 0
+    errors = 0
+    stop_at = time.monotonic() + duration
+
+    async def client(session):
+        nonlocal count, errors
+        while time.monotonic() < stop_at:
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                    if response.status < 500:
+                        count += 1
+                    else:
+                        errors += 1
+            except aiohttp.ClientError:
+                errors += 1
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+        await asyncio.gather(*[client(session) for _ in range(concurrency)])
+    return {'requests': count, 'errors': errors, 'rps': round(count / duration, 1)}
+
+
+def bench_mode(mode: str, port: int, path: str, concurrency: int, duration: float) -> dict:
+    env = dict(os.environ, SERVER_MODE=mode if mode != 'dev' else '')
+    start = time.monotonic()
+    proc = subprocess.Popen(_command(mode, port), cwd=APP_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f'http://127.0.0.1:{port}'
+        if not _wait_ready(f'{base}/health/ready/', start + 60):
+            return {'mode': mode, 'error': 'not ready after 60s'}
+        result = {'mode': mode, 'cold_start_s': round(time.monotonic() - start, 3)}
+        result.update(asyncio.run(_throughput(base + path, concurrency, duration)))
+        return result
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', nargs='+', default=['dev', 'wsgi', 'asgi'], choices=['dev', 'wsgi', 'asgi'])
+    parser.add_argument('--port', type=int, default=8190)
+    parser.add_argument('--path', default='/health/live/')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=15)
+    args = parser.parse_args()
+
+    results = [bench_mode(mode, args.port, args.path, args.concurrency, args.duration) for mode in args.modes]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Session traffic per request: database writes and django_session reads of typical requests with django's
+SessionMiddleware and the db engine (before) against api.core.api.sessions over cached_db (after).
+
+    token_api        Token header, the client also holds a session cookie, a middleware looks at request.user
+                     before the view (logging, debug toolbar)
+    browser_page     session login, the view stores the same value in the session on every request
+    browser_read     session login, the view only reads the session
+    login            repeated password login of the same user (same session content)
+
+Standalone, sqlite in memory, local memory cache:
+    python benchmarks/session_writes.py [--requests 200]
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+BEFORE = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'MIDDLEWARE': [
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        '__main__.ReadUserMiddleware',
+    ],
+}
+AFTER = {
+    'SESSION_ENGINE': 'api.core.api.sessions',
+    'MIDDLEWARE': ['api.core.api.sessions.SessionMiddleware'] + BEFORE['MIDDLEWARE'][1:],
+}
+
+settings.configure(
+    SECRET_KEY='benchmark',
+    ALLOWED_HOSTS=['*'],
+    ROOT_URLCONF='__main__',
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth', 'django.contrib.sessions',
+                    'rest_framework', 'rest_framework.authtoken'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'sessions': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sessions'}},
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],  # the hash is not measured here
+    REST_FRAMEWORK={
+        'DEFAULT_AUTHENTICATION_CLASSES': ['rest_framework.authentication.TokenAuthentication',
+                                           'rest_framework.authentication.SessionAuthentication'],
+        'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticated'],
+    },
+    SESSION_STORE_BACKEND='django.contrib.sessions.backends.cached_db',
+    SESSION_CACHE_ALIAS='sessions',
+    SESSIONLESS_AUTH_SCHEMES=('Token', 'Bearer', 'JWT', 'Basic'),
+    SESSION_CLEANUP_BATCH=5000,
+    SESSION_CLEANUP_PAUSE=0.0,
+    **BEFORE,
+)
+django.setup()
+
+from django.contrib.auth import authenticate, get_user_model, login  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.http import JsonResponse  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import CaptureQueriesContext, override_settings  # noqa: E402
+from django.urls import path  # noqa: E402
+from django.views.decorators.csrf import csrf_exempt  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+from rest_framework.views import APIView  # noqa: E402
+
+
+class ReadUserMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        authenticated = request.user.is_authenticated
+        response = self.get_response(request)
+        response['X-Authenticated'] = str(authenticated)
+        return response
+
+
+class ApiView(APIView):
+    def get(self, request):
+        return Response({'user': request.user.username})
+
+
+def page(request):
+    request.session['last_section'] = 'catalog'
+    return JsonResponse({'user': request.user.username})
+
+
+def read(request):
+    return JsonResponse({'section': request.session.get('last_section')})
+
+
+@csrf_exempt
+def login_view(request):
+    user = authenticate(request, username='bench', password='secret')
+    login(request, user)
+    return JsonResponse({'user': user.username})
+
+
+urlpatterns = [path('api/', ApiView.as_view()), path('page/', page), path('read/', read), path('login/', login_view)]
+
+
+def _kind(sql: str) -> str:
+    verb = sql.lstrip().split(' ', 1)[0].upper()
+    if verb in ('BEGIN', 'SAVEPOINT', 'RELEASE', 'COMMIT', 'ROLLBACK'):
+        return 'transaction'
+    if verb in ('INSERT', 'UPDATE', 'DELETE'):
+        return 'writes'
+    return 'session_reads' if 'django_session' in sql else 'other_reads'
+
+
+def run(config: dict, requests: int, token: str) -> dict:
+    results = {}
+    with override_settings(**config):
+        scenarios = {
+            'token_api': ('get', '/api/', {'HTTP_AUTHORIZATION': f'Token {token}'}),
+            'browser_page': ('get', '/page/', {}),
+            'browser_read': ('get', '/read/', {}),
+            'login': ('post', '/login/', {}),
+        }
+        for name, (method, url, headers) in scenarios.items():
+            client = Client()
+            client.post('/login/')  # the session cookie every scenario carries
+            counts = Counter()
+            for _ in range(requests):
+                with CaptureQueriesContext(connection) as captured:
+                    response = getattr(client, method)(url, **headers)
+                assert response.status_code == 200, (name, response.status_code)
+                counts.update(_kind(query['sql']) for query in captured.captured_queries)
+            results[name] = {kind: round(counts[kind] / requests, 2)
+                             for kind in ('writes', 'session_reads', 'other_reads')}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    user = get_user_model().objects.create_user('bench', password='secret')
+    token = Token.objects.create(user=user).key
+    print(json.dumps({'per_request_before': run(BEFORE, args.requests, token),
+                      'per_request_after': run(AFTER, args.requests, token)}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
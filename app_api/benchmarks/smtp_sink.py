@@ -0,0 +1,36 @@
+"""
+Local stand-in SMTP server for the outbox (api/tests/smtp.py): accepts and counts messages, no TLS, no delivery.
+
+    python benchmarks/smtp_sink.py --port 2525 --connect-delay 0.3
+
+Then run the worker against it:
+    SMTP_HOST=127.0.0.1 EMAIL_HOST_PORT=2525 EMAIL_USE_TLS=False python manage.py send_outbox
+
+--connect-delay models the TLS handshake + login of a real server (paid once per connection),
+recipients starting with "reject" get 550 (dead letter), starting with "busy" get 451 (retry).
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.tests.smtp import SMTPSink  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2525)
+    parser.add_argument('--connect-delay', type=float, default=0.0)
+    args = parser.parse_args()
+    sink = SMTPSink((args.host, args.port), args.connect_delay)
+    print(f'listening on {args.host}:{sink.port}')
+    try:
+        sink.serve_forever()
+    except KeyboardInterrupt:
+        print(f'{sink.messages} messages over {sink.connections} connections')
+
+
+if __name__ == '__main__':
+    main()
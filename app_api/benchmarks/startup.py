@@ -0,0 +1,68 @@
+"""
+Cold start benchmark: spawns fresh interpreters and measures time to a ready application.
+Results are appended to a JSON lines file so startup time can be tracked over commits.
+
+Usage (from app_api/): python benchmarks/startup.py [--runs 10] [--warmup] [--output startup.jsonl]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BOOT_CODE = (
+    "import os; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mainapp.settings'); "
+    "os.environ['WARMUP_ON_START'] = {warmup!r}; "
+    "from mainapp.wsgi import application"
+)
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=APP_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def measure(runs: int, warmup: bool) -> list:
+    code = BOOT_CODE.format(warmup='True' if warmup else 'False')
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=APP_DIR, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--warmup', action='store_true', help='include the warmup hook in the measured start')
+    parser.add_argument('--output', default='', help='append the result as a json line to this file')
+    args = parser.parse_args()
+
+    timings = measure(args.runs, args.warmup)
+    result = {
+        'revision': _git_revision(),
+        'python': sys.version.split()[0],
+        'warmup': args.warmup,
+        'runs': args.runs,
+        'min_ms': min(timings) * 1000,
+        'median_ms': statistics.median(timings) * 1000,
+        'max_ms': max(timings) * 1000,
+    }
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(result) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Credential stuffing benchmark: a flood of wrong-password Basic auth requests from a few addresses through
+the middleware stack, without and with RateLimitMiddleware. Reports requests/s, process CPU per request,
+password hashes computed and the status codes, plus the latency of a legitimate user on another address
+during the flood (the flood must not slow it down or lock it out).
+
+Standalone, sqlite in memory, buckets in process:
+    python benchmarks/throttle_load.py [--requests 300] [--attackers 3]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+]
+
+settings.configure(
+    SECRET_KEY='benchmark',
+    ALLOWED_HOSTS=['*'],
+    ROOT_URLCONF='__main__',
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth', 'django.contrib.sessions', 'rest_framework'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    MIDDLEWARE=MIDDLEWARE,
+    REST_FRAMEWORK={
+        'EXCEPTION_HANDLER': 'api.core.api.expections.custom_exception_handler',
+        'DEFAULT_AUTHENTICATION_CLASSES': ['rest_framework.authentication.BasicAuthentication'],
+        'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticated'],
+        'DEFAULT_THROTTLE_CLASSES': ['api.core.api.throttling.UserRateThrottle'],
+    },
+    THROTTLE_STORE_URL='memory://',
+    THROTTLE_RATES={'ip': '600/min', 'auth': '20/min', 'credentials': '10/min', 'anon': '120/min', 'user': '1200/min'},
+    THROTTLE_PATH_RULES=[],
+    THROTTLE_EXEMPT_PATHS='',
+)
+django.setup()
+
+from django.contrib.auth import base_user, get_user_model, hashers  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import path  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+from rest_framework.views import APIView  # noqa: E402
+
+from api.core.api import throttling  # noqa: E402
+
+
+class PrivateView(APIView):
+    def get(self, request):
+        return Response({'user': request.user.username})
+
+
+urlpatterns = [path('private/', PrivateView.as_view())]
+
+_hashes = Counter()
+_check_password = hashers.check_password
+
+
+def _counting_check_password(*args, **kwargs):
+    _hashes['computed'] += 1
+    return _check_password(*args, **kwargs)
+
+
+def _basic(username: str, password: str) -> str:
+    return 'Basic ' + base64.b64encode(f'{username}:{password}'.encode()).decode()
+
+
+def run(requests: int, attackers: int, middleware: list) -> dict:
+    throttling.get_store().clear()
+    _hashes.clear()
+    client, statuses, legit = Client(), Counter(), []
+    bad, good = _basic('victim', 'guess'), _basic('victim', 'correct horse')
+    with override_settings(MIDDLEWARE=middleware):
+        started, cpu = time.perf_counter(), time.process_time()
+        for i in range(requests):
+            response = client.get('/private/', HTTP_AUTHORIZATION=bad, REMOTE_ADDR=f'203.0.113.{i % attackers + 1}')
+            statuses[response.status_code] += 1
+            if i % 20 == 0:
+                legit_started = time.perf_counter()
+                response = client.get('/private/', HTTP_AUTHORIZATION=good, REMOTE_ADDR='198.51.100.7')
+                legit.append((time.perf_counter() - legit_started) * 1000)
+                statuses[f'legit_{response.status_code}'] += 1
+        elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu
+    legit.sort()
+    return {
+        'requests_per_s': round(requests / elapsed, 1),
+        'cpu_ms_per_request': round(cpu * 1000 / requests, 3),
+        'password_hashes': _hashes['computed'],
+        'statuses': {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        'legit_p50_ms': round(legit[len(legit) // 2], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--attackers', type=int, default=3, help='distinct client addresses of the flood')
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    get_user_model().objects.create_user('victim', password='correct horse')
+    base_user.check_password = _counting_check_password  # what User.check_password calls
+
+    result = {
+        'without_rate_limit': run(args.requests, args.attackers, MIDDLEWARE),
+        'with_rate_limit': run(args.requests, args.attackers,
+                               MIDDLEWARE[:1] + ['api.core.api.throttling.RateLimitMiddleware'] + MIDDLEWARE[1:]),
+    }
+    result['cpu_reduction'] = round(
+        result['without_rate_limit']['cpu_ms_per_request'] / result['with_rate_limit']['cpu_ms_per_request'], 1)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
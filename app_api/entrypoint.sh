@@ -1,8 +1,43 @@
 #! /bin/bash
-python manage.py migrate --no-input
+# usage: entrypoint.sh [dev|migrate|wsgi|asgi|outbox|seismic], defaults to $SERVER_MODE or dev
+MODE="${1:-${SERVER_MODE:-dev}}"
 
-python manage.py makemigrations --no-input
+case "$MODE" in
+    migrate)
+        # one-shot release step, run once per deploy before the servers start; api migrations are generated
+        # here (admin / authtoken depend on them), so a fresh database gets every table and constraint
+        python manage.py makemigrations --no-input
+        python manage.py migrate --no-input
+        python manage.py createcachetable
+        python manage.py install_search
+        python manage.py export_schema
+        ;;
+    wsgi|asgi)
+        # preforking server, see gunicorn.conf.py for workers / threads / recycling
+        export SERVER_MODE="$MODE"
+        exec gunicorn --config gunicorn.conf.py "mainapp.$MODE:application"
+        ;;
+    outbox)
+        # email delivery worker, one per deployment is enough (several are safe, rows are locked)
+        exec python manage.py send_outbox --purge-days 7
+        ;;
+    seismic)
+        # builds the header index and gather cache of uploads, one per deployment
+        exec python manage.py index_seismic --every
+        ;;
+    *)
+        python manage.py migrate --no-input
 
-python manage.py migrate --no-input
+        python manage.py makemigrations --no-input
 
-python manage.py runserver 0.0.0.0:8125
\ No newline at end of file
+        python manage.py migrate --no-input
+
+        python manage.py createcachetable
+
+        python manage.py install_search
+
+        python manage.py export_schema
+
+        python manage.py runserver 0.0.0.0:8125
+        ;;
+esac
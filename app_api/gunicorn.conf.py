@@ -0,0 +1,38 @@
+# gunicorn settings for SERVER_MODE=wsgi / asgi, every value can be overridden from the environment
+import os
+
+
+def _cpu_count() -> int:  # respects container cpu affinity where available
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+CPU_COUNT = _cpu_count()
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+
+bind = os.getenv('BIND', '0.0.0.0:8125')
+
+if SERVER_MODE == 'asgi':
+    worker_class = 'uvicorn.workers.UvicornWorker'
+    workers = int(os.getenv('ASGI_WORKERS', CPU_COUNT))  # one event loop per core
+else:
+    worker_class = 'gthread'
+    workers = int(os.getenv('WEB_WORKERS', CPU_COUNT * 2 + 1))
+    threads = int(os.getenv('WEB_THREADS', 4))  # covers time spent waiting on postgres / smtp
+
+# recycle workers to cap slow memory growth, jitter keeps them from restarting together
+max_requests = int(os.getenv('MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.getenv('MAX_REQUESTS_JITTER', 200))
+
+timeout = int(os.getenv('WORKER_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('KEEPALIVE', 5))
+
+# SIGHUP re-reads this file and replaces workers gracefully; new code is only picked up
+# when the application is imported by the workers, so preload is opt-in
+preload_app = os.getenv('PRELOAD_APP', 'False') == 'True'
+
+accesslog = os.getenv('ACCESS_LOG', '-')
+errorlog = '-'
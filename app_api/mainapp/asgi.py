@@ -14,3 +14,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mainapp.settings')
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_START:  # pay first-request costs before the worker accepts traffic
+    from api.core.utils.warmup import warmup  # noqa: E402
+
+    warmup()
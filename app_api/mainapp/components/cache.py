@@ -0,0 +1,24 @@
+import os
+
+LOCMEM_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+DATABASE_CACHE = 'django.core.cache.backends.db.DatabaseCache'
+
+# the default cache is shared by all workers through the database (table created by `createcachetable` in the
+# migrate step); memcached is faster when deployed, e.g.
+# CACHE_BACKEND=django.core.cache.backends.memcached.PyLibMCCache CACHE_LOCATION=memcached:11211
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', DATABASE_CACHE)
+# sessions already live in django_session, a database cache in front of it would only double the queries
+SESSION_CACHE_BACKEND = os.getenv('SESSION_CACHE_BACKEND', os.getenv('CACHE_BACKEND', LOCMEM_CACHE))
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_cache' if CACHE_BACKEND == DATABASE_CACHE else ''),
+    },
+    'sessions': {
+        'BACKEND': SESSION_CACHE_BACKEND,
+        'LOCATION': os.getenv('SESSION_CACHE_LOCATION', os.getenv('CACHE_LOCATION', 'sessions')),
+        # MAX_ENTRIES is an option of the local memory cache only, memcached clients reject it
+        'OPTIONS': {'MAX_ENTRIES': 100000} if SESSION_CACHE_BACKEND == LOCMEM_CACHE else {},
+    },
+}
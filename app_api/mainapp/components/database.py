@@ -1,4 +1,5 @@
 import os
+import sys
 
 DATABASES = {
     'default': {
@@ -7,6 +8,13 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv("POSTGRES_HOST"),
-        'PORT': os.getenv("POSTGRES_PORT")
+        'PORT': os.getenv("POSTGRES_PORT"),
+        # seconds a connection is reused, instead of a new one per request or long-poll query
+        'CONN_MAX_AGE': int(os.getenv('POSTGRES_CONN_MAX_AGE', 60)),
     },
-}
\ No newline at end of file
+}
+
+# api migrations are generated by the release step (entrypoint.sh migrate), none are committed: the test
+# database of `manage.py test` creates the api tables straight from the models, constraints included
+if sys.argv[1:2] == ['test']:
+    MIGRATION_MODULES = {'api': None}
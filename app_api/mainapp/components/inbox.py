@@ -0,0 +1,3 @@
+INBOX_PAGE_LIMIT = 50
+INBOX_ARCHIVE_AFTER_DAYS = 180  # read entries older than this move to the partitioned history table
+INBOX_ARCHIVE_BATCH = 50000
@@ -0,0 +1,8 @@
+import os
+
+# cache holding the permission version stamp and per-user permission sets; with several workers it must be
+# shared (the database cache by default, or memcached), a process local cache is refused by the api.E001 check
+PERMISSION_CACHE_ALIAS = os.getenv('PERMISSION_CACHE_ALIAS', 'default')
+PERMISSION_CACHE_TIMEOUT = 300  # seconds a permission set read from the database is used, at most
+PERMISSION_VERSION_CHECK_INTERVAL = 1.0  # seconds a worker trusts its copy of the version stamp
+PERMISSION_LOCAL_USERS = 10000  # per-user permission sets kept in process
@@ -1,3 +1,5 @@
+import os
+
 REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -9,5 +11,13 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-    ]
+    ],
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.core.api.throttling.UserRateThrottle',
+        'api.core.api.throttling.ScopedRateThrottle',
+    ],
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),  # reverse proxies in front, client ip taken from X-Forwarded-For
 }
+
+BULK_BATCH_SIZE = 500  # objects per transaction of the bulk create / update views
+BULK_MAX_ITEMS = 100000  # per request, json list or ndjson stream
@@ -0,0 +1,11 @@
+# CKEditor fields rendered at write time (sanitized html + excerpt), see api/core/utils/rich_text.py
+RICH_TEXT_FIELDS = {
+    'api.CompanyInfo': ('description',),
+    'api.News': ('description',),
+    'api.Product': ('description',),
+}
+RICH_TEXT_RENDER_VERSION = 2  # part of the content hash: bump to re-render everything after rule changes
+RICH_TEXT_EXCERPT_CHARS = 300
+RICH_TEXT_IMAGE_WIDTHS = (480, 960, 1600)  # variants of uploaded images, offered with srcset
+RICH_TEXT_IFRAME_HOSTS = ('youtube.com', 'youtube-nocookie.com', 'player.vimeo.com', 'rutube.ru', 'vk.com')
+RICH_TEXT_BACKFILL_BATCH = 500
@@ -0,0 +1,8 @@
+import os
+
+SEARCH_CONFIG = os.getenv('SEARCH_CONFIG', 'russian')  # postgres text search configuration
+SEARCH_PAGE_LIMIT = 50
+SEARCH_MIN_QUERY = 2
+SUGGEST_LIMIT = 10
+SUGGEST_CANDIDATES = 50  # trigram candidates per table, reranked in python
+SEARCH_BACKFILL_BATCH = 10000
@@ -0,0 +1,20 @@
+import os
+import sys
+
+# the `seismic` package lives at the repository root, next to app_api; in the image it has to be
+# copied or mounted and SEISMIC_PACKAGE_DIR pointed at its parent directory
+SEISMIC_PACKAGE_DIR = os.getenv('SEISMIC_PACKAGE_DIR', os.path.dirname(BASE_DIR))  # noqa: F821
+if os.path.isdir(os.path.join(SEISMIC_PACKAGE_DIR, 'seismic')) and SEISMIC_PACKAGE_DIR not in sys.path:
+    sys.path.append(SEISMIC_PACKAGE_DIR)
+
+SEISMIC_UPLOAD_PATH = 'seismic/'
+SEISMIC_EXTENSIONS = ['sgy', 'segy']
+MAX_SEISMIC_SIZE = 64 * 1024 ** 3  # 64 GB
+
+SEISMIC_OPEN_VOLUMES = int(os.getenv('SEISMIC_OPEN_VOLUMES', 16))  # memory mapped surveys kept open per worker
+SEISMIC_GATHER_CACHE_BYTES = int(os.getenv('SEISMIC_GATHER_CACHE_BYTES', 64 * 1024 * 1024))  # per survey
+SEISMIC_MAX_PAYLOAD_BYTES = 64 * 1024 * 1024
+SEISMIC_CACHE_MAX_AGE = 24 * 60 * 60  # gathers of a survey never change, only a new upload does
+SEISMIC_INDEX_EVERY = 10  # seconds between looks for new uploads and SNR jobs of `index_seismic --every`
+# gathers a survey SNR request computes in the request, more are run as a job by the `seismic` worker
+SEISMIC_SNR_MAX_GATHERS = int(os.getenv('SEISMIC_SNR_MAX_GATHERS', 500))
@@ -0,0 +1,19 @@
+import os
+
+SESSION_ENGINE = 'api.core.api.sessions'
+# cached_db: reads from the cache, writes through to django_session (survives a cache restart), only with a
+# shared SESSION_CACHE_BACKEND: over a process local cache another worker keeps serving a session logged out,
+# flushed or cycled elsewhere. db without one (the cache only store needs a shared, persistent cache as well)
+SESSION_STORE_BACKEND = os.getenv('SESSION_STORE_BACKEND', (
+    'django.contrib.sessions.backends.db' if CACHES['sessions']['BACKEND'] == LOCMEM_CACHE  # noqa: F821
+    else 'django.contrib.sessions.backends.cached_db'
+))
+SESSION_CACHE_ALIAS = 'sessions'
+SESSION_SAVE_EVERY_REQUEST = False
+
+# requests with an Authorization header of these schemes get an empty session that is never stored
+SESSIONLESS_AUTH_SCHEMES = ('Token', 'Bearer', 'JWT', 'Basic')
+
+SESSION_CLEANUP_BATCH = 5000  # expired rows per delete of clear_sessions
+SESSION_CLEANUP_PAUSE = 0.05  # seconds between batches
+SESSION_CLEANUP_EVERY = 3600  # seconds between runs of `clear_sessions --every`
@@ -1,8 +1,18 @@
 import os
 
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-EMAIL_USE_TLS = True
+# requests only queue emails, `manage.py send_outbox` delivers them with the smtp settings below
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'api.core.utils.outbox.QueuedEmailBackend')
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST = os.getenv('SMTP_HOST')
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 EMAIL_PORT = os.getenv('EMAIL_HOST_PORT')
+EMAIL_TIMEOUT = 30
+
+OUTBOX_BATCH = 100
+OUTBOX_POLL_INTERVAL = 1.0  # seconds between outbox checks when idle
+OUTBOX_IDLE_CLOSE = 60  # close the smtp connection after this many idle seconds, servers drop it anyway
+OUTBOX_LEASE = 300  # a claimed message is retried after this many seconds if its worker died
+OUTBOX_MAX_ATTEMPTS = 8  # then the message is dead
+OUTBOX_BACKOFF_BASE = 30  # seconds, doubled per attempt
+OUTBOX_BACKOFF_MAX = 3600
@@ -0,0 +1,10 @@
+import os
+
+OPENAPI_SCHEMA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'schema')
+
+SWAGGER_SETTINGS = {
+    'SPEC_URL': 'schema-json',
+}
+REDOC_SETTINGS = {
+    'SPEC_URL': 'schema-json',
+}
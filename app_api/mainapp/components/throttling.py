@@ -0,0 +1,24 @@
+import os
+
+# token buckets: memory:// keeps them per process (dev, tests), redis://host:6379/1 shares them between
+# workers and hosts, the default of the server modes (redis service of docker-compose.yml); memory:// with
+# several workers is refused by the api.E003 check. When the store is unreachable requests are not limited (logged)
+THROTTLE_STORE_URL = os.getenv('THROTTLE_STORE_URL', (
+    'redis://redis:6379/1' if os.getenv('SERVER_MODE') in ('wsgi', 'asgi') else 'memory://'
+))
+
+# scope -> 'N/s|min|hour|day': N is the burst, the bucket refills at N per period
+THROTTLE_RATES = {
+    'ip': os.getenv('THROTTLE_RATE_IP', '600/min'),  # every request, before authentication
+    'auth': os.getenv('THROTTLE_RATE_AUTH', '20/min'),  # login / signup / password reset posts
+    'credentials': os.getenv('THROTTLE_RATE_CREDENTIALS', '10/min'),  # failed password attempts
+    'anon': '120/min',
+    'user': '1200/min',
+}
+
+# (path regex, methods, scope) checked by RateLimitMiddleware, paths without the leading slash
+THROTTLE_PATH_RULES = [
+    (r'^(user|account|api-auth|admin)/.*(login|token|jwt|users/?$|reset_password|set_password|activation)',
+     ('POST',), 'auth'),
+]
+THROTTLE_EXEMPT_PATHS = r'^(health|static|media)/'
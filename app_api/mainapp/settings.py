@@ -10,6 +10,8 @@ SECRET_KEY = os.getenv('SECRET_KEY')
 
 DEBUG = True
 
+WARMUP_ON_START = os.getenv('WARMUP_ON_START', 'False') == 'True'
+
 ALLOWED_HOSTS = ['*']
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -20,7 +22,7 @@ API_APPS = [
 ]
 
 AUTHENTICATION_BACKENDS = (
-    'django.contrib.auth.backends.ModelBackend',
+    'api.core.api.backends.CachedModelBackend',
 )
 
 DJANGO_APP = [
@@ -45,7 +47,8 @@ MIDDLEWARE = [
 
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'api.core.api.throttling.RateLimitMiddleware',
+    'api.core.api.sessions.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -78,12 +81,21 @@ WSGI_APPLICATION = 'mainapp.wsgi.application'
 
 include(
     'components/database.py',
+    'components/cache.py',
     'components/rest.py',
     'components/smtp.py',
     'components/logging.py',
     'components/extensions.py',
     'components/djoser.py',
-    'components/ck_editor.py'
+    'components/ck_editor.py',
+    'components/swagger.py',
+    'components/seismic.py',
+    'components/search.py',
+    'components/inbox.py',
+    'components/permissions.py',
+    'components/rich_text.py',
+    'components/throttling.py',
+    'components/sessions.py',
 )
 
 AUTH_PASSWORD_VALIDATORS = [
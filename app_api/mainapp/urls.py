@@ -16,6 +16,10 @@ urlpatterns = [
                   re_path(r'product/', include('api.views.product.urls')),
                   re_path(r'company/', include('api.views.company.urls')),
                   re_path(r'messages/', include('api.views.messages.urls')),
+                  re_path(r'health/', include('api.views.health.urls')),
+                  re_path(r'seismic/', include('api.views.seismic.urls')),
+                  re_path(r'search/', include('api.views.search.urls')),
+                  re_path(r'inbox/', include('api.views.inbox.urls')),
                   re_path(r'^ckeditor/', include('ckeditor_uploader.urls')),
                   path('admin/', admin.site.urls),
                   path('api-auth/', include('rest_framework.urls')),
@@ -1,20 +1,54 @@
+from functools import lru_cache
+
 from django.urls import path
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
-schema_view = get_schema_view(
-    openapi.Info(
+from api.core.api.schema import is_schema_request, schema_json_view
+
+API_VERSION = 'v1'
+
+
+@lru_cache(maxsize=None)
+def get_api_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
         title="WOS",
-        default_version='v1',
+        default_version=API_VERSION,
         description="Official documentation",
         license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_cached_schema_view():  # drf_yasg is heavy, build the view on first docs request
+    from rest_framework import permissions
+    from drf_yasg.views import get_schema_view
+
+    return get_schema_view(
+        get_api_info(),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+
+
+@lru_cache(maxsize=None)
+def _ui_view(renderer: str):
+    # ui pages are rendered without introspection, the spec itself comes from schema_json_view
+    return get_cached_schema_view().with_ui(renderer, cache_timeout=0)
+
+
+def lazy_ui_view(renderer: str):
+    def view(request, *args, **kwargs):
+        if is_schema_request(request):  # ?format=openapi from clients polling the ui url
+            return schema_json_view(request)
+        return _ui_view(renderer)(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    return view
+
 
 urlpatterns = [
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('swagger.json', schema_json_view, name='schema-json'),
+    path('swagger/', lazy_ui_view('swagger'), name='schema-swagger-ui'),
+    path('redoc/', lazy_ui_view('redoc'), name='schema-redoc'),
 ]
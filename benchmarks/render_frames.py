@@ -0,0 +1,82 @@
+"""
+Frame time when scrubbing through gathers: the old approach (new figure + imshow of the full gather
+per event) versus GatherRenderer (one figure, decimated cached tiles, set_data).
+
+Usage (from the repo root): python -m benchmarks.render_frames [--traces 2000] [--samples 1500] [--frames 50]
+"""
+import argparse
+import json
+import statistics
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import numpy as np  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+
+from seismic.render import GatherRenderer  # noqa: E402
+
+FIGSIZE = (9.5, 6.5)
+
+
+def _stats(timings: list) -> dict:
+    ms = sorted(t * 1000 for t in timings)
+    return {'median_ms': round(statistics.median(ms), 2), 'p95_ms': round(ms[int(len(ms) * 0.95) - 1], 2)}
+
+
+def old_frames(gathers: list, order: list) -> list:
+    timings = []
+    for i in order:
+        start = time.perf_counter()
+        figure = Figure(figsize=FIGSIZE)
+        canvas = FigureCanvasAgg(figure)
+        axes = figure.add_subplot(111)
+        gather = gathers[i]
+        axes.imshow(gather.T, aspect='auto', cmap='seismic', vmin=np.min(gather), vmax=np.max(gather))
+        axes.set_title(f'CDP gather №{i}')
+        canvas.draw()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def renderer_frames(renderer: GatherRenderer, gathers: list, order: list, gain: float = 1.0) -> list:
+    timings = []
+    for i in order:
+        start = time.perf_counter()
+        renderer.show(i, gathers[i], gain=gain, transpose=True, title=f'CDP gather №{i}')
+        renderer.figure.canvas.flush_events()  # agg draws synchronously, qt would paint here
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--traces', type=int, default=2000)
+    parser.add_argument('--samples', type=int, default=1500)
+    parser.add_argument('--gathers', type=int, default=10)
+    parser.add_argument('--frames', type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    gathers = [rng.standard_normal((args.traces, args.samples)).astype(np.float32) for _ in range(args.gathers)]
+    order = [int(i) for i in rng.integers(0, args.gathers, args.frames)]
+
+    figure = Figure(figsize=FIGSIZE)
+    FigureCanvasAgg(figure)
+    renderer = GatherRenderer(figure.add_subplot(111))
+    cold = renderer_frames(renderer, gathers, list(range(args.gathers)))
+    warm = renderer_frames(renderer, gathers, order)
+
+    print(json.dumps({
+        'gather_shape': [args.traces, args.samples],
+        'old_full_redraw': _stats(old_frames(gathers, order[:10])),
+        'renderer_first_view': _stats(cold),
+        'renderer_cached': _stats(warm),
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Cold vs warm open of a survey: full in-memory load, lazy SeismicVolume, sidecar cache build (cold)
+and sidecar cache reopen (warm), plus the time to the first gather on screen.
+
+Usage (from the repo root): python -m benchmarks.seismic_open [--path survey.sgy] [--gathers 200] [--traces 500]
+Without --path a synthetic survey is generated in a temporary directory.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import make_segy
+from seismic.cache import cache_dir_for, open_volume
+from seismic.loader import load_segy
+from seismic.volume import SeismicVolume
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, round((time.perf_counter() - start) * 1000, 2)
+
+
+def run(path: str, repeats: int) -> dict:
+    results = {'path': path, 'size_mb': round(os.path.getsize(path) / 2 ** 20, 1)}
+
+    _, results['full_load_ms'] = _timed(lambda: load_segy(path))
+
+    volume, results['lazy_open_ms'] = _timed(lambda: SeismicVolume(path))
+    _, results['lazy_first_gather_ms'] = _timed(lambda: volume[0])
+    volume.close()
+
+    shutil.rmtree(cache_dir_for(path), ignore_errors=True)
+    volume, results['cache_cold_open_ms'] = _timed(lambda: open_volume(path))
+    volume.close()
+
+    warm = []
+    for _ in range(repeats):
+        volume, elapsed = _timed(lambda: open_volume(path))
+        warm.append(elapsed)
+        _, results['cache_warm_first_gather_ms'] = _timed(lambda: volume[0])
+        volume.close()
+    results['cache_warm_open_ms'] = min(warm)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--path', default='')
+    parser.add_argument('--gathers', type=int, default=200)
+    parser.add_argument('--traces', type=int, default=500)
+    parser.add_argument('--samples', type=int, default=1500)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.path:
+        print(json.dumps(run(args.path, args.repeats), indent=2))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_segy(os.path.join(tmp, 'synthetic.sgy'), args.gathers, args.traces, args.samples)
+        print(json.dumps(run(path, args.repeats), indent=2))
+
+
+if __name__ == '__main__':
+    main()
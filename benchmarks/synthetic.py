@@ -0,0 +1,30 @@
+import numpy as np
+
+
+def make_segy(path: str, n_gathers: int = 200, traces_per_gather: int = 500, n_samples: int = 1500,
+              seed: int = 0) -> str:
+    """
+    Write a synthetic IEEE-float SEG-Y survey (FFID-sorted shot gathers) for benchmarks.
+    """
+    import segyio
+
+    rng = np.random.default_rng(seed)
+    spec = segyio.spec()
+    spec.format = 5
+    spec.sorting = None
+    spec.samples = list(range(0, n_samples * 2, 2))  # 2 ms
+    spec.tracecount = n_gathers * traces_per_gather
+    with segyio.create(path, spec) as segy:
+        trace = 0
+        for gather in range(n_gathers):
+            block = rng.standard_normal((traces_per_gather, n_samples)).astype(np.float32)
+            for channel in range(traces_per_gather):
+                segy.header[trace] = {
+                    segyio.TraceField.FieldRecord: gather + 1,
+                    segyio.TraceField.TraceNumber: channel + 1,
+                    segyio.TraceField.SourceX: gather * 50,
+                    segyio.TraceField.SourceY: 0,
+                }
+                segy.trace[trace] = block[channel]
+                trace += 1
+    return path
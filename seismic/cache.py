@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+from seismic.loader import GatherIndex, build_gather_index, read_headers, read_traces, sample_interval
+from seismic.volume import DEFAULT_CACHE_BYTES, SeismicVolume
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = '.cache'
+FILE_HEADER_BYTES = 3600  # textual + binary SEG-Y header
+BUILD_CHUNK_BYTES = 64 * 1024 * 1024
+
+META_FILE = 'meta.json'
+HEADERS_FILE = 'headers.npz'
+SAMPLES_FILE = 'samples.f32'
+
+
+def cache_dir_for(path: str, cache_root: str = None) -> str:
+    if cache_root is None:
+        return path + CACHE_SUFFIX  # sidecar next to the survey
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:12]
+    return os.path.join(cache_root, f'{os.path.basename(path)}-{digest}{CACHE_SUFFIX}')
+
+
+def source_key(path: str) -> dict:  # cheap: one stat and a 3600 byte read
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        header_hash = hashlib.sha1(f.read(FILE_HEADER_BYTES)).hexdigest()
+    return {
+        'version': CACHE_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'header_hash': header_hash,
+    }
+
+
+def _read_meta(cache_dir: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(cache_dir, META_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(path: str, cache_dir: str) -> bool:
+    meta = _read_meta(cache_dir)
+    return meta is not None and meta.get('key') == source_key(path)
+
+
+def build_cache(path: str, cache_dir: str) -> dict:
+    """
+    Convert a SEG-Y file into the sidecar format: header columns and the gather index in an npz,
+    samples as a raw float32 (n_traces, n_samples) block in gather-sorted order.
+    meta.json is written last and marks the cache as complete.
+    """
+    import segyio
+
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = os.path.join(cache_dir, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    key = source_key(path)
+    with segyio.open(path, ignore_geometry=True) as segy:
+        segy.mmap()
+        headers = read_headers(segy)
+        index = build_gather_index(headers['FFID'])
+        n_traces, n_samples = len(index.order), len(segy.samples)
+        dt = sample_interval(segy)
+
+        samples = np.memmap(os.path.join(cache_dir, SAMPLES_FILE), dtype=np.float32, mode='w+',
+                            shape=(n_traces, n_samples))
+        chunk = max(1, BUILD_CHUNK_BYTES // max(1, n_samples * 4))
+        for start in range(0, n_traces, chunk):
+            stop = min(start + chunk, n_traces)
+            read_traces(segy, index.order[start:stop], out=samples[start:stop])
+        samples.flush()
+        del samples
+
+    np.savez(
+        os.path.join(cache_dir, HEADERS_FILE),
+        ffids=index.ffids, order=index.order, offsets=index.offsets, counts=index.counts,
+        **{f'header_{name}': column for name, column in headers.items()},
+    )
+    meta = {'key': key, 'n_traces': n_traces, 'n_samples': n_samples, 'dt': dt}
+    tmp_path = f'{meta_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+    return meta
+
+
+class MemmapSource:
+    """
+    Samples from the sidecar cache: a gather is a contiguous slice of the memory map, no decoding
+    """
+
+    def __init__(self, samples_path: str, n_traces: int, n_samples: int):
+        self.samples = np.memmap(samples_path, dtype=np.float32, mode='r', shape=(n_traces, n_samples))
+
+    @property
+    def n_samples(self) -> int:
+        return self.samples.shape[1]
+
+    def read(self, indices: np.ndarray) -> np.ndarray:  # positions in gather-sorted order
+        return np.asarray(self.samples[indices])
+
+    def read_gather(self, index: GatherIndex, i: int) -> np.ndarray:
+        offset = index.offsets[i]
+        return np.asarray(self.samples[offset:offset + index.counts[i]])
+
+    def close(self):  # unmapped once the last gather view is released
+        self.samples = None
+
+
+def load_cached(cache_dir: str, path: str, cache_bytes: int = DEFAULT_CACHE_BYTES) -> SeismicVolume:
+    meta = _read_meta(cache_dir)
+    with np.load(os.path.join(cache_dir, HEADERS_FILE)) as npz:
+        index = GatherIndex(ffids=npz['ffids'], order=npz['order'], offsets=npz['offsets'], counts=npz['counts'])
+        headers = {name[len('header_'):]: npz[name] for name in npz.files if name.startswith('header_')}
+    source = MemmapSource(os.path.join(cache_dir, SAMPLES_FILE), meta['n_traces'], meta['n_samples'])
+    return SeismicVolume(path, cache_bytes=cache_bytes, source=source, headers=headers, index=index, dt=meta['dt'])
+
+
+def open_volume(path: str, cache: bool = True, cache_root: str = None,
+                cache_bytes: int = DEFAULT_CACHE_BYTES) -> SeismicVolume:
+    """
+    Open a survey, through its sidecar cache when enabled (built or rebuilt when missing or stale).
+    """
+    path = os.path.normpath(path)
+    if not cache:
+        return SeismicVolume(path, cache_bytes=cache_bytes)
+    cache_dir = cache_dir_for(path, cache_root)
+    if not is_fresh(path, cache_dir):
+        build_cache(path, cache_dir)
+    return load_cached(cache_dir, path, cache_bytes=cache_bytes)
@@ -0,0 +1,124 @@
+import os
+from typing import Dict, Iterator, NamedTuple
+
+import numpy as np
+
+# column name (as in the viewer) -> segyio.TraceField member
+HEADER_FIELDS = {
+    'Trace_number': 'TraceNumber',  # Номер трассы
+    'FFID': 'FieldRecord',  # Номер источника (номер сейсмограммы)
+    'SouX': 'SourceX',  # Координата источника по Х
+    'SouY': 'SourceY',  # Координата источника по Y
+    'Elev': 'ReceiverDatumElevation',  # Высота источника
+}
+
+
+class GatherIndex(NamedTuple):
+    """
+    Traces grouped by FFID: gather i is order[offsets[i]:offsets[i] + counts[i]]
+    (trace numbers in file order), gathers in order of first appearance in the file.
+    """
+
+    ffids: np.ndarray
+    order: np.ndarray
+    offsets: np.ndarray
+    counts: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ffids)
+
+    def trace_indices(self, i: int) -> np.ndarray:
+        return self.order[self.offsets[i]:self.offsets[i] + self.counts[i]]
+
+
+def build_gather_index(ffid: np.ndarray) -> GatherIndex:  # O(N log N), one sort instead of a scan per FFID
+    ffid = np.asarray(ffid)
+    ffids, first, inverse, counts = np.unique(ffid, return_index=True, return_inverse=True, return_counts=True)
+    appearance = np.argsort(first, kind='stable')  # same gather order as DataFrame.unique()
+    rank = np.empty_like(appearance)
+    rank[appearance] = np.arange(len(appearance))
+    order = np.argsort(rank[inverse.ravel()], kind='stable')
+    counts = counts[appearance]
+    offsets = np.zeros(len(counts), dtype=np.int64)
+    np.cumsum(counts[:-1], out=offsets[1:])
+    return GatherIndex(ffids=ffids[appearance], order=order, offsets=offsets, counts=counts)
+
+
+def contiguous_runs(indices: np.ndarray) -> Iterator[tuple]:
+    """
+    Split trace indices into (position, start, stop) runs of consecutive traces,
+    so each run is read with one slice.
+    """
+    if len(indices) == 0:
+        return
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    starts = np.concatenate([[0], breaks])
+    stops = np.concatenate([breaks, [len(indices)]])
+    for pos, end in zip(starts, stops):
+        yield int(pos), int(indices[pos]), int(indices[end - 1]) + 1
+
+
+def read_headers(segy) -> Dict[str, np.ndarray]:
+    import segyio
+
+    return {
+        name: np.asarray(segy.attributes(getattr(segyio.TraceField, field))[:])
+        for name, field in HEADER_FIELDS.items()
+    }
+
+
+def read_traces(segy, indices: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Read traces `indices` into a (len(indices), n_samples) float32 array in bulk slices.
+    """
+    if out is None:
+        out = np.empty((len(indices), len(segy.samples)), dtype=np.float32)
+    for pos, start, stop in contiguous_runs(indices):
+        out[pos:pos + stop - start] = segy.trace.raw[start:stop]
+    return out
+
+
+class SegyGathers:
+    """
+    All traces of a file in one gather-sorted 2-D array, gathers are zero-copy views
+    """
+
+    def __init__(self, path: str, headers: Dict[str, np.ndarray], index: GatherIndex, data: np.ndarray, dt: float):
+        self.path = path
+        self.headers = headers
+        self.index = index
+        self.data = data
+        self.dt = dt  # Шаг дескритизации по времени, s
+
+    @property
+    def n_samples(self) -> int:  # Длина трассы
+        return self.data.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        if i < 0:
+            i += len(self)
+        offset = self.index.offsets[i]
+        return self.data[offset:offset + self.index.counts[i]]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return (self[i] for i in range(len(self)))
+
+
+def sample_interval(segy) -> float:  # seconds, segyio samples are in ms
+    samples = segy.samples
+    return float(samples[1] - samples[0]) / 1000 if len(samples) > 1 else 0.0
+
+
+def load_segy(path: str) -> SegyGathers:
+    import segyio
+
+    path = os.path.normpath(path)
+    with segyio.open(path, ignore_geometry=True) as segy:
+        headers = read_headers(segy)
+        index = build_gather_index(headers['FFID'])
+        data = read_traces(segy, index.order)
+        dt = sample_interval(segy)
+    return SegyGathers(path, headers, index, data, dt)
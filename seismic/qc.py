@@ -0,0 +1,167 @@
+"""
+Headless QC of SEG-Y surveys: per-gather SNR, amplitude range, RMS and trace count into a CSV or
+Parquet report. Files are prepared (sidecar cache) in parallel, then gathers are fanned out across
+a process pool in chunks; progress counts completed gathers.
+
+Usage: python -m seismic.qc survey1.sgy survey2.sgy --signal 0 500 0 200 --noise 0 500 800 1000 \
+           --processes 8 --output qc.csv
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from seismic.snr import ENERGY, RMS, Window, snr
+
+REPORT_COLUMNS = ['file', 'gather', 'ffid', 'traces', 'snr', 'min_amplitude', 'max_amplitude', 'rms']
+DEFAULT_CHUNK_GATHERS = 64
+WORKER_OPEN_VOLUMES = 4  # files kept open per worker process, chunks are submitted file by file
+
+_worker_volumes: 'OrderedDict[tuple, object]' = OrderedDict()  # (path, use_cache) -> SeismicVolume, per process
+
+
+def gather_stats(data: np.ndarray, signal: Window, noise: Window, mode: str = ENERGY) -> dict:
+    sum_sq = float(np.einsum('ij,ij->', data, data, dtype=np.float64))
+    return {
+        'traces': data.shape[0],
+        'snr': snr(data, signal, noise, mode),
+        'min_amplitude': float(data.min()) if data.size else 0.0,
+        'max_amplitude': float(data.max()) if data.size else 0.0,
+        'rms': float(np.sqrt(sum_sq / data.size)) if data.size else 0.0,
+    }
+
+
+def _prepare(args) -> tuple:  # builds / validates the sidecar cache once per file
+    path, use_cache = args
+    from seismic.cache import open_volume
+
+    with open_volume(path, cache=use_cache) as volume:
+        return path, len(volume)
+
+
+def _worker_volume(path: str, use_cache: bool):
+    """ Survey opened once per worker process: later chunks of the file reuse its header index """
+    from seismic.cache import open_volume
+
+    key = (path, use_cache)
+    volume = _worker_volumes.get(key)
+    if volume is not None:
+        _worker_volumes.move_to_end(key)
+        return volume
+    volume = _worker_volumes[key] = open_volume(path, cache=use_cache)
+    while len(_worker_volumes) > WORKER_OPEN_VOLUMES:
+        _worker_volumes.popitem(last=False)[1].close()
+    return volume
+
+
+def _qc_chunk(args) -> List[dict]:
+    path, start, stop, signal, noise, mode, use_cache = args
+    volume = _worker_volume(path, use_cache)
+    rows = []
+    for i in range(start, stop):
+        gather = volume.source.read_gather(volume.index, i)  # streamed, not kept in the lru
+        row = {'file': path, 'gather': i, 'ffid': int(volume.index.ffids[i])}
+        row.update(gather_stats(gather, signal, noise, mode))
+        rows.append(row)
+    return rows
+
+
+def run_qc(paths: Sequence[str], signal: Window, noise: Window, mode: str = ENERGY,
+           processes: Optional[int] = None, chunk_gathers: int = DEFAULT_CHUNK_GATHERS, use_cache: bool = True,
+           progress: Callable[[int, int, int], None] = None) -> Iterable[dict]:
+    """
+    Yields report rows as chunks complete, progress(done_gathers, total_gathers, done_files) after each chunk
+    """
+    signal, noise = tuple(signal), tuple(noise)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        sizes = dict(pool.map(_prepare, [(path, use_cache) for path in paths]))
+        total = sum(sizes.values())
+        remaining = dict(sizes)
+        futures = {}
+        for path, n_gathers in sizes.items():
+            for start in range(0, n_gathers, chunk_gathers):
+                stop = min(start + chunk_gathers, n_gathers)
+                job = (path, start, stop, signal, noise, mode, use_cache)
+                futures[pool.submit(_qc_chunk, job)] = (path, stop - start)
+
+        done = 0
+        done_files = sum(1 for n in sizes.values() if n == 0)
+        for future in as_completed(futures):
+            path, count = futures[future]
+            rows = future.result()
+            done += count
+            remaining[path] -= count
+            if remaining[path] == 0:
+                done_files += 1
+            if progress is not None:
+                progress(done, total, done_files)
+            yield from rows
+
+
+def write_report(rows: Iterable[dict], output: str) -> int:
+    if output.endswith('.parquet'):
+        try:
+            import pandas as pd
+        except ImportError:
+            raise SystemExit('parquet output requires pandas with pyarrow or fastparquet installed')
+        frame = pd.DataFrame(list(rows), columns=REPORT_COLUMNS)
+        frame.to_parquet(output, index=False)
+        return len(frame)
+
+    count = 0
+    with open(output, 'w', newline='') as f:  # written row by row as results arrive
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _print_progress(started: float) -> Callable[[int, int, int], None]:
+    def progress(done: int, total: int, done_files: int):
+        elapsed = time.monotonic() - started
+        rate = done / elapsed if elapsed else 0.0
+        sys.stderr.write(f'\r{done}/{total} gathers, {done_files} files done, {rate:.0f} gathers/s')
+        sys.stderr.flush()
+
+    return progress
+
+
+def main(argv: Sequence[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help='SEG-Y files or directories (searched for *.sgy / *.segy)')
+    parser.add_argument('--signal', nargs=4, type=int, required=True, metavar=('T0', 'T1', 'N0', 'N1'))
+    parser.add_argument('--noise', nargs=4, type=int, required=True, metavar=('T0', 'T1', 'N0', 'N1'))
+    parser.add_argument('--mode', choices=[ENERGY, RMS], default=ENERGY)
+    parser.add_argument('--processes', type=int, default=None, help='worker processes, default cpu count')
+    parser.add_argument('--chunk-gathers', type=int, default=DEFAULT_CHUNK_GATHERS)
+    parser.add_argument('--no-cache', action='store_true', help='read SEG-Y directly, do not build sidecar caches')
+    parser.add_argument('--output', default='qc.csv', help='.csv or .parquet')
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            paths.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(('.sgy', '.segy'))
+            ))
+        else:
+            paths.append(path)
+
+    started = time.monotonic()
+    rows = run_qc(paths, args.signal, args.noise, args.mode, args.processes, args.chunk_gathers,
+                  use_cache=not args.no_cache, progress=_print_progress(started))
+    count = write_report(rows, args.output)
+    sys.stderr.write(f'\n{count} gathers from {len(paths)} files -> {args.output} '
+                     f'in {time.monotonic() - started:.1f}s\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+from typing import Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from seismic.volume import ByteLRU
+
+DEFAULT_RENDER_CACHE_BYTES = 128 * 1024 * 1024
+
+
+def decimate_minmax(data: np.ndarray, target: int, axis: int = 0) -> np.ndarray:
+    """
+    Reduce `axis` to about `target` points keeping the extremes: every bin of samples
+    becomes its (min, max) pair, so peaks survive decimation.
+    """
+    size = data.shape[axis]
+    if target < 2 or size <= target:
+        return data
+    bins = target // 2
+    step = -(-size // bins)
+    bins = -(-size // step)
+    moved = np.moveaxis(data, axis, 0)
+    pad = bins * step - size
+    if pad:  # repeat the edge, it does not change min / max of the last bin
+        moved = np.concatenate([moved, np.repeat(moved[-1:], pad, axis=0)])
+    blocks = moved.reshape((bins, step) + moved.shape[1:])
+    out = np.empty((2 * bins,) + moved.shape[1:], dtype=data.dtype)
+    np.min(blocks, axis=1, out=out[0::2])
+    np.max(blocks, axis=1, out=out[1::2])
+    return np.moveaxis(out, 0, axis)
+
+
+def decimate_to_screen(image: np.ndarray, width: int, height: int) -> np.ndarray:  # image rows = y, cols = x
+    return np.ascontiguousarray(decimate_minmax(decimate_minmax(image, width, axis=1), height, axis=0))
+
+
+class GatherRenderer:
+    """
+    Draws gathers into one persistent matplotlib image: the figure, axes and AxesImage are created
+    once and updated in place. Gathers are decimated to the axes size in pixels (cached per gather),
+    colour-mapped tiles are cached per gather and gain.
+    """
+
+    def __init__(self, axes, cmap: str = 'seismic', prerender: bool = True,
+                 cache_bytes: int = DEFAULT_RENDER_CACHE_BYTES):
+        import matplotlib
+
+        self.axes = axes
+        self.figure = axes.figure
+        self.cmap = matplotlib.colormaps[cmap] if hasattr(matplotlib, 'colormaps') else matplotlib.cm.get_cmap(cmap)
+        self.prerender = prerender  # rgba tiles: no colour mapping at draw time
+        self.image = None
+        self.title = None
+        self.extent = None
+        self.overlays = []  # artists drawn above the image (selection windows), updated by blitting too
+        self.background = None  # everything but the animated artists, captured after each full draw
+        self.pending = False  # a full redraw is scheduled, blitting would use a stale background
+        self.figure.canvas.mpl_connect('draw_event', self._on_draw)
+        self.decimated = ByteLRU(cache_bytes // 2)
+        self.tiles = ByteLRU(cache_bytes // 2)
+
+    def screen_size(self) -> Tuple[int, int]:
+        bbox = self.axes.get_window_extent()
+        return max(2, int(bbox.width)), max(2, int(bbox.height))
+
+    def decimate(self, key: Hashable, data: np.ndarray, transpose: bool = False) -> np.ndarray:
+        size = self.screen_size()
+        cache_key = (key, transpose, size)
+        image = self.decimated.get(cache_key)
+        if image is None:
+            image = decimate_to_screen(data.T if transpose else data, *size)
+            self.decimated.put(cache_key, image)
+        return image
+
+    @staticmethod
+    def clim(image: np.ndarray, gain: float) -> Tuple[float, float]:  # as the viewer: data range / gain
+        return float(image.min()) / gain, float(image.max()) / gain
+
+    def tile(self, key: Hashable, data: np.ndarray, gain: float = 1.0, transpose: bool = False) -> np.ndarray:
+        image = self.decimate(key, data, transpose)
+        cache_key = (key, transpose, image.shape, gain)
+        rgba = self.tiles.get(cache_key)
+        if rgba is None:
+            vmin, vmax = self.clim(image, gain)
+            span = (vmax - vmin) or 1.0
+            rgba = self.cmap((image - vmin) / span, bytes=True)  # values outside clim saturate as in imshow
+            self.tiles.put(cache_key, rgba)
+        return rgba
+
+    def show(self, key: Hashable, data: np.ndarray, gain: float = 1.0, transpose: bool = False,
+             extent: Optional[Sequence[float]] = None, title: Optional[str] = None):
+        """
+        Display gather `data` (identified by `key` for the caches), `extent` defaults to pixel
+        coordinates of the full-resolution image so overlays keep their positions.
+        """
+        if extent is None:
+            rows, cols = data.shape[::-1] if transpose else data.shape
+            extent = (-0.5, cols - 0.5, rows - 0.5, -0.5)
+
+        if self.prerender:
+            pixels = self.tile(key, data, gain, transpose)
+        else:
+            pixels = self.decimate(key, data, transpose)
+
+        if self.image is None:
+            self.image = self.axes.imshow(pixels, aspect='auto', cmap=self.cmap, interpolation='nearest',
+                                          extent=extent, animated=True)
+            self.title = self.axes.set_title('', animated=True)
+        else:
+            self.image.set_data(pixels)
+        if not self.prerender:
+            self.image.set_clim(*self.clim(pixels, gain))
+        if title is not None:
+            self.title.set_text(title)
+
+        extent = tuple(float(v) for v in extent)
+        if extent != self.extent:  # axes ticks change, full redraw
+            self.extent = extent
+            self.image.set_extent(extent)
+            self.redraw()
+        else:
+            self.refresh()
+
+    def add_overlay(self, artist):
+        artist.set_animated(True)
+        self.overlays.append(artist)
+        return artist
+
+    def redraw(self):
+        self.pending = True
+        self.figure.canvas.draw_idle()
+
+    def refresh(self):
+        """ Redraw only the image, overlays and title over the saved background. """
+        if self.pending:
+            return
+        if self.background is None:
+            self.redraw()
+            return
+        canvas = self.figure.canvas
+        canvas.restore_region(self.background)
+        self._draw_animated()
+        canvas.blit(self.figure.bbox)
+
+    def _on_draw(self, event):
+        self.pending = False
+        if self.image is None:
+            return
+        self.background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        self.axes.draw_artist(self.image)
+        for artist in self.overlays:
+            self.axes.draw_artist(artist)
+        self.axes.draw_artist(self.title)
+
+    def clear_cache(self):
+        self.decimated.clear()
+        self.tiles.clear()
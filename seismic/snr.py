@@ -0,0 +1,106 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# (T0, T1, N0, N1): rows T0:T1 and columns N0:N1 of a gather, as the viewer spinboxes
+Window = Tuple[int, int, int, int]
+
+ENERGY = 'energy'  # sqrt of the sum of squares, as the viewer always computed
+RMS = 'rms'  # sqrt of the mean of squares, comparable between windows of different size
+
+
+def _clip_window(window: Window, shape: Tuple[int, int]) -> Window:  # slicing semantics for positive bounds
+    t0, t1, n0, n1 = (int(v) for v in window)
+    rows, cols = shape
+    t0, t1 = min(max(t0, 0), rows), min(max(t1, 0), rows)
+    n0, n1 = min(max(n0, 0), cols), min(max(n1, 0), cols)
+    return t0, max(t0, t1), n0, max(n0, n1)
+
+
+def _ratio(signal: np.ndarray, noise: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.asarray(signal) / np.asarray(noise)
+
+
+def _finish(sum_sq, size, mode: str):
+    if mode == RMS:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.sqrt(sum_sq / size)
+    return np.sqrt(sum_sq)
+
+
+def window_energy(data: np.ndarray, window: Window, mode: str = ENERGY) -> float:
+    """
+    Energy of one window, computed directly (one pass over the window, no temporaries)
+    """
+    t0, t1, n0, n1 = _clip_window(window, data.shape)
+    block = data[t0:t1, n0:n1]
+    return float(_finish(np.einsum('ij,ij->', block, block, dtype=np.float64), block.size, mode))
+
+
+def snr(data: np.ndarray, signal: Window, noise: Window, mode: str = ENERGY) -> float:
+    return float(_ratio(window_energy(data, signal, mode), window_energy(data, noise, mode)))
+
+
+class EnergyTable:
+    """
+    Summed-area table of squared amplitudes of a gather: one O(N) precompute, then the energy of
+    any rectangular window (and the SNR of any window pair) costs O(1).
+    """
+
+    def __init__(self, data: np.ndarray):
+        rows, cols = data.shape
+        self.shape = (rows, cols)
+        self.table = np.zeros((rows + 1, cols + 1), dtype=np.float64)
+        np.cumsum(np.square(data, dtype=np.float64), axis=0, out=self.table[1:, 1:])
+        np.cumsum(self.table[1:, 1:], axis=1, out=self.table[1:, 1:])
+
+    def sum_sq(self, windows) -> Tuple[np.ndarray, np.ndarray]:  # windows: (4,) or (k, 4) of T0, T1, N0, N1
+        windows = np.atleast_2d(np.asarray(windows, dtype=np.int64))
+        rows, cols = self.shape
+        t0 = np.clip(windows[:, 0], 0, rows)
+        t1 = np.maximum(np.clip(windows[:, 1], 0, rows), t0)
+        n0 = np.clip(windows[:, 2], 0, cols)
+        n1 = np.maximum(np.clip(windows[:, 3], 0, cols), n0)
+        table = self.table
+        total = table[t1, n1] - table[t0, n1] - table[t1, n0] + table[t0, n0]
+        return np.maximum(total, 0.0), (t1 - t0) * (n1 - n0)  # clamp float cancellation noise
+
+    def energy(self, windows, mode: str = ENERGY) -> np.ndarray:
+        sum_sq, size = self.sum_sq(windows)
+        return _finish(sum_sq, size, mode)
+
+    def snr(self, signal, noise, mode: str = ENERGY):
+        """
+        SNR of one window pair (returns float) or of k pairs given as (k, 4) arrays (returns array)
+        """
+        result = _ratio(self.energy(signal, mode), self.energy(noise, mode))
+        return float(result[0]) if np.ndim(signal) == 1 and np.ndim(noise) == 1 else result
+
+
+def batch_snr(gathers: Iterable[np.ndarray], signal: Window, noise: Window, mode: str = ENERGY) -> np.ndarray:
+    """
+    Same signal / noise windows evaluated on every gather, returns a per-gather SNR array
+    """
+    return np.array([snr(gather, signal, noise, mode) for gather in gathers], dtype=np.float64)
+
+
+def _file_snr(args) -> np.ndarray:
+    path, signal, noise, mode, use_cache = args
+    from seismic.cache import open_volume
+
+    with open_volume(path, cache=use_cache) as volume:
+        return batch_snr(volume, signal, noise, mode)
+
+
+def batch_snr_files(paths: Sequence[str], signal: Window, noise: Window, mode: str = ENERGY,
+                    processes: Optional[int] = None, use_cache: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Per-gather SNR for several surveys, one file per worker process (processes=1 runs inline)
+    """
+    jobs = [(path, tuple(signal), tuple(noise), mode, use_cache) for path in paths]
+    if processes == 1 or len(jobs) <= 1:
+        return {job[0]: _file_snr(job) for job in jobs}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return dict(zip(paths, pool.map(_file_snr, jobs)))
@@ -0,0 +1,136 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterator, Optional
+
+import numpy as np
+
+from seismic.loader import GatherIndex, build_gather_index, read_headers, read_traces, sample_interval
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class ByteLRU:
+    """
+    LRU of numpy arrays bounded by their total nbytes, not by item count
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items: 'OrderedDict[Hashable, np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: np.ndarray):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            if value.nbytes > self.max_bytes:  # larger than the whole budget, do not keep
+                return
+            self._items[key] = value
+            self.nbytes += value.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+class SegyioSource:
+    """
+    Trace samples straight from the SEG-Y file, memory mapped by segyio when possible
+    """
+
+    def __init__(self, path: str):
+        import segyio
+
+        self.segy = segyio.open(path, ignore_geometry=True)
+        self.mapped = self.segy.mmap()  # False on platforms / files where mmap is not available
+
+    @property
+    def n_samples(self) -> int:
+        return len(self.segy.samples)
+
+    def read(self, indices: np.ndarray) -> np.ndarray:
+        return read_traces(self.segy, indices)
+
+    def read_gather(self, index: GatherIndex, i: int) -> np.ndarray:
+        return self.read(index.trace_indices(i))
+
+    def close(self):
+        self.segy.close()
+
+
+class SeismicVolume:
+    """
+    Lazily loaded seismic file: trace headers and the gather index stay resident, samples stay
+    on disk (memory mapped) and a gather is decoded only when it is requested. Recently viewed
+    gathers are kept in a ByteLRU.
+    """
+
+    def __init__(self, path: str, cache_bytes: int = DEFAULT_CACHE_BYTES, source=None,
+                 headers: Dict[str, np.ndarray] = None, index: GatherIndex = None, dt: float = None):
+        self.path = os.path.normpath(path)
+        self.source = source if source is not None else SegyioSource(self.path)
+        if headers is None:
+            headers = read_headers(self.source.segy)
+        self.headers = headers
+        self.index = index if index is not None else build_gather_index(headers['FFID'])
+        self.dt = dt if dt is not None else sample_interval(self.source.segy)  # Шаг дескритизации, s
+        self.cache = ByteLRU(cache_bytes)
+
+    @property
+    def n_samples(self) -> int:  # Длина трассы
+        return self.source.n_samples
+
+    @property
+    def n_traces(self) -> int:
+        return len(self.index.order)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def gather(self, i: int) -> np.ndarray:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f'gather {i} out of range, {len(self)} gathers')
+        data = self.cache.get(i)
+        if data is None:
+            data = self.source.read_gather(self.index, i)
+            data.flags.writeable = False  # shared through the cache
+            self.cache.put(i, data)
+        return data
+
+    __getitem__ = gather
+
+    def __iter__(self) -> Iterator[np.ndarray]:  # streams, does not fill the cache
+        for i in range(len(self)):
+            yield self.gather(i) if i in self.cache else self.source.read_gather(self.index, i)
+
+    def close(self):
+        self.cache.clear()
+        self.source.close()
+
+    def __enter__(self) -> 'SeismicVolume':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()